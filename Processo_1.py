@@ -1,105 +1,109 @@
 #- Processo 1
 # 1. Entra no FTP (172.20.24.4:21);
 # 2. Pega o arquivo XXXX-XX-XX_TrackingRecord.xlsx mais recente, salva em uma pasta X;
-# 3. Loga no outlook
+# 3. Loga no outlook (ou SMTP, conforme EMAIL_BACKEND)
 # 4. Envia o arquivo com um texto já pré definido alterando apenas a data.
+#
+# Backfill (dias perdidos): python Processo_1.py --backfill 2025-11-01 2025-11-07 [--conexoes 4]
+# Baixa todos os TrackingRecord do intervalo em paralelo para PASTA_TRACKING (sem enviar email).
 
 import os
+import argparse
 from ftplib import FTP
 from datetime import datetime
-import win32com.client as win32
-import re
-from dotenv import load_dotenv
+from configuracao import carregar_configuracao_ou_sair, obter_configuracao
+from metricas import instrumentar, medir_fase, contar
+from perfilamento import adicionar_argumento
+from gravacao_rede import conexao_ftp
+from envio_email import criar_backend, preparar_anexo, descartar_anexo, registrar_envio, medir_envio
+from transferencia_ftp import (
+    baixar_com_retomada, baixar_em_paralelo, buscar_mais_recente, buscar_no_intervalo,
+    TAMANHO_BLOCO_PADRAO, PADRAO_TRACKING
+)
 
-script_dir = os.path.dirname(os.path.abspath(__file__))
-env_path = os.path.join(script_dir, '.env')
-
-print(f"🔍 Procurando arquivo .env em: {env_path}")
-
-if os.path.exists(env_path):
-    print(f"✅ Arquivo .env encontrado!")
-    load_dotenv(env_path)
-else:
-    print(f"❌ ERRO: Arquivo .env NÃO encontrado em: {env_path}")
-    print(f"📁 Certifique-se de criar o arquivo .env na mesma pasta do script!")
-    exit(1)
+# Localiza, lê e valida o .env da pasta do script (sem .env, encerra com código 1)
+carregar_configuracao_ou_sair()
 
 
 class AutomacaoProcesso1:
     def __init__(self):
+        config = obter_configuracao()
 
-        self.ftp_host = os.getenv('SFTP_HOST')
-        self.ftp_port = int(os.getenv('SFTP_PORT'))
-        self.ftp_user = os.getenv('SFTP_USER')
-        self.ftp_pass = os.getenv('SFTP_PASS')
+        self.ftp_host = config.ftp_host
+        self.ftp_port = config.ftp_port
+        self.ftp_user = config.ftp_user
+        self.ftp_pass = config.ftp_pass
+        self.ftp_tamanho_bloco = config.ftp_tamanho_bloco or TAMANHO_BLOCO_PADRAO
         
 
-        self.pasta_destino = os.getenv('PASTA_TRACKING')
+        self.pasta_destino = config.pasta_tracking
+        self.ultimo_download = None
         
 
-        self.destinatarios = os.getenv('DESTINATARIO_EMAIL')
+        self.destinatarios = config.destinatario_email
+        self.backend_email = None
+        self.limite_anexo_bytes = int(config.email_limite_anexo_mb * 1024 * 1024)
+        self.link_base_tracking = config.pasta_tracking_link
+        self.pasta_metricas = config.pasta_logs or self.pasta_destino
         self.assunto = "Relatório Damon"
         self.corpo_email = """Bom dia,
         
-Segue relatório trackingrecord do dia {data}.
+Segue relatório trackingrecord do dia {data}.{link}
 
 Att."""
     
+    @medir_fase("connect")
     def conectar_ftp(self):
         """Conecta ao servidor FTP"""
-        try:
+        def abrir():
             ftp = FTP()
             ftp.connect(self.ftp_host, self.ftp_port)
             ftp.login(self.ftp_user, self.ftp_pass)
+            return ftp
+        
+        try:
+            # Com RPA_GRAVAR/RPA_REPRODUZIR a sessão é gravada ou reproduzida (gravacao_rede.py)
+            ftp = conexao_ftp(f"ftp://{self.ftp_host}", abrir)
             print(f"Conectado ao FTP: {self.ftp_host}")
             return ftp
         except Exception as e:
             print(f"Erro ao conectar ao FTP: {e}")
             return None
     
-    def buscar_arquivo_mais_recente(self, ftp, padrao="TrackingRecord.xlsx"):
-        """Busca o arquivo TrackingRecord mais recente no FTP"""
+    @medir_fase("list")
+    def buscar_arquivo_mais_recente(self, ftp, padrao=PADRAO_TRACKING):
+        """Busca o arquivo TrackingRecord mais recente no FTP (MLSD, com fallback NLST)"""
         try:
-
-            arquivos = []
-            ftp.retrlines('LIST', arquivos.append)
-            
-
-            arquivos_tracking = []
-            for linha in arquivos:
-                partes = linha.split()
-                if len(partes) >= 9:
-                    nome_arquivo = ' '.join(partes[8:])
-
-                    if padrao in nome_arquivo and nome_arquivo.endswith('.xlsx'):
-
-                        match = re.match(r'(\d{4}-\d{2}-\d{2})_TrackingRecord\.xlsx', nome_arquivo)
-                        if match:
-                            data_arquivo = match.group(1)
-                            arquivos_tracking.append((data_arquivo, nome_arquivo))
+            arquivo_mais_recente, comando = buscar_mais_recente(ftp, padrao)
+            contar(self, "round_trips")
             
-            if not arquivos_tracking:
+            if not arquivo_mais_recente:
                 print("Nenhum arquivo TrackingRecord encontrado!")
                 return None
             
-
-            arquivos_tracking.sort(reverse=True)
-            arquivo_mais_recente = arquivos_tracking[0][1]
-            
-            print(f"Arquivo mais recente encontrado: {arquivo_mais_recente}")
+            print(f"Arquivo mais recente encontrado: {arquivo_mais_recente} (via {comando})")
             return arquivo_mais_recente
             
         except Exception as e:
             print(f"Erro ao buscar arquivos: {e}")
             return None
     
+    @medir_fase("download")
     def baixar_arquivo(self, ftp, nome_arquivo):
-        """Baixa o arquivo do FTP para a pasta local"""
+        """Baixa o arquivo do FTP para a pasta local (retoma quedas e pula arquivo inalterado)"""
+        # Sem sobra de uma chamada anterior: em falha, executar() não troca a conexão por uma velha
+        self.ultimo_download = None
         try:
-            caminho_local = os.path.join(self.pasta_destino, nome_arquivo)
-            
-            with open(caminho_local, 'wb') as arquivo_local:
-                ftp.retrbinary(f'RETR {nome_arquivo}', arquivo_local.write)
+            self.ultimo_download = baixar_com_retomada(
+                ftp,
+                nome_arquivo,
+                self.pasta_destino,
+                tamanho_bloco=self.ftp_tamanho_bloco,
+                reconectar=self.conectar_ftp
+            )
+            caminho_local = self.ultimo_download['caminho']
+            contar(self, "round_trips")
+            contar(self, "bytes_recebidos", self.ultimo_download['bytes'])
             
             print(f"Arquivo baixado: {caminho_local}")
             return caminho_local
@@ -110,7 +114,7 @@ Att."""
     
     def extrair_data_arquivo(self, nome_arquivo):
         """Extrai a data do nome do arquivo"""
-        match = re.match(r'(\d{4}-\d{2}-\d{2})_TrackingRecord\.xlsx', nome_arquivo)
+        match = PADRAO_TRACKING.match(nome_arquivo)
         if match:
             data_str = match.group(1)
 
@@ -118,39 +122,72 @@ Att."""
             return data_obj.strftime('%d/%m/%Y')
         return datetime.now().strftime('%d/%m/%Y')
     
-    def enviar_email_outlook(self, caminho_arquivo, nome_arquivo):
-        """Envia email via Outlook com o arquivo anexado"""
+    @medir_fase("notify")
+    def enviar_email(self, caminho_arquivo, nome_arquivo):
+        """Envia email (Outlook ou SMTP) com o arquivo anexado, compactado ou como link"""
+        anexo = None
+        latencia = 0.0
+        sucesso = False
         try:
-            outlook = win32.Dispatch('outlook.application')
-            email = outlook.CreateItem(0)  
-            
-
             data_formatada = self.extrair_data_arquivo(nome_arquivo)
             
-
-            email.To = self.destinatarios
-            email.Subject = self.assunto.format(data=data_formatada)
-            email.Body = self.corpo_email.format(data=data_formatada)
-            
-
-            email.Attachments.Add(caminho_arquivo)
+            anexo = preparar_anexo(caminho_arquivo, self.limite_anexo_bytes, self.link_base_tracking)
+            if anexo['modo'] == 'link':
+                print(f"Arquivo com {anexo['bytes_original'] / (1024 * 1024):.1f} MB acima do limite, enviando link: {anexo['link']}")
+                link = f"\n\nO arquivo excede o limite de anexo e está disponível em:\n{anexo['link']}"
+            else:
+                print(f"Anexo: {anexo['modo']} ({anexo['bytes_original']} -> {anexo['bytes']} bytes)")
+                link = ""
             
-
-            email.Send()
+            latencia = medir_envio(
+                self.backend_email,
+                self.destinatarios,
+                self.assunto.format(data=data_formatada),
+                self.corpo_email.format(data=data_formatada, link=link),
+                anexos=[anexo['caminho']] if anexo['caminho'] else []
+            )
+            sucesso = True
+            contar(self, "round_trips")
+            contar(self, "bytes_enviados", anexo['bytes'])
             
-            print(f"Email enviado com sucesso para: {self.destinatarios}")
+            print(f"Email enviado com sucesso para: {self.destinatarios} ({latencia:.2f}s)")
             return True
             
         except Exception as e:
             print(f"Erro ao enviar email: {e}")
             return False
+        
+        finally:
+            if anexo:
+                descartar_anexo(anexo)
+                registrar_envio(
+                    os.path.join(self.pasta_metricas, "envios_email.csv"),
+                    nome_arquivo, anexo, latencia, sucesso
+                )
     
+    def encerrar_ftp(self, ftp):
+        """Encerra a sessão FTP (fecha o socket mesmo se o QUIT falhar)"""
+        try:
+            ftp.quit()
+        except Exception:
+            ftp.close()
+        print("Conexão FTP encerrada")
+    
+    @instrumentar("processo_1")
     def executar(self):
         """Executa o processo completo"""
         print("=" * 50)
         print("INICIANDO PROCESSO 1 - FTP + EMAIL")
         print("=" * 50)
-              
+        
+
+        try:
+            self.backend_email = criar_backend()
+        except Exception as e:
+            print(f"Erro ao configurar envio de email: {e}")
+            return False
+        self.backend_email.aquecer()
+        
 
         ftp = self.conectar_ftp()
         if not ftp:
@@ -164,28 +201,105 @@ Att."""
             
 
             caminho_arquivo = self.baixar_arquivo(ftp, nome_arquivo)
+            if self.ultimo_download:
+                ftp = self.ultimo_download['conexao']
             if not caminho_arquivo:
                 return False
             
-
-            sucesso = self.enviar_email_outlook(caminho_arquivo, nome_arquivo)
-            
-            print("=" * 50)
-            if sucesso:
-                print("PROCESSO 1 CONCLUÍDO COM SUCESSO!")
-            else:
-                print("PROCESSO 1 CONCLUÍDO COM ERROS NO EMAIL")
-            print("=" * 50)
-            
-            return sucesso
-            
         finally:
 
-            ftp.quit()
-            print("Conexão FTP encerrada")
+            self.encerrar_ftp(ftp)
+        
+
+        sucesso = self.enviar_email(caminho_arquivo, nome_arquivo)
+        
+        print("=" * 50)
+        if sucesso:
+            print("PROCESSO 1 CONCLUÍDO COM SUCESSO!")
+        else:
+            print("PROCESSO 1 CONCLUÍDO COM ERROS NO EMAIL")
+        print("=" * 50)
+        
+        return sucesso
+    
+    @instrumentar("processo_1_backfill")
+    def executar_backfill(self, data_inicio: str, data_fim: str, conexoes: int = 4, tentativas: int = 3):
+        """Baixa em paralelo todos os TrackingRecord entre data_inicio e data_fim (YYYY-MM-DD)"""
+        try:
+            inicio, fim = (datetime.strptime(data, '%Y-%m-%d') for data in (data_inicio, data_fim))
+        except ValueError:
+            print(f"Intervalo inválido: {data_inicio} a {data_fim} (use AAAA-MM-DD)")
+            return False
+        if inicio > fim:
+            print(f"Intervalo inválido: {data_inicio} é depois de {data_fim}")
+            return False
+        
+        # A busca compara as datas como texto: 2025-11-1 vira 2025-11-01
+        data_inicio, data_fim = inicio.strftime('%Y-%m-%d'), fim.strftime('%Y-%m-%d')
+        print("=" * 50)
+        print(f"INICIANDO PROCESSO 1 - BACKFILL {data_inicio} A {data_fim}")
+        print("=" * 50)
+        
+        ftp = self.conectar_ftp()
+        if not ftp:
+            return False
+        
+        try:
+            with self.metricas.fase("list"):
+                encontrados = buscar_no_intervalo(ftp, data_inicio, data_fim)
+            contar(self, "round_trips")
+        except Exception as e:
+            print(f"Erro ao buscar arquivos: {e}")
+            return False
+        finally:
+            self.encerrar_ftp(ftp)
+        
+        if not encontrados:
+            print("Nenhum arquivo TrackingRecord encontrado no intervalo!")
+            return False
+        
+        print(f"{len(encontrados)} arquivo(s) no intervalo, baixando com {conexoes} conexão(ões)...")
+        
+        with self.metricas.fase("download"):
+            resumo = baixar_em_paralelo(
+                self.conectar_ftp,
+                list(encontrados.values()),
+                self.pasta_destino,
+                conexoes=conexoes,
+                tentativas=tentativas,
+                tamanho_bloco=self.ftp_tamanho_bloco
+            )
+        contar(self, "round_trips", len(encontrados))
+        contar(self, "bytes_recebidos", resumo['bytes'])
+        
+        print("=" * 50)
+        for nome in encontrados.values():
+            r = resumo['arquivos'][nome]
+            if 'erro' in r:
+                print(f"  ❌ {nome}: {r['erro']}")
+            elif r['cache']:
+                print(f"  ♻️ {nome}: já baixado (inalterado)")
+            else:
+                print(f"  ✅ {nome}: {r['bytes']} bytes ({r['mbps']:.2f} MB/s)")
+        
+        print(f"Total: {resumo['bytes'] / (1024 * 1024):.2f} MB em {resumo['segundos']:.2f}s "
+              f"({resumo['mbps']:.2f} MB/s agregados) | Falhas: {len(resumo['falhas'])}")
+        print("=" * 50)
+        
+        return not resumo['falhas']
 
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Processo 1 - FTP + Email")
+    parser.add_argument("--backfill", nargs=2, metavar=("INICIO", "FIM"),
+                        help="Baixa os TrackingRecord do intervalo (YYYY-MM-DD YYYY-MM-DD) sem enviar email")
+    parser.add_argument("--conexoes", type=int, default=4, help="Conexões FTP simultâneas no backfill")
+    adicionar_argumento(parser)
+    args = parser.parse_args()
+    
     automacao = AutomacaoProcesso1()
-    automacao.executar()
\ No newline at end of file
+    if args.backfill:
+        automacao.executar_backfill(*args.backfill, conexoes=args.conexoes)
+    else:
+        automacao.executar()
\ No newline at end of file
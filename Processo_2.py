@@ -9,35 +9,34 @@
 # 4. Salva um LOG com o que tem dentro de cada pasta.
 
 import os
+import sys
+import time
+import argparse
 from datetime import datetime
-import paramiko
 import stat
-import requests
 import json
-from dotenv import load_dotenv
+import asyncio
+from configuracao import carregar_configuracao_ou_sair, obter_configuracao
 
-# Carrega as variáveis do arquivo .env
-# Busca o .env na mesma pasta do script
-script_dir = os.path.dirname(os.path.abspath(__file__))
-env_path = os.path.join(script_dir, '.env')
+from nucleo_async import listar_pastas_sftp
+from metricas import instrumentar, medir_fase, contar
+from perfilamento import adicionar_argumento, perfilar_se_ativado
+from notificacao_teams import publicar_card
+from gravacao_rede import conexao_ssh
+from feed_remoto import FeedPastasRemotas
+from entrada_arquivo import EntradaArquivo
 
-print(f"🔍 Procurando arquivo .env em: {env_path}")
-
-if os.path.exists(env_path):
-    print(f"✅ Arquivo .env encontrado!")
-    load_dotenv(env_path)
-else:
-    print(f"❌ ERRO: Arquivo .env NÃO encontrado em: {env_path}")
-    print(f"📁 Certifique-se de criar o arquivo .env na mesma pasta do script!")
-    exit(1)
+# Localiza, lê e valida o .env da pasta do script (sem .env, encerra com código 1)
+carregar_configuracao_ou_sair()
 
 class AutomacaoProcesso2:
     def __init__(self):
+        config = obter_configuracao()
 
-        self.sftp_host = os.getenv('SFTP_HOST_2')
-        self.sftp_port = int(os.getenv('SFTP_PORT_2', '22'))
-        self.sftp_user = os.getenv('SFTP_USER_2')
-        self.sftp_pass = os.getenv('SFTP_PASS_2')
+        self.sftp_host = config.sftp2_host
+        self.sftp_port = config.sftp2_port
+        self.sftp_user = config.sftp2_user
+        self.sftp_pass = config.sftp2_pass
         
 
         self.pastas_monitorar = [
@@ -48,10 +47,10 @@ class AutomacaoProcesso2:
         ]
         
 
-        self.pasta_logs = os.getenv('PASTA_LOGS')
+        self.pasta_logs = config.pasta_logs
         
 
-        self.teams_webhook_url = os.getenv('TEAMS_WEBHOOK_URL')
+        self.teams_webhook_url = config.teams_webhook_url
         
 
         self._validar_variaveis()
@@ -79,9 +78,12 @@ class AutomacaoProcesso2:
             os.makedirs(self.pasta_logs)
             print(f"Pasta de logs criada: {self.pasta_logs}")
     
+    @medir_fase("connect")
     def conectar_sftp(self):
         """Conecta ao servidor SFTP"""
-        try:
+        def abrir():
+            import paramiko
+            
             # Cria cliente SSH
             ssh = paramiko.SSHClient()
             ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
@@ -93,8 +95,11 @@ class AutomacaoProcesso2:
                 username=self.sftp_user,
                 password=self.sftp_pass
             )
-            
-
+            return ssh
+        
+        try:
+            # Com RPA_GRAVAR/RPA_REPRODUZIR a sessão é gravada ou reproduzida (gravacao_rede.py)
+            ssh = conexao_ssh(f"sftp://{self.sftp_host}", abrir)
             sftp = ssh.open_sftp()
             print(f"Conectado ao SFTP: {self.sftp_host}")
             
@@ -111,35 +116,53 @@ class AutomacaoProcesso2:
             
 
             arquivos_detalhados = []
+            tempo_stat = 0.0
             for arquivo in arquivos:
                 caminho_completo = f"{caminho_pasta}/{arquivo}"
                 try:
+                    inicio_stat = time.perf_counter()
                     attrs = sftp.stat(caminho_completo)
+                    tempo_stat += time.perf_counter() - inicio_stat
 
                     if not stat.S_ISDIR(attrs.st_mode):
-
-                        data_modificacao = datetime.fromtimestamp(attrs.st_mtime)
-                        tamanho_kb = attrs.st_size / 1024  
-                        
-                        arquivos_detalhados.append({
-                            'nome': arquivo,
-                            'tamanho_kb': round(tamanho_kb, 2),
-                            'data_modificacao': data_modificacao.strftime('%d/%m/%Y %H:%M:%S')
-                        })
+                        # Só os valores crus; KB e data são formatados no log (entrada_arquivo.py)
+                        arquivos_detalhados.append(EntradaArquivo(arquivo, attrs.st_size, int(attrs.st_mtime)))
                 except:
 
-                    arquivos_detalhados.append({
-                        'nome': arquivo,
-                        'tamanho_kb': 'N/A',
-                        'data_modificacao': 'N/A'
-                    })
+                    arquivos_detalhados.append(EntradaArquivo(arquivo))
             
+            # Um listdir + um stat por arquivo (cada um é uma ida e volta ao servidor)
+            contar(self, "round_trips", 1 + len(arquivos))
+            # As pastas são listadas em paralelo: a soma dos stats das threads passa do tempo de parede,
+            # por isso vai como contador próprio e não como fase (a fase "list" já mede a parede)
+            contar(self, "stat_ms_threads", round(tempo_stat * 1000))
             return arquivos_detalhados
             
         except Exception as e:
             print(f"Erro ao listar arquivos em {caminho_pasta}: {e}")
             return None
     
+    def arquivos_do_feed(self, feed, caminho_pasta):
+        """Arquivos da pasta a partir da visão do feed, no mesmo formato de listar_arquivos_pasta"""
+        return [
+            EntradaArquivo(nome, tamanho, int(mtime))
+            for nome, (mtime, tamanho) in sorted(feed.arquivos(caminho_pasta).items())
+        ]
+    
+    def snapshot_idades(self, resultado):
+        """
+        Snapshot colunar da pasta (snapshot_pastas.py), montado uma vez por resultado
+        - Volume, mais antigo e faixas de idade saem de operações vetorizadas, não de laços por arquivo
+        """
+        if 'snapshot' not in resultado:
+            from snapshot_pastas import SnapshotPasta
+
+            resultado['snapshot'] = SnapshotPasta.de_atributos(
+                resultado['pasta'],
+                ((a.nome, a.tamanho, a.mtime) for a in resultado['arquivos'] if a.mtime is not None)
+            )
+        return resultado['snapshot']
+
     def gerar_log(self, resultados):
         """Gera arquivo de log com os resultados do monitoramento"""
         try:
@@ -166,12 +189,23 @@ class AutomacaoProcesso2:
                     elif len(arquivos) == 0:
                         log.write("STATUS: Pasta vazia (sem arquivos)\n")
                     else:
-                        log.write(f"STATUS: {len(arquivos)} arquivo(s) encontrado(s)\n\n")
+                        log.write(f"STATUS: {len(arquivos)} arquivo(s) encontrado(s)\n")
+                        snapshot = self.snapshot_idades(resultado)
+                        if len(snapshot):
+                            from snapshot_pastas import formatar_idade
+
+                            nome, mtime, _ = snapshot.mais_antigos(1)[0]
+                            log.write(f"VOLUME: {snapshot.total_bytes() / 1024:.2f} KB | "
+                                      f"MAIS ANTIGO: {nome} (há {formatar_idade(snapshot.tirado_em - mtime)})\n")
+                            log.write("IDADES: " + " | ".join(
+                                f"{rotulo}: {qtd}" for rotulo, qtd, _ in snapshot.histograma() if qtd
+                            ) + "\n")
+                        log.write("\n")
                         
                         for i, arquivo in enumerate(arquivos, 1):
-                            log.write(f"  [{i}] Arquivo: {arquivo['nome']}\n")
-                            log.write(f"      Tamanho: {arquivo['tamanho_kb']} KB\n")
-                            log.write(f"      Última modificação: {arquivo['data_modificacao']}\n\n")
+                            log.write(f"  [{i}] Arquivo: {arquivo.nome}\n")
+                            log.write(f"      Tamanho: {arquivo.tamanho_kb} KB\n")
+                            log.write(f"      Última modificação: {arquivo.data_modificacao}\n\n")
                 
                 log.write("\n" + "=" * 80 + "\n")
                 log.write("FIM DO LOG\n")
@@ -184,6 +218,7 @@ class AutomacaoProcesso2:
             print(f"Erro ao gerar log: {e}")
             return None
 
+    @medir_fase("notify")
     def enviar_para_teams(self, resultados):
         """Envia resumo do monitoramento para o Teams via Adaptive Card"""
         try:
@@ -269,14 +304,23 @@ class AutomacaoProcesso2:
                 }]
             }
 
-            response = requests.post(self.teams_webhook_url, json=adaptive_payload, timeout=15)
+            # Com TEAMS_DIGEST=1 o card vai para a fila do digest (notificacao_teams.py)
+            envio = publicar_card(self.teams_webhook_url, adaptive_payload, "processo_2", container_style,
+                                  timeout_s=15, conteudo=facts_adaptive)
+            if envio.suprimido:
+                print("🔕 Card igual ao último enviado (dentro do cooldown), não reenviado")
+                return True
+            if envio.enfileirado:
+                print("📬 Card enfileirado para o digest do Teams")
+                return True
+            contar(self, "round_trips")
 
-            if response.status_code == 202:
+            if envio.status == 202:
                 print("✅ Mensagem (Adaptive Card) enviada para o Teams com sucesso!")
                 return True
             else:
-                print(f"❌ Erro ao enviar para o Teams: {response.status_code}")
-                print(f"Resposta: {response.text}")
+                print(f"❌ Erro ao enviar para o Teams: {envio.status}")
+                print(f"Resposta: {envio.texto}")
                 return False
 
         except Exception as e:
@@ -302,11 +346,18 @@ class AutomacaoProcesso2:
             else:
                 status = "OK"
                 qtd = str(len(arquivos))
+                snapshot = self.snapshot_idades(resultado)
+                if len(snapshot):
+                    from snapshot_pastas import formatar_idade
+
+                    _, mtime, _ = snapshot.mais_antigos(1)[0]
+                    status += f" (mais antigo há {formatar_idade(snapshot.tirado_em - mtime)})"
             
             print(f"  • {pasta.split('/')[-1]:25s} | Arquivos: {qtd:4s} | Status: {status}")
         
         print("=" * 80)
     
+    @instrumentar("processo_2")
     def executar(self):
         """Executa o processo completo de monitoramento"""
         print("=" * 80)
@@ -325,9 +376,14 @@ class AutomacaoProcesso2:
 
             resultados = []
             
-            for pasta in self.pastas_monitorar:
+            # As pastas são listadas em paralelo, cada uma no seu canal SFTP
+            with self.metricas.fase("list"):
+                listagens = asyncio.run(
+                    listar_pastas_sftp(ssh, self.pastas_monitorar, self.listar_arquivos_pasta)
+                )
+            
+            for pasta, arquivos in zip(self.pastas_monitorar, listagens):
                 print(f"\nMonitorando: {pasta}")
-                arquivos = self.listar_arquivos_pasta(sftp, pasta)
                 
                 resultados.append({
                     'pasta': pasta,
@@ -364,7 +420,82 @@ class AutomacaoProcesso2:
             print("Conexão SFTP encerrada")
 
 
+    def observar(self, intervalo_s=60.0, duracao_s=None, modo="auto"):
+        """
+        Modo observação: um canal exec com o feed de alterações das pastas (feed_remoto.py)
+        - Sem listdir/stat repetidos: as contagens vêm da visão em memória do feed
+        - A cada mudança (no máximo uma vez por intervalo_s) gera o log e manda o resumo ao Teams
+        """
+        self.criar_pasta_logs()
+        
+        ssh, sftp = self.conectar_sftp()
+        if not sftp:
+            return False
+        sftp.close()
+        
+        try:
+            feed = FeedPastasRemotas(ssh, self.pastas_monitorar, intervalo_s=min(intervalo_s, 5.0), modo=modo)
+        except Exception as e:
+            print(f"❌ Não foi possível abrir o feed de alterações: {e}")
+            ssh.close()
+            return False
+        
+        try:
+            if not feed.aguardar(60):
+                print(f"❌ Feed de alterações não iniciou: {feed.erro or 'sem resposta do servidor'}")
+                return False
+            print(f"👀 Observando {len(self.pastas_monitorar)} pasta(s) em {self.sftp_host} (feed {feed.modo})")
+            
+            fim = None if duracao_s is None else time.monotonic() + duracao_s
+            def restante(segundos):
+                return segundos if fim is None else max(0.0, min(segundos, fim - time.monotonic()))
+
+            versao = None
+            while fim is None or time.monotonic() < fim:
+                if not feed.vivo:
+                    print(f"❌ Feed de alterações encerrado: {feed.erro or 'canal fechado'}")
+                    return False
+
+                if feed.versao != versao:
+                    versao = feed.versao
+                    resultados = [
+                        {'pasta': pasta, 'arquivos': self.arquivos_do_feed(feed, pasta)}
+                        for pasta in self.pastas_monitorar
+                    ]
+                    self.gerar_log(resultados)
+                    self.enviar_para_teams(resultados)
+                    self.gerar_resumo_console(resultados)
+
+                    # Uma rajada de eventos vira um resumo só por intervalo
+                    time.sleep(restante(intervalo_s))
+
+                feed.esperar_mudanca(versao, restante(intervalo_s))
+            
+            print(f"Observação encerrada: {feed.listagens} listagem(ns), {feed.eventos} evento(s)")
+            return True
+        
+        finally:
+            feed.fechar()
+            ssh.close()
+            print("Conexão SFTP encerrada")
+
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Processo 2 - Monitoramento SFTP")
+    parser.add_argument("--observar", action="store_true",
+                        help="Fica conectado acompanhando as pastas pelo feed de alterações (inotifywait/find)")
+    parser.add_argument("--intervalo", type=float, default=60.0, help="Mínimo de segundos entre resumos no modo observação")
+    parser.add_argument("--duracao", type=float, default=None, help="Encerra a observação após N segundos")
+    parser.add_argument("--modo-feed", choices=("auto", "inotify", "find"), default="auto")
+    adicionar_argumento(parser)
+    args = parser.parse_args()
+    
     processo2 = AutomacaoProcesso2()
-    processo2.executar()
\ No newline at end of file
+    if args.observar:
+        # executar() já é perfilado pelo @instrumentar; a observação passa pelo mesmo --perfilar/PERFILAR
+        with perfilar_se_ativado("processo_2"):
+            sucesso = processo2.observar(intervalo_s=args.intervalo, duracao_s=args.duracao, modo=args.modo_feed)
+    else:
+        sucesso = processo2.executar()
+    sys.exit(0 if sucesso else 1)
\ No newline at end of file
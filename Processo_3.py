@@ -6,33 +6,29 @@
 import os
 import sys
 import time
-import platform
-import subprocess
 import threading
 from pathlib import Path
 from datetime import datetime, date, timedelta
-from logging.handlers import RotatingFileHandler
-import logging
-import requests
-from dotenv import load_dotenv
+from configuracao import carregar_configuracao_ou_sair, obter_configuracao
+from metricas import instrumentar, medir_fase, contar, somar_fase
+from notificacao_teams import publicar_card
+from registro_logs import configurar_logger
+from monitor_chegada import MonitorChegada, main as main_chegada
 
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
-env_path = os.path.join(script_dir, '.env')
 
-print(f"🔍 Procurando arquivo .env em: {env_path}")
+# Localiza, lê e valida o .env da pasta do script (sem .env, encerra com código 1)
+carregar_configuracao_ou_sair()
 
-if os.path.exists(env_path):
-    print(f"✅ Arquivo .env encontrado!")
-    load_dotenv(env_path)
-else:
-    print(f"❌ ERRO: Arquivo .env NÃO encontrado em: {env_path}")
-    print(f"📁 Certifique-se de criar o arquivo .env na mesma pasta do script!")
-    sys.exit(1)
 
+class AutomacaoProcesso3(MonitorChegada):
+    JOB_CHEGADA = "processo_3"
+    TITULO_CHEGADA = "📁 Monitoramento Arquivo Santander"
+    FORMATO_TOKEN = "%d%m%y"
 
-class AutomacaoProcesso3:
     def __init__(self):
+        config = obter_configuracao()
 
         self.folder_path = r"\\172.20.1.43\C\SANTANDER\retorno\BKP"
         
@@ -53,10 +49,10 @@ class AutomacaoProcesso3:
         self.log_progress_every = 500
         
 
-        self.pasta_logs = os.getenv('PASTA_LOGS', script_dir) or script_dir
+        self.pasta_logs = config.pasta_logs or script_dir
         
 
-        self.teams_webhook_url = os.getenv('TEAMS_WEBHOOK_URL')
+        self.teams_webhook_url = config.teams_webhook_url
         
 
         self.request_timeout = 15
@@ -70,6 +66,8 @@ class AutomacaoProcesso3:
         
 
         self.logger = self._setup_logger()
+        
+        self._mtime_pasta = None
     
     def _validar_variaveis(self):
         """Valida se todas as variáveis necessárias foram carregadas"""
@@ -86,7 +84,7 @@ class AutomacaoProcesso3:
         print("✅ Todas as variáveis de ambiente carregadas com sucesso!")
     
     def _setup_logger(self):
-        """Configura o sistema de logging"""
+        """Configura o sistema de logging (escrita em thread de fundo, ver registro_logs.py)"""
         try:
             os.makedirs(self.pasta_logs, exist_ok=True)
         except Exception as e:
@@ -95,29 +93,12 @@ class AutomacaoProcesso3:
         
         log_path = os.path.join(self.pasta_logs, "validador_arquivo_santander.log")
         
-        logger = logging.getLogger("validador_arquivo_santander")
-        logger.setLevel(logging.INFO)
-        logger.propagate = False
-        
-        fmt = logging.Formatter("%(asctime)s %(levelname)s %(message)s", "%Y-%m-%d %H:%M:%S")
-        
-
-        fh = RotatingFileHandler(
+        return configurar_logger(
+            "validador_arquivo_santander", 
             log_path, 
-            maxBytes=self.log_max_bytes, 
-            backupCount=self.log_backup_count, 
-            encoding="utf-8"
+            max_bytes=self.log_max_bytes, 
+            backup_count=self.log_backup_count
         )
-        fh.setFormatter(fmt)
-        
-
-        ch = logging.StreamHandler(sys.stdout)
-        ch.setFormatter(fmt)
-        
-        logger.addHandler(fh)
-        logger.addHandler(ch)
-        
-        return logger
     
     def parse_hhmm_on(self, day: date, hhmm: str) -> datetime:
         """Converte string HH:MM em datetime para um dia específico"""
@@ -183,29 +164,20 @@ class AutomacaoProcesso3:
                 return partes[0]
         return None
     
+    @medir_fase("connect")
     def ping_host(self, host: str, timeout_ms: int = 1000) -> bool:
         """
-        Verifica conectividade com ping
-        - Windows: ping -n 1 -w <ms>
-        - Linux/Mac: ping -c 1 -W <segundos>
+        Verifica conectividade: ping e conexão na porta SMB (445) ao mesmo tempo (nucleo_async.py)
+        - Basta um dos dois responder; firewall que bloqueia ICMP não derruba a checagem
         """
         if not host:
             return False
         
+        import asyncio
+        from nucleo_async import servidor_acessivel
+        
         try:
-            if platform.system().lower().startswith("win"):
-                cmd = ["ping", "-n", "1", "-w", str(timeout_ms), host]
-            else:
-                sec = max(1, timeout_ms // 1000)
-                cmd = ["ping", "-c", "1", "-W", str(sec), host]
-            
-            res = subprocess.run(
-                cmd, 
-                stdout=subprocess.DEVNULL, 
-                stderr=subprocess.DEVNULL, 
-                timeout=(timeout_ms/1000)+1
-            )
-            return res.returncode == 0
+            return asyncio.run(servidor_acessivel(host, timeout_ms=timeout_ms))
         except Exception:
             return False
     
@@ -251,6 +223,7 @@ class AutomacaoProcesso3:
         
         yield from scan_dir(folder)
     
+    @medir_fase("list")
     def find_matches(self, expected_dt: datetime) -> tuple:
         """Busca arquivos que correspondem aos critérios"""
         folder = Path(self.folder_path)
@@ -262,12 +235,15 @@ class AutomacaoProcesso3:
         found = []
         out_of_window = []
         total_seen = 0
+        tempo_stat = 0.0
         
         for f in self.iter_files_with_limits(folder, self.prefix):
             total_seen += 1
             
             try:
+                inicio_stat = time.perf_counter()
                 st = f.stat()
+                tempo_stat += time.perf_counter() - inicio_stat
             except Exception:
                 continue
             
@@ -287,6 +263,9 @@ class AutomacaoProcesso3:
                     found.append(f)
         
         elapsed = time.time() - start_scan
+        # Na pasta de rede, a listagem e cada stat são idas e voltas SMB
+        contar(self, "round_trips", 1 + total_seen)
+        somar_fase(self, "stat", tempo_stat)
         self.logger.info(
             f"Varredura concluída: {total_seen} arquivos inspecionados em {elapsed:.1f}s "
             f"Encontrados: {len(found)} Fora da janela: {len(out_of_window)}"
@@ -294,6 +273,10 @@ class AutomacaoProcesso3:
         
         return found, out_of_window
     
+    def horarios_execucao(self) -> list:
+        """HH:MM das execuções do dia, em ordem (usado por MonitorChegada)"""
+        return sorted(self.run_schedules)
+    
     def run_with_timeout(self, func, args=(), kwargs=None, timeout_sec: int = 20):
         """Executa função com timeout externo usando thread"""
         if kwargs is None:
@@ -321,6 +304,7 @@ class AutomacaoProcesso3:
         
         return (True, result["val"], None)
     
+    @medir_fase("notify")
     def enviar_para_teams(self, titulo: str, subtitulo_markdown: str, 
                          facts: list, status_geral: str, container_style: str):
         """Envia mensagem para o Teams via Adaptive Card"""
@@ -364,24 +348,36 @@ class AutomacaoProcesso3:
                 }]
             }
             
-            response = requests.post(
+            # Com TEAMS_DIGEST=1 o card vai para a fila do digest (notificacao_teams.py)
+            envio = publicar_card(
                 self.teams_webhook_url, 
-                json=adaptive_payload, 
-                timeout=self.request_timeout
+                adaptive_payload, 
+                "processo_3", 
+                container_style, 
+                timeout_s=self.request_timeout,
+                conteudo=[titulo, status_geral, facts]
             )
+            if envio.suprimido:
+                self.logger.info("🔕 Card igual ao último enviado (dentro do cooldown), não reenviado")
+                return True
+            if envio.enfileirado:
+                self.logger.info("📬 Card enfileirado para o digest do Teams")
+                return True
+            contar(self, "round_trips")
             
-            if response.status_code == 202:
+            if envio.status == 202:
                 self.logger.info("✅ Mensagem enviada para o Teams com sucesso!")
                 return True
             else:
-                self.logger.error(f"❌ Erro ao enviar para o Teams: {response.status_code}")
-                self.logger.error(f"Resposta: {response.text}")
+                self.logger.error(f"❌ Erro ao enviar para o Teams: {envio.status}")
+                self.logger.error(f"Resposta: {envio.texto}")
                 return False
                 
         except Exception as e:
             self.logger.error(f"❌ Erro ao enviar mensagem para o Teams: {e}")
             return False
     
+    @instrumentar("processo_3")
     def executar(self):
         """Executa o processo completo de verificação"""
         self.logger.info("=" * 80)
@@ -424,7 +420,7 @@ class AutomacaoProcesso3:
                 subtitulo_markdown=f"Pasta: `{self.folder_path}`",
                 facts=[
                     ("Host", host_unc),
-                    ("Status", "Sem resposta ao ping (1s)")
+                    ("Status", "Sem resposta ao ping nem na porta 445 (1s)")
                 ],
                 status_geral="❌ Falha de conectividade",
                 container_style="attention"
@@ -434,32 +430,39 @@ class AutomacaoProcesso3:
         
 
         try:
-            self.logger.info("Iniciando varredura da pasta de rede...")
+            confirmado = self.arquivo_confirmado(run_dt, expected_dt)
+            if confirmado is not None:
+                self.logger.info(f"📌 Janela já confirmada por {confirmado.name}: conferida com um stat, sem varredura")
+                res = ([confirmado], [])
+            else:
+                self.logger.info("Iniciando varredura da pasta de rede...")
             
-            ok_timeout, res, _ = self.run_with_timeout(
-                self.find_matches,
-                args=(expected_dt,),
-                timeout_sec=self.scan_max_seconds + 10
-            )
+                ok_timeout, res, _ = self.run_with_timeout(
+                    self.find_matches,
+                    args=(expected_dt,),
+                    timeout_sec=self.scan_max_seconds + 10
+                )
             
-            if not ok_timeout:
-                msg = f"Acesso à pasta levou mais de {self.scan_max_seconds + 10}s (possível bloqueio)"
-                self.logger.error(msg)
+                if not ok_timeout:
+                    msg = f"Acesso à pasta levou mais de {self.scan_max_seconds + 10}s (possível bloqueio)"
+                    self.logger.error(msg)
                 
-                self.enviar_para_teams(
-                    titulo="📁 Monitoramento Arquivo Santander",
-                    subtitulo_markdown=f"Pasta: `{self.folder_path}`",
-                    facts=[
-                        ("Host", host_unc or "-"),
-                        ("Timeout externo", f"{self.scan_max_seconds + 10}s")
-                    ],
-                    status_geral="⚠️ Timeout no acesso à pasta",
-                    container_style="warning"
-                )
+                    self.enviar_para_teams(
+                        titulo="📁 Monitoramento Arquivo Santander",
+                        subtitulo_markdown=f"Pasta: `{self.folder_path}`",
+                        facts=[
+                            ("Host", host_unc or "-"),
+                            ("Timeout externo", f"{self.scan_max_seconds + 10}s")
+                        ],
+                        status_geral="⚠️ Timeout no acesso à pasta",
+                        container_style="warning"
+                    )
                 
-                return False
+                    return False
             
             matches, out_of_window = res
+            if matches and confirmado is None:
+                self.registrar_chegada(run_dt, expected_dt, matches)
             token = self.today_token_for(expected_dt)
             
 
@@ -560,6 +563,4 @@ class AutomacaoProcesso3:
 
 
 if __name__ == "__main__":
-    processo3 = AutomacaoProcesso3()
-    sucesso = processo3.executar()
-    sys.exit(0 if sucesso else 1)
\ No newline at end of file
+    sys.exit(main_chegada(AutomacaoProcesso3, "Processo 3 - Verificação de arquivo Santander"))
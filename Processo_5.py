@@ -7,49 +7,46 @@
 
 import os
 from datetime import datetime
-import requests
-from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-import pandas as pd
+from configuracao import carregar_configuracao_ou_sair, obter_configuracao
 import time
 from pathlib import Path
+from leitor_excel_ga import LeitorPlanilhaGA
+from regras_filtro import Regra, ConjuntoRegras
+from historico_ga import HistoricoGA, NOME_BANCO
+from cache_relatorios import CacheRelatorios, NOME_CACHE, calcular_hash
+from metricas import instrumentar, medir_fase, contar
+from notificacao_teams import publicar_card
+from gravacao_rede import em_reproducao, registrar_arquivo, reproduzir_arquivo
 
 
-script_dir = os.path.dirname(os.path.abspath(__file__))
-env_path = os.path.join(script_dir, '.env')
-
-print(f"🔍 Procurando arquivo .env em: {env_path}")
-
-if os.path.exists(env_path):
-    print(f"✅ Arquivo .env encontrado!")
-    load_dotenv(env_path)
-else:
-    print(f"❌ ERRO: Arquivo .env NÃO encontrado em: {env_path}")
-    print(f"📁 Certifique-se de criar o arquivo .env na mesma pasta do script!")
-    exit(1)
+# Localiza, lê e valida o .env da pasta do script (sem .env, encerra com código 1)
+carregar_configuracao_ou_sair()
 
 class AutomacaoProcesso5:
     def __init__(self):
+        config = obter_configuracao()
 
-        self.ga_url = os.getenv('GA_URL', 'https://ga.flashcourier.com.br/logs')
-        self.ga_email = os.getenv('GA_EMAIL')
-        self.ga_senha = os.getenv('GA_SENHA')
+        self.ga_url = config.ga_url
+        self.ga_email = config.ga_email
+        self.ga_senha = config.ga_senha
         
 
         self.cliente_pesquisa = "SODEXO_NEW_SEMDUPLICADO_REM"
         
 
+        self.regras_filtro = ConjuntoRegras([
+            Regra("G", "eq", "ENTREGUE"),
+            Regra("D", "contains", ".SD1", negar=True),
+        ])
+        
+
         self.download_path = str(Path.home() / "Downloads")
         
 
-        self.pasta_logs = os.getenv('PASTA_LOGS')
+        self.pasta_logs = config.pasta_logs
         
 
-        self.teams_webhook_url = os.getenv('TEAMS_WEBHOOK_URL')
+        self.teams_webhook_url = config.teams_webhook_url
         
 
         self.driver = None
@@ -82,9 +79,14 @@ class AutomacaoProcesso5:
             os.makedirs(self.pasta_logs)
             print(f"Pasta de logs criada: {self.pasta_logs}")
     
+    @medir_fase("connect")
     def inicializar_driver(self):
         """Inicializa o driver Chrome"""
         try:
+            from selenium import webdriver
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.webdriver.chrome.options import Options
+            
             chrome_options = Options()
             chrome_options.add_argument("--headless")
             chrome_options.add_argument("--no-sandbox")
@@ -106,11 +108,15 @@ class AutomacaoProcesso5:
             print(f"❌ Erro ao inicializar driver: {e}")
             return False
     
+    @medir_fase("connect")
     def fazer_login(self):
         """Faz login no GA"""
         try:
+            from selenium.webdriver.common.by import By
+            
             print(f"🔗 Acessando GA: {self.ga_url}")
             self.driver.get(self.ga_url)
+            contar(self, "round_trips")
             time.sleep(2)
             
             self.timestamp_inicio = time.time()
@@ -132,9 +138,13 @@ class AutomacaoProcesso5:
             print(f"❌ Erro ao fazer login: {e}")
             return False
     
+    @medir_fase("download")
     def extrair_relatorio_cliente(self):
         """Extrai o relatório do cliente no GA"""
         try:
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support import expected_conditions as EC
+            
             print(f"🔍 Extraindo relatório para: {self.cliente_pesquisa}")
             
             campo_pesquisa = self.wait.until(
@@ -150,6 +160,7 @@ class AutomacaoProcesso5:
                 EC.element_to_be_clickable((By.ID, "spreadsheet"))
             )
             botao_excel.click()
+            contar(self, "round_trips")
             
             print("📥 Download iniciado...")
             time.sleep(7)
@@ -165,7 +176,9 @@ class AutomacaoProcesso5:
     def _obter_arquivo_recente(self):
         """Obtém o arquivo mais recente baixado"""
         try:
-            time.sleep(2)
+            # Na reprodução o export já está em Downloads
+            if not em_reproducao():
+                time.sleep(2)
             
             arquivos_xlsx = [f for f in os.listdir(self.download_path) 
                            if f.endswith('.xlsx') and not f.startswith('~')]
@@ -201,6 +214,15 @@ class AutomacaoProcesso5:
             print(f"❌ Erro ao identificar arquivo: {e}")
             return None
     
+    def _abrir_cache(self):
+        """Abre o cache de exports já processados (None se indisponível)"""
+        try:
+            return CacheRelatorios(os.path.join(self.pasta_logs, NOME_CACHE))
+        except Exception as e:
+            print(f"⚠️ Cache de relatórios indisponível: {e}")
+            return None
+    
+    @medir_fase("parse")
     def _processar_arquivo_excel(self):
         """Processa o arquivo Excel baixado"""
         try:
@@ -216,24 +238,36 @@ class AutomacaoProcesso5:
                 print(f"⚠️ Arquivo não encontrado: {arquivo_path}")
                 return None
             
-            print(f"📊 Processando arquivo: {arquivo}")
-            df = pd.read_excel(arquivo_path)
-            print(f"✅ Arquivo carregado com {len(df)} linhas e {df.shape[1]} colunas")
+            # Com RPA_GRAVAR, guarda o export e o tempo do navegador até aqui (gravacao_rede.py)
+            registrar_arquivo(f"ga:{self.cliente_pesquisa}", arquivo_path, time.time() - self.metricas.inicio)
             
-            total = 0
-            
-            if df.shape[1] >= 7:
-                coluna_d = df.iloc[:, 3]
-                coluna_e = df.iloc[:, 4]
-                coluna_g = df.iloc[:, 6]
+            print(f"📊 Processando arquivo: {arquivo}")
+            contar(self, "bytes_recebidos", os.path.getsize(arquivo_path))
+            hash_arquivo = calcular_hash(arquivo_path)
+            cache = self._abrir_cache()
+            agregados = cache.obter(hash_arquivo, self.cliente_pesquisa, self.regras_filtro.digest) if cache else None
+            
+            if agregados is not None:
+                status_cache = "HIT"
+                print(f"♻️ Cache HIT ({hash_arquivo[:12]}): export idêntico já processado, leitura ignorada")
+                print(f"📈 Total somado da coluna E: {agregados['total']}")
+            else:
+                status_cache = "MISS"
+                print(f"🗄️ Cache MISS ({hash_arquivo[:12]}): processando export")
                 
-                filtro = (coluna_g.astype(str).str.upper() == "ENTREGUE") & \
-                        (~coluna_d.astype(str).str.contains(".SD1", case=False, na=False))
+                leitor = LeitorPlanilhaGA(arquivo_path)
+                agregados = leitor.agregar(4, self.regras_filtro.colunas, self.regras_filtro)
+                print(f"✅ Arquivo carregado com {leitor.linhas} linhas e {leitor.colunas} colunas")
                 
-                total = int(coluna_e[filtro].sum())
-                print(f"📈 Total somado da coluna E: {total}")
-            else:
-                print("⚠️ Arquivo não possui as colunas necessárias")
+                if leitor.colunas >= 7:
+                    print(f"📈 Total somado da coluna E: {agregados['total']}")
+                else:
+                    # Marcado como inválido (também no cache): não é um dia zerado de verdade
+                    agregados = {'total': 0, 'por_arquivo': {}, 'por_status': {}, 'valido': False}
+                    print("⚠️ Arquivo não possui as colunas necessárias")
+                
+                if cache:
+                    cache.guardar(hash_arquivo, self.cliente_pesquisa, self.regras_filtro.digest, agregados)
             
             self.arquivos_processados.append(arquivo)
             
@@ -245,8 +279,13 @@ class AutomacaoProcesso5:
                 print(f"⚠️ Não foi possível excluir o arquivo: {e}")
             
             return {
-                'total': total,
-                'arquivo': arquivo
+                'total': agregados['total'],
+                'arquivo': arquivo,
+                'por_arquivo': agregados['por_arquivo'],
+                'por_status': agregados['por_status'],
+                'cache': status_cache,
+                'hash': hash_arquivo,
+                'valido': agregados.get('valido', True)
             }
         
         except Exception as e:
@@ -266,6 +305,13 @@ class AutomacaoProcesso5:
         """Conecta no GA e extrai o relatório"""
         try:
 
+            if em_reproducao():
+                # Sem navegador: o export gravado volta para Downloads após o tempo gravado
+                self.timestamp_inicio = time.time()
+                with self.metricas.fase("download"):
+                    reproduzir_arquivo(f"ga:{self.cliente_pesquisa}", self.download_path)
+                return self._processar_arquivo_excel()
+
             if not self.inicializar_driver():
                 return None
             
@@ -287,6 +333,30 @@ class AutomacaoProcesso5:
             self.fechar_driver()
             return None
     
+    def registrar_historico(self, resultado):
+        """
+        Grava o resultado do dia no histórico local e devolve os dias zerados recentes
+        - Export sem as colunas necessárias não é gravado (o total 0 forçado não é um dia zerado)
+        """
+        if not resultado.get('valido', True):
+            print("⚠️ Export sem as colunas necessárias: histórico não atualizado")
+            return None
+        
+        try:
+            historico = HistoricoGA(os.path.join(self.pasta_logs, NOME_BANCO))
+            try:
+                historico.registrar(self.cliente_pesquisa, resultado)
+                dias_zerados = historico.dias_zerados(self.cliente_pesquisa, dias=7)
+            finally:
+                historico.fechar()
+            
+            print(f"🗃️ Histórico atualizado ({len(dias_zerados)} dia(s) zerado(s) nos últimos 7)")
+            return dias_zerados
+        
+        except Exception as e:
+            print(f"⚠️ Não foi possível atualizar o histórico: {e}")
+            return None
+    
     def gerar_log(self, resultado):
         """Gera arquivo de log com os resultados da extração"""
         try:
@@ -318,6 +388,22 @@ class AutomacaoProcesso5:
                     log.write(f"QUANTIDADE TOTAL: {resultado['total']}\n")
                     log.write(f"ARQUIVO EXCLUÍDO: Sim (após processamento)\n")
                 
+                if resultado:
+                    log.write(f"CACHE: {resultado['cache']} (sha256 {resultado['hash'][:12]})\n")
+                    
+                    log.write("\nQUANTIDADE POR STATUS (coluna G):\n")
+                    for status, soma in sorted(resultado['por_status'].items(), key=lambda x: -x[1]):
+                        log.write(f"  {status or '(vazio)'}: {soma}\n")
+                    
+                    log.write("\nQUANTIDADE POR ARQUIVO (coluna D, após filtro):\n")
+                    for nome, soma in sorted(resultado['por_arquivo'].items(), key=lambda x: -x[1])[:20]:
+                        log.write(f"  {nome or '(vazio)'}: {soma}\n")
+                    if len(resultado['por_arquivo']) > 20:
+                        log.write(f"  ... e mais {len(resultado['por_arquivo']) - 20} arquivo(s)\n")
+                
+                if resultado and resultado.get('dias_zerados'):
+                    log.write(f"\nDIAS ZERADOS (últimos 7): {', '.join(resultado['dias_zerados'])}\n")
+                
                 log.write("\n" + "=" * 80 + "\n")
                 log.write("FIM DO LOG\n")
                 log.write("=" * 80 + "\n")
@@ -329,6 +415,7 @@ class AutomacaoProcesso5:
             print(f"❌ Erro ao gerar log: {e}")
             return None
 
+    @medir_fase("notify")
     def enviar_para_teams(self, resultado):
         """Envia resumo da extração para o Teams via Adaptive Card"""
         try:
@@ -391,6 +478,10 @@ class AutomacaoProcesso5:
                                                 "title": "📈 Quantidade Total:",
                                                 "value": quantidade_texto
                                             },
+                                            {
+                                                "title": "🗄️ Cache:",
+                                                "value": resultado['cache'] if resultado else "N/A"
+                                            },
                                             {
                                                 "title": "📁 Nomenclatura Monitorada:",
                                                 "value": "SODEXO_NEW_SEMDUPLICADO_REM"
@@ -404,14 +495,23 @@ class AutomacaoProcesso5:
                 }]
             }
 
-            response = requests.post(self.teams_webhook_url, json=adaptive_payload, timeout=15)
+            # Com TEAMS_DIGEST=1 o card vai para a fila do digest (notificacao_teams.py)
+            envio = publicar_card(self.teams_webhook_url, adaptive_payload, "processo_5", container_style,
+                                  timeout_s=15, conteudo=[status_geral, quantidade_texto])
+            if envio.suprimido:
+                print("🔕 Card igual ao último enviado (dentro do cooldown), não reenviado")
+                return True
+            if envio.enfileirado:
+                print("📬 Card enfileirado para o digest do Teams")
+                return True
+            contar(self, "round_trips")
 
-            if response.status_code == 202:
+            if envio.status == 202:
                 print("✅ Mensagem (Adaptive Card) enviada para o Teams com sucesso!")
                 return True
             else:
-                print(f"❌ Erro ao enviar para o Teams: {response.status_code}")
-                print(f"Resposta: {response.text}")
+                print(f"❌ Erro ao enviar para o Teams: {envio.status}")
+                print(f"Resposta: {envio.texto}")
                 return False
 
         except Exception as e:
@@ -442,6 +542,7 @@ class AutomacaoProcesso5:
         
         print("=" * 80)
     
+    @instrumentar("processo_5")
     def executar(self):
         """Executa o processo completo de extração do GA"""
         print("=" * 80)
@@ -454,6 +555,10 @@ class AutomacaoProcesso5:
 
         resultado = self.extrair_relatorio_ga()
         
+        
+        if resultado is not None:
+            resultado['dias_zerados'] = self.registrar_historico(resultado)
+        
 
         caminho_log = self.gerar_log(resultado)
         
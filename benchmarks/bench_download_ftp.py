@@ -0,0 +1,83 @@
+# - Benchmark do download FTP do Processo 1
+# Usa o servidor FTP local para medir:
+# 1. Download simples (retrbinary com bloco padrão, como antes);
+# 2. baixar_com_retomada com blocos de tamanhos diferentes;
+# 3. Retomada após queda da conexão de dados no meio do arquivo;
+# 4. Segundo download do mesmo arquivo (manifesto evita baixar de novo).
+#
+# Uso: python benchmarks/bench_download_ftp.py [--mb 64]
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from ftplib import FTP
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transferencia_ftp import baixar_com_retomada
+from servidor_ftp_local import ServidorFTPLocal
+
+
+NOME = "2025-11-07_TrackingRecord.xlsx"
+
+
+def conectar(porta):
+    ftp = FTP()
+    ftp.connect("127.0.0.1", porta)
+    ftp.login("usuario", "senha")
+    return ftp
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do download FTP")
+    parser.add_argument("--mb", type=int, default=64, help="Tamanho do arquivo sintético em MB")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as remoto, tempfile.TemporaryDirectory() as local:
+        with open(os.path.join(remoto, NOME), "wb") as f:
+            f.write(os.urandom(args.mb * 1024 * 1024))
+
+        servidor = ServidorFTPLocal(remoto).iniciar()
+        try:
+            ftp = conectar(servidor.porta)
+            inicio = time.perf_counter()
+            with open(os.path.join(local, "simples.bin"), "wb") as f:
+                ftp.retrbinary(f"RETR {NOME}", f.write)
+            segundos = time.perf_counter() - inicio
+            print(f"📦 retrbinary padrão (8 KB): {segundos:.2f}s ({args.mb / segundos:.1f} MB/s)")
+            ftp.quit()
+
+            for bloco_kb in (64, 256, 1024):
+                pasta = os.path.join(local, f"bloco_{bloco_kb}")
+                os.makedirs(pasta)
+                ftp = conectar(servidor.porta)
+                r = baixar_com_retomada(ftp, NOME, pasta, tamanho_bloco=bloco_kb * 1024)
+                print(f"⚡ baixar_com_retomada ({bloco_kb} KB): {r['segundos']:.2f}s ({r['mbps']:.1f} MB/s)")
+                ftp.quit()
+
+            pasta = os.path.join(local, "retomada")
+            os.makedirs(pasta)
+            servidor.config['cair_apos_bytes'] = (args.mb // 2) * 1024 * 1024
+            ftp = conectar(servidor.porta)
+            r = baixar_com_retomada(ftp, NOME, pasta, reconectar=lambda: conectar(servidor.porta))
+            print(f"↪️ Com queda na metade: {r['bytes']} bytes baixados, REST usado: {servidor.config['comandos'].get('REST', 0)}x")
+            r['conexao'].quit()
+
+            ftp = conectar(servidor.porta)
+            r = baixar_com_retomada(ftp, NOME, pasta)
+            print(f"♻️ Segunda execução: cache={r['cache']} bytes={r['bytes']}")
+            ftp.quit()
+
+            if not r['cache']:
+                print("❌ Manifesto não evitou o download repetido!")
+                return 1
+        finally:
+            servidor.parar()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
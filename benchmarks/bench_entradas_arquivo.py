@@ -0,0 +1,116 @@
+# - Benchmark dos registros da listagem SFTP do Processo 2 (entrada_arquivo.py)
+# Para N arquivos (1M por padrão) com tamanhos e mtimes sintéticos, compara:
+# 1. dicts: o que listar_arquivos_pasta fazia (dict por arquivo, KB arredondado e data formatada na hora);
+# 2. entradas: EntradaArquivo com __slots__ e valores crus (formatação só ao ler o campo).
+# Mede o tempo de montar a lista, a memória retida (tracemalloc) e o tempo de escrever o log
+# completo (as mesmas linhas do gerar_log) a partir de cada representação.
+#
+# Uso: python benchmarks/bench_entradas_arquivo.py [--arquivos 1000000] [--lotes 2000]
+
+import os
+import io
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entrada_arquivo import EntradaArquivo, formatar_data
+
+
+def gerar_atributos(quantidade: int, lotes: int, semente: int = 7) -> list:
+    """(nome, tamanho, mtime) com os mtimes agrupados em `lotes` segundos distintos (arquivos chegam em lote)"""
+    rnd = random.Random(semente)
+    agora = int(time.time())
+    segundos = [agora - rnd.randint(60, 3 * 86400) for _ in range(lotes)]
+    return [(f"ARQ_{i:07d}.txt", rnd.randint(0, 5_000_000), segundos[i % lotes]) for i in range(quantidade)]
+
+
+def montar_dicts(atributos: list) -> list:
+    arquivos_detalhados = []
+    for nome, tamanho, mtime in atributos:
+        data_modificacao = datetime.fromtimestamp(mtime)
+        tamanho_kb = tamanho / 1024
+        arquivos_detalhados.append({
+            'nome': nome,
+            'tamanho_kb': round(tamanho_kb, 2),
+            'data_modificacao': data_modificacao.strftime('%d/%m/%Y %H:%M:%S')
+        })
+    return arquivos_detalhados
+
+
+def montar_entradas(atributos: list) -> list:
+    return [EntradaArquivo(nome, tamanho, mtime) for nome, tamanho, mtime in atributos]
+
+
+def escrever_log_dicts(arquivos: list):
+    log = io.StringIO()
+    for i, arquivo in enumerate(arquivos, 1):
+        log.write(f"  [{i}] Arquivo: {arquivo['nome']}\n")
+        log.write(f"      Tamanho: {arquivo['tamanho_kb']} KB\n")
+        log.write(f"      Última modificação: {arquivo['data_modificacao']}\n\n")
+    return log.tell()
+
+
+def escrever_log_entradas(arquivos: list):
+    log = io.StringIO()
+    for i, arquivo in enumerate(arquivos, 1):
+        log.write(f"  [{i}] Arquivo: {arquivo.nome}\n")
+        log.write(f"      Tamanho: {arquivo.tamanho_kb} KB\n")
+        log.write(f"      Última modificação: {arquivo.data_modificacao}\n\n")
+    return log.tell()
+
+
+def medir(montar, escrever, atributos: list) -> tuple:
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    arquivos = montar(atributos)
+    segundos_montar = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    inicio = time.perf_counter()
+    tamanho_log = escrever(arquivos)
+    segundos_log = time.perf_counter() - inicio
+    return segundos_montar, memoria, segundos_log, tamanho_log
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dicts formatados x EntradaArquivo na listagem do Processo 2")
+    parser.add_argument("--arquivos", type=int, default=1_000_000)
+    parser.add_argument("--lotes", type=int, default=2000, help="Quantidade de mtimes distintos")
+    args = parser.parse_args()
+
+    atributos = gerar_atributos(args.arquivos, args.lotes)
+
+    # tracemalloc deixa tudo mais lento: o tempo de montagem é medido de novo sem ele
+    resultados = {}
+    for nome, montar, escrever in (("dicts", montar_dicts, escrever_log_dicts),
+                                   ("entradas", montar_entradas, escrever_log_entradas)):
+        formatar_data.cache_clear()
+        _, memoria, segundos_log, tamanho_log = medir(montar, escrever, atributos)
+        formatar_data.cache_clear()
+        inicio = time.perf_counter()
+        arquivos = montar(atributos)
+        segundos_montar = time.perf_counter() - inicio
+        del arquivos
+        resultados[nome] = (segundos_montar, memoria, segundos_log, tamanho_log)
+
+    print("=" * 78)
+    print(f"{args.arquivos} arquivos | {args.lotes} mtimes distintos")
+    print("=" * 78)
+    print(f"  {'':<10} {'montar lista':>14} {'memória':>12} {'escrever log':>14} {'montar+log':>12}")
+    for nome, (montar, memoria, log, _) in resultados.items():
+        print(f"  {nome:<10} {montar * 1000:>11.0f} ms {memoria / 1e6:>9.1f} MB "
+              f"{log * 1000:>11.0f} ms {(montar + log) * 1000:>9.0f} ms")
+    iguais = resultados["dicts"][3] == resultados["entradas"][3]
+    print(f"  {'✅' if iguais else '❌'} Log idêntico em tamanho ({resultados['entradas'][3]} caracteres)")
+    print("=" * 78)
+    return 0 if iguais else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# - Benchmark do envio de email do Processo 1 (backend SMTP)
+# Envia N emails com anexo para o servidor SMTP local e compara:
+# 1. Uma conexão nova por envio (como um Dispatch a cada envio);
+# 2. Backend com conexão reaproveitada e aquecida antes do primeiro envio.
+#
+# Uso: python benchmarks/bench_envio_email.py [--envios 20] [--anexo-mb 2] [--latencia-ms 20]
+
+import os
+import sys
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from envio_email import BackendSMTP, medir_envio
+from servidor_smtp_local import ServidorSMTPLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do envio de email")
+    parser.add_argument("--envios", type=int, default=20)
+    parser.add_argument("--anexo-mb", type=float, default=2)
+    parser.add_argument("--latencia-ms", type=float, default=20, help="Atraso do servidor por comando")
+    args = parser.parse_args()
+
+    servidor = ServidorSMTPLocal(latencia_s=args.latencia_ms / 1000).iniciar()
+    try:
+        with tempfile.TemporaryDirectory() as pasta:
+            anexo = os.path.join(pasta, "2025-11-07_TrackingRecord.xlsx")
+            with open(anexo, "wb") as f:
+                f.write(os.urandom(int(args.anexo_mb * 1024 * 1024)))
+
+            tempos_novos = []
+            for _ in range(args.envios):
+                backend = BackendSMTP("127.0.0.1", servidor.porta, usar_tls=False, remetente="rpa@local")
+                tempos_novos.append(medir_envio(backend, "destino@local", "Relatório Damon", "Bom dia", [anexo]))
+                backend.fechar()
+
+            backend = BackendSMTP("127.0.0.1", servidor.porta, usar_tls=False, remetente="rpa@local")
+            backend.aquecer().join()
+            tempos_reuso = [
+                medir_envio(backend, "destino@local", "Relatório Damon", "Bom dia", [anexo])
+                for _ in range(args.envios)
+            ]
+            backend.fechar()
+
+        def resumo(tempos):
+            tempos = sorted(tempos)
+            return f"média {sum(tempos) / len(tempos) * 1000:7.1f} ms | p95 {tempos[int(len(tempos) * 0.95) - 1] * 1000:7.1f} ms"
+
+        print(f"📧 {args.envios} envios com anexo de {args.anexo_mb} MB, latência do servidor {args.latencia_ms} ms")
+        print(f"  Conexão nova por envio : {resumo(tempos_novos)}")
+        print(f"  Conexão reaproveitada  : {resumo(tempos_reuso)}")
+        print(f"  Servidor: {servidor.config['conexoes']} conexões, {servidor.config['mensagens']} mensagens, "
+              f"{servidor.config['bytes'] / (1024 * 1024):.1f} MB recebidos")
+    finally:
+        servidor.parar()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
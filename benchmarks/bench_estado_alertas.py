@@ -0,0 +1,75 @@
+# - Benchmark do estado dos alertas (estado_alertas.py)
+# 1. Latência de cada checagem (reservar) com a conexão do processo já aberta: p50/p99/máx;
+# 2. Concorrência: N processos checam as mesmas chaves ao mesmo tempo, com conteúdo igual e sem
+#    cooldown; cada chave tem que ser enviada exatamente uma vez no total.
+#
+# Uso: python benchmarks/bench_estado_alertas.py [--checagens 5000] [--chaves 20] [--processos 4]
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from estado_alertas import EstadoAlertas
+
+
+def _trabalhador(parametros):
+    caminho, chaves, rodadas = parametros
+    estado = EstadoAlertas(caminho)
+    enviados = 0
+    try:
+        for i in range(rodadas):
+            for c in range(chaves):
+                enviados += estado.reservar(f"job_{c}", "aviso", conteudo={'pasta': c, 'total': 10}).enviar
+    finally:
+        estado.fechar()
+    return enviados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do estado dos alertas")
+    parser.add_argument("--checagens", type=int, default=5000)
+    parser.add_argument("--chaves", type=int, default=20)
+    parser.add_argument("--processos", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "estado.sqlite3")
+        estado = EstadoAlertas(caminho)
+        tempos = []
+        for i in range(args.checagens):
+            inicio = time.perf_counter()
+            estado.reservar(f"job_{i % args.chaves}", "ok" if i % 7 else "aviso",
+                            conteudo=[i % 3, "pasta"], cooldown_s=900)
+            tempos.append((time.perf_counter() - inicio) * 1e6)
+        estado.fechar()
+        tempos.sort()
+
+        caminho_concorrente = os.path.join(pasta, "concorrente.sqlite3")
+        EstadoAlertas(caminho_concorrente).fechar()
+        rodadas = max(1, args.checagens // (args.chaves * args.processos))
+        inicio = time.perf_counter()
+        with Pool(args.processos) as pool:
+            enviados = sum(pool.map(_trabalhador, [(caminho_concorrente, args.chaves, rodadas)] * args.processos))
+        segundos = time.perf_counter() - inicio
+        total = rodadas * args.chaves * args.processos
+
+    print("=" * 60)
+    print(f"Checagens: {args.checagens} em {args.chaves} chave(s)")
+    print(f"  p50 {statistics.median(tempos):.0f} µs | p99 {tempos[int(len(tempos) * 0.99) - 1]:.0f} µs "
+          f"| máx {tempos[-1]:.0f} µs")
+    print(f"Concorrência: {args.processos} processos, {total} checagens em {segundos:.2f}s "
+          f"({total / segundos:.0f}/s)")
+    status = "✅" if enviados == args.chaves else "❌"
+    print(f"  {status} Envios: {enviados} (esperado {args.chaves}, um por chave)")
+    print("=" * 60)
+    return 0 if enviados == args.chaves else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
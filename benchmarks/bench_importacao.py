@@ -0,0 +1,111 @@
+# - Benchmark do custo de importação de cada ponto de entrada
+# Roda `python -X importtime -c "import <módulo>"` para cada processo e soma o tempo próprio
+# de todas as importações (descontando a partida do interpretador, medida com `-c pass`).
+# Falha (código 1) só quando um ponto de entrada carrega na importação uma dependência pesada
+# (selenium, paramiko, requests, pandas, win32com...), que deveria ser importada só no caminho que a usa.
+# O custo em ms é informativo: sai ao lado do baseline gravado (benchmarks/baseline_importacao.json),
+# mas alguns ms de diferença são ruído de máquina/cache e não reprovam a execução.
+#
+# A importação para na validação do .env quando ele não existe, que é justamente o caminho
+# "falhou cedo" que não deveria pagar pelas dependências pesadas. SFTP_HOST_2 é zerado no
+# ambiente para que a validacao_pasta_auto_v1 nunca chegue a conectar.
+#
+# Uso: python benchmarks/bench_importacao.py [--repeticoes 5] [--gravar-baseline]
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+PASTA_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_importacao.json")
+
+PONTOS_DE_ENTRADA = [
+    "Processo_1", "Processo_2", "Processo_3", "Processo_4", "Processo_5", "Processo_6",
+    "validacao_pasta_auto_v1", "executor_jobs", "nucleo_async",
+]
+
+PESADOS = {"selenium", "paramiko", "requests", "pandas", "numpy", "win32com", "pythoncom", "cryptography"}
+
+
+def medir_importacao(codigo: str) -> dict:
+    """Roda o código com -X importtime; retorna {'us': tempo próprio somado, 'pacotes': {pacote: us}}"""
+    ambiente = {**os.environ, "SFTP_HOST_2": "", "SFTP_PORT_2": "22", "PYTHONDONTWRITEBYTECODE": "1"}
+    concluido = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=PASTA_PROJETO, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+
+    total = 0
+    pacotes = {}
+    for linha in concluido.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, _, nome = linha[len("import time:"):].split("|", 2)
+        proprio = int(proprio)
+        pacote = nome.strip().split(".")[0]
+        total += proprio
+        pacotes[pacote] = pacotes.get(pacote, 0) + proprio
+
+    return {'us': total, 'pacotes': pacotes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do custo de importação dos pontos de entrada")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Usa o menor tempo das N execuções")
+    parser.add_argument("--gravar-baseline", action="store_true")
+    args = parser.parse_args()
+
+    partida = min(medir_importacao("pass")['us'] for _ in range(args.repeticoes))
+    interpretador = set(medir_importacao("pass")['pacotes'])
+
+    baseline = {}
+    if os.path.exists(CAMINHO_BASELINE) and not args.gravar_baseline:
+        with open(CAMINHO_BASELINE, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print("=" * 80)
+    print(f"{'PONTO DE ENTRADA':<26} {'IMPORT (ms)':>12} {'BASELINE':>10}  MAIS PESADOS")
+    print("=" * 80)
+
+    medidas = {}
+    falhas = []
+    for modulo in PONTOS_DE_ENTRADA:
+        execucoes = [medir_importacao(f"import {modulo}") for _ in range(args.repeticoes)]
+        melhor = min(execucoes, key=lambda m: m['us'])
+        custo_ms = max(0, melhor['us'] - partida) / 1000
+        medidas[modulo] = round(custo_ms, 2)
+
+        proprios = {p: us for p, us in melhor['pacotes'].items() if p not in interpretador}
+        mais_pesados = ", ".join(
+            f"{p} {us / 1000:.0f}ms" for p, us in sorted(proprios.items(), key=lambda x: -x[1])[:3]
+        )
+
+        pesados = sorted(PESADOS & set(melhor['pacotes']))
+        if pesados:
+            falhas.append(f"{modulo} importa {', '.join(pesados)} no topo do módulo")
+
+        referencia = baseline.get(modulo)
+        texto_ref = f"{referencia:.1f}" if referencia is not None else "-"
+        print(f"{modulo:<26} {custo_ms:>12.1f} {texto_ref:>10}  {mais_pesados}")
+
+    print("=" * 80)
+
+    if args.gravar_baseline:
+        with open(CAMINHO_BASELINE, 'w', encoding='utf-8') as f:
+            json.dump(medidas, f, indent=2)
+            f.write("\n")
+        print(f"💾 Baseline gravado em {CAMINHO_BASELINE}")
+
+    if falhas:
+        for falha in falhas:
+            print(f"❌ {falha}")
+        return 1
+
+    print("✅ Nenhuma dependência pesada na importação dos pontos de entrada")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
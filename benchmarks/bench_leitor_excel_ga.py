@@ -0,0 +1,79 @@
+# - Benchmark do leitor de relatórios do GA
+# Compara o leitor em streaming (leitor_excel_ga) com o pd.read_excel
+# atual sobre um export sintético (padrão: 500 mil linhas).
+#
+# Uso: python benchmarks/bench_leitor_excel_ga.py [--linhas 500000] [--sem-pandas]
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leitor_excel_ga import LeitorPlanilhaGA
+from regras_filtro import Regra, ConjuntoRegras
+from fixtures_ga import gerar_export_ga
+
+
+# Mesmo critério do Processo 5: status ENTREGUE e nome sem .SD1
+REGRAS_PROCESSO5 = ConjuntoRegras([
+    Regra("G", "eq", "ENTREGUE"),
+    Regra("D", "contains", ".SD1", negar=True),
+])
+
+
+def medir_streaming(caminho):
+    leitor = LeitorPlanilhaGA(caminho)
+    inicio = time.perf_counter()
+    total = leitor.somar_filtrado(4, REGRAS_PROCESSO5.colunas, REGRAS_PROCESSO5)
+    return time.perf_counter() - inicio, total, leitor.linhas
+
+
+def medir_pandas(caminho):
+    import pandas as pd
+
+    inicio = time.perf_counter()
+    df = pd.read_excel(caminho)
+    coluna_d = df.iloc[:, 3]
+    coluna_e = df.iloc[:, 4]
+    coluna_g = df.iloc[:, 6]
+    filtro = (coluna_g.astype(str).str.upper() == "ENTREGUE") & \
+             (~coluna_d.astype(str).str.contains(".SD1", case=False, na=False, regex=False))
+    total = int(coluna_e[filtro].sum())
+    return time.perf_counter() - inicio, total, len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do leitor de relatórios do GA")
+    parser.add_argument("--linhas", type=int, default=500_000)
+    parser.add_argument("--sem-pandas", action="store_true", help="Não mede o pd.read_excel (lento)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = os.path.join(tmp, "export_ga.xlsx")
+
+        inicio = time.perf_counter()
+        gerar_export_ga(caminho, args.linhas)
+        tamanho_mb = os.path.getsize(caminho) / (1024 * 1024)
+        print(f"📄 Export sintético: {args.linhas} linhas, {tamanho_mb:.1f} MB "
+              f"(gerado em {time.perf_counter() - inicio:.1f}s)")
+
+        tempo_s, total_s, linhas_s = medir_streaming(caminho)
+        print(f"⚡ Streaming : {tempo_s:7.2f}s | linhas={linhas_s} | total={total_s}")
+
+        if not args.sem_pandas:
+            tempo_p, total_p, linhas_p = medir_pandas(caminho)
+            print(f"🐼 pandas    : {tempo_p:7.2f}s | linhas={linhas_p} | total={total_p}")
+            print(f"📈 Ganho: {tempo_p / tempo_s:.1f}x")
+
+            if (total_s, linhas_s) != (total_p, linhas_p):
+                print("❌ Resultados divergentes entre os leitores!")
+                return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
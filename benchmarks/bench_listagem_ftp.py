@@ -0,0 +1,109 @@
+# - Benchmark da busca do TrackingRecord mais recente
+# Cria uma pasta com N entradas (anos de TrackingRecord diários + outros arquivos),
+# serve pelo FTP local e compara:
+# 1. LIST + split por espaço + sort (implementação anterior);
+# 2. MLSD com seleção do máximo em streaming;
+# 3. NLST com seleção do máximo em streaming (fallback).
+#
+# Uso: python benchmarks/bench_listagem_ftp.py [--entradas 50000]
+
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+from ftplib import FTP
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transferencia_ftp import buscar_mais_recente
+from servidor_ftp_local import ServidorFTPLocal
+
+
+def busca_anterior(ftp, padrao="TrackingRecord.xlsx"):
+    """Reprodução da busca antiga do Processo 1 (LIST completo + sort)"""
+    arquivos = []
+    ftp.retrlines('LIST', arquivos.append)
+
+    arquivos_tracking = []
+    for linha in arquivos:
+        partes = linha.split()
+        if len(partes) >= 9:
+            nome_arquivo = ' '.join(partes[8:])
+            if padrao in nome_arquivo and nome_arquivo.endswith('.xlsx'):
+                match = re.match(r'(\d{4}-\d{2}-\d{2})_TrackingRecord\.xlsx', nome_arquivo)
+                if match:
+                    arquivos_tracking.append((match.group(1), nome_arquivo))
+
+    arquivos_tracking.sort(reverse=True)
+    return arquivos_tracking[0][1] if arquivos_tracking else None
+
+
+def criar_pasta(pasta, entradas):
+    """Metade TrackingRecord diários retroativos, metade outros arquivos"""
+    hoje = date.today()
+    for i in range(entradas // 2):
+        dia = hoje - timedelta(days=i)
+        open(os.path.join(pasta, f"{dia.isoformat()}_TrackingRecord.xlsx"), "wb").close()
+    for i in range(entradas - entradas // 2):
+        open(os.path.join(pasta, f"outro_relatorio_{i:06d}.csv"), "wb").close()
+    return f"{hoje.isoformat()}_TrackingRecord.xlsx"
+
+
+def medir(nome, func, porta):
+    ftp = FTP()
+    ftp.connect("127.0.0.1", porta)
+    ftp.login("usuario", "senha")
+    inicio = time.perf_counter()
+    resultado = func(ftp)
+    segundos = time.perf_counter() - inicio
+    ftp.quit()
+    print(f"  {nome:28s} {segundos * 1000:8.1f} ms -> {resultado}")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da listagem FTP")
+    parser.add_argument("--entradas", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        esperado = criar_pasta(pasta, args.entradas)
+        servidor = ServidorFTPLocal(pasta, cache_listagem=True).iniciar()
+
+        class SemMLSD(FTP):
+            def retrlines(self, cmd, callback=None):
+                if cmd == "MLSD":
+                    from ftplib import error_perm
+                    raise error_perm("500 MLSD não suportado")
+                return super().retrlines(cmd, callback)
+
+        try:
+            print(f"📂 {args.entradas} entradas no FTP local")
+            medir("(aquecimento do servidor)", lambda ftp: ftp.nlst() and None, servidor.porta)
+            resultados = [
+                medir("LIST + split + sort", busca_anterior, servidor.porta),
+                medir("MLSD streaming", lambda ftp: buscar_mais_recente(ftp)[0], servidor.porta),
+            ]
+
+            ftp = SemMLSD()
+            ftp.connect("127.0.0.1", servidor.porta)
+            ftp.login("usuario", "senha")
+            inicio = time.perf_counter()
+            nome, comando = buscar_mais_recente(ftp)
+            print(f"  {'NLST streaming (fallback)':28s} {(time.perf_counter() - inicio) * 1000:8.1f} ms -> {nome} ({comando})")
+            ftp.quit()
+            resultados.append(nome)
+        finally:
+            servidor.parar()
+
+    if any(r != esperado for r in resultados):
+        print(f"❌ Resultado divergente (esperado {esperado})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# - Benchmark do custo do logging na varredura dos Processos 3/4
+# Roda o find_matches() do Processo 3 numa pasta local com N arquivos EX (cada arquivo gera
+# linhas de log na varredura) em três modos:
+# 1. desligado: logger desabilitado (custo só da varredura);
+# 2. sincrono: handlers de arquivo e stdout ligados direto no logger (configuração anterior);
+# 3. fila: QueueHandler + QueueListener de registro_logs.py (escrita em thread de fundo).
+# O stdout dos handlers vai para /dev/null; o arquivo de log fica em --pasta-logs (use um
+# share de rede montado para medir o caso real) e --atraso-escrita-ms simula a latência de
+# cada escrita no share. Também confere que instanciar o processo várias vezes não duplica handlers.
+#
+# Uso: python benchmarks/bench_logging_varredura.py [--arquivos 20000] [--pasta-logs /mnt/share/logs]
+#          [--atraso-escrita-ms 0.2]
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+from datetime import datetime
+
+PASTA_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_PROJETO)
+
+from fixtures_pastas import gerar_share_processo3
+
+
+def _atrasar(handler, atraso_s: float):
+    """Cada escrita do handler passa a levar atraso_s a mais (share de rede lento)"""
+    if not atraso_s:
+        return
+    emitir = handler.emit
+
+    def emit(record):
+        time.sleep(atraso_s)
+        emitir(record)
+
+    handler.emit = emit
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo do logging na varredura do Processo 3")
+    parser.add_argument("--arquivos", type=int, default=20000)
+    parser.add_argument("--pasta-logs", default=None, help="Pasta do arquivo de log (padrão: temporária)")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--atraso-escrita-ms", type=float, default=0, help="Latência simulada por escrita no arquivo")
+    args = parser.parse_args()
+    atraso = args.atraso_escrita_ms / 1000
+
+    pasta_tmp = tempfile.mkdtemp(prefix="bench_logging_")
+    pasta_logs = args.pasta_logs or os.path.join(pasta_tmp, "logs")
+    os.makedirs(pasta_logs, exist_ok=True)
+    caminho_env = os.path.join(pasta_tmp, ".env")
+    with open(caminho_env, "w", encoding="utf-8") as f:
+        f.write(f"PASTA_LOGS={pasta_logs}\nTEAMS_WEBHOOK_URL=http://127.0.0.1:9/webhook\n")
+    os.environ["RPA_ENV"] = caminho_env
+
+    stdout_real = sys.stdout
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    try:
+        import Processo_3
+        import registro_logs
+
+        automacao = Processo_3.AutomacaoProcesso3()
+        for _ in range(3):
+            automacao = Processo_3.AutomacaoProcesso3()
+        handlers_apos_instancias = len(automacao.logger.handlers)
+
+        pasta_share = os.path.join(pasta_tmp, "share")
+        _, esperado = automacao.previous_run_schedule(datetime.now())
+        gerar_share_processo3(pasta_share, args.arquivos, esperado, com_prefixo=args.arquivos)
+        automacao.folder_path = pasta_share
+        automacao.max_files_to_scan = 0
+        automacao.scan_max_seconds = 0
+
+        nome = automacao.logger.name
+        caminho_log = os.path.join(pasta_logs, f"{nome}.log")
+
+        def sincrono():
+            registro_logs.parar_logger(nome)
+            logger = logging.getLogger(nome)
+            arquivo, console = registro_logs._criar_handlers(caminho_log, automacao.log_max_bytes, automacao.log_backup_count)
+            _atrasar(arquivo, atraso)
+            logger.addHandler(arquivo)
+            logger.addHandler(console)
+            logger.disabled = False
+            return logger
+
+        def fila():
+            logger = logging.getLogger(nome)
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+            logger.disabled = False
+            logger = registro_logs.configurar_logger(nome, caminho_log, automacao.log_max_bytes, automacao.log_backup_count)
+            _atrasar(registro_logs._ouvintes[nome][0].handlers[0], atraso)
+            return logger
+
+        def desligado():
+            logger = logging.getLogger(nome)
+            logger.disabled = True
+            return logger
+
+        resultados = {}
+        for modo, preparar in (("desligado", desligado), ("sincrono", sincrono), ("fila", fila)):
+            automacao.logger = preparar()
+            tempos, drenagem = [], []
+            for _ in range(args.repeticoes):
+                inicio = time.perf_counter()
+                automacao.find_matches(esperado)
+                tempos.append(time.perf_counter() - inicio)
+                if modo == "fila":
+                    inicio = time.perf_counter()
+                    registro_logs.parar_logger(nome)
+                    drenagem.append(time.perf_counter() - inicio)
+                    automacao.logger = preparar()
+            resultados[modo] = (min(tempos), min(drenagem) if drenagem else 0.0)
+        logging.getLogger(nome).disabled = True
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout_real
+
+    base = resultados["desligado"][0]
+    print("=" * 70)
+    print(f"Varredura do Processo 3: {args.arquivos} arquivos EX | log em {pasta_logs} "
+          f"| atraso por escrita {args.atraso_escrita_ms:g} ms")
+    print("=" * 70)
+    for modo, (segundos, drenagem) in resultados.items():
+        extra = f" | fila drenada em +{drenagem * 1000:.0f} ms (fora da varredura)" if modo == "fila" else ""
+        print(f"  {modo:<10} {segundos * 1000:>9.1f} ms  overhead {(segundos - base) * 1000:>8.1f} ms "
+              f"({(segundos - base) / args.arquivos * 1e6:>5.1f} µs/arquivo){extra}")
+    status = "✅" if handlers_apos_instancias == 1 else "❌"
+    print(f"  {status} Handlers no logger após 4 instâncias: {handlers_apos_instancias}")
+    print("=" * 70)
+
+    shutil.rmtree(pasta_tmp, ignore_errors=True)
+    return 0 if handlers_apos_instancias == 1 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# - Benchmark do modo observação (observador_pasta.py)
+# Numa pasta com N arquivos (share do Processo 3), compara:
+# 1. varredura completa: o que cada execução agendada faz hoje (scandir + stat dos EX*);
+# 2. inotify e polling: uma thread grava arquivos de ruído e depois o EXddmmyy do dia; mede a
+#    latência de detecção e quantas listagens completas da pasta aconteceram (só a inicial é esperada
+#    no inotify; no polling, uma por mudança do mtime da pasta).
+#
+# Uso: python benchmarks/bench_observador_pasta.py [--arquivos 100000] [--intervalo 0.5] [--chegadas 5]
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures_pastas import gerar_share_processo3
+from observador_pasta import ObservadorPasta, tipo_fs
+
+
+def varredura_completa(pasta: str, prefixo: str) -> int:
+    """Mesma ida à pasta do find_matches: lista tudo e faz stat de cada arquivo com o prefixo"""
+    vistos = 0
+    with os.scandir(pasta) as it:
+        for entry in it:
+            if entry.is_file(follow_symlinks=False) and entry.name.upper().startswith(prefixo):
+                entry.stat()
+                vistos += 1
+    return vistos
+
+
+def _gravar_chegadas(pasta: str, nomes: list, espera_s: float, gravados: dict):
+    for nome in nomes:
+        time.sleep(espera_s)
+        caminho = os.path.join(pasta, nome)
+        with open(caminho + ".tmp", "wb") as f:
+            f.write(b"x" * 128)
+        os.replace(caminho + ".tmp", caminho)
+        gravados[nome] = time.perf_counter()
+
+
+def medir_modo(pasta: str, modo: str, intervalo_s: float, chegadas: int) -> tuple:
+    hoje = datetime.now().strftime("%d%m%y")
+    nomes = [f"RET_ruido_{modo}_{i}.csv" for i in range(chegadas)] + [f"EX{hoje}_{modo}.csv"]
+
+    observador = ObservadorPasta(pasta, "EX", intervalo_s=intervalo_s, modo=modo)
+    gravados = {}
+    escritor = threading.Thread(target=_gravar_chegadas, args=(pasta, nomes, 0.2, gravados), daemon=True)
+    escritor.start()
+
+    esperado = nomes[-1]
+    latencia = None
+    try:
+        limite = time.monotonic() + 30
+        while latencia is None and time.monotonic() < limite:
+            for nome in observador.novos(intervalo_s):
+                if nome == esperado:
+                    latencia = time.perf_counter() - gravados[nome]
+    finally:
+        observador.fechar()
+    escritor.join()
+    return latencia, observador.listagens, observador.checagens
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do modo observação das pastas")
+    parser.add_argument("--arquivos", type=int, default=100000)
+    parser.add_argument("--intervalo", type=float, default=0.5, help="Intervalo do polling (s)")
+    parser.add_argument("--chegadas", type=int, default=5, help="Arquivos de ruído gravados antes do esperado")
+    parser.add_argument("--pasta", default=None, help="Pasta a usar (ex.: share montado); padrão: temporária")
+    args = parser.parse_args()
+
+    pasta_tmp = None
+    pasta = args.pasta
+    if pasta is None:
+        pasta_tmp = tempfile.mkdtemp(prefix="bench_observador_")
+        pasta = os.path.join(pasta_tmp, "share")
+        gerar_share_processo3(pasta, args.arquivos, datetime.now(), com_prefixo=args.arquivos // 10,
+                              incluir_esperado=False)
+
+    inicio = time.perf_counter()
+    vistos = varredura_completa(pasta, "EX")
+    segundos_varredura = time.perf_counter() - inicio
+
+    resultados = {}
+    for modo in ("inotify", "polling"):
+        try:
+            resultados[modo] = medir_modo(pasta, modo, args.intervalo, args.chegadas)
+        except OSError as e:
+            resultados[modo] = e
+
+    print("=" * 70)
+    print(f"Pasta: {pasta} (fs {tipo_fs(pasta) or '?'}) | {args.arquivos} arquivos, {vistos} EX*")
+    print(f"  Varredura completa (por execução agendada): {segundos_varredura * 1000:.0f} ms")
+    ok = True
+    for modo, resultado in resultados.items():
+        if isinstance(resultado, OSError):
+            print(f"  {modo:<8} ⚠️ indisponível: {resultado}")
+            continue
+        latencia, listagens, checagens = resultado
+        ok = ok and latencia is not None
+        status = "✅" if latencia is not None else "❌"
+        detalhe = f"{latencia * 1000:.0f} ms" if latencia is not None else "não detectado"
+        print(f"  {modo:<8} {status} detecção {detalhe} | listagens completas {listagens} "
+              f"(1 inicial) | checagens {checagens}")
+    print("=" * 70)
+
+    if pasta_tmp:
+        shutil.rmtree(pasta_tmp, ignore_errors=True)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# - Benchmark ponta a ponta dos processos, sem rede de produção
+# Sobe os stand-ins locais e roda os jobs de verdade contra eles:
+# 1. Processo 1: FTP local (TrackingRecord de N MB) + SMTP local;
+# 2. Processo 2: SFTP local (paramiko) com as 4 pastas monitoradas;
+# 3. Processos 3 e 4: pasta local no lugar do share \\172.20.1.43, com o arquivo esperado;
+# 4. validacao_pasta_auto_v1: SFTP local com arquivos parados (roda como script, em subprocesso);
+# 5. Todos os cards do Teams vão para o webhook local.
+# O .env é gerado numa pasta temporária (RPA_ENV) e os tempos por fase vêm das métricas
+# exportadas por cada job (metricas.py). Processos 5 e 6 ficam de fora: dependem do Chrome/GA;
+# a leitura do export deles é medida em bench_leitor_excel_ga.py.
+#
+# Uso: python benchmarks/bench_ponta_a_ponta.py [--jobs 1 2 3 4 validacao] [--arquivos 1000]
+#          [--tracking-mb 5] [--latencia-ms 0]
+
+import os
+import re
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+
+PASTA_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_PROJETO)
+
+from servidor_ftp_local import ServidorFTPLocal
+from servidor_smtp_local import ServidorSMTPLocal
+from servidor_sftp_local import ServidorSFTPLocal
+from servidor_webhook_local import ServidorWebhookLocal
+from fixtures_pastas import (
+    gerar_share_processo3, gerar_share_processo4, gerar_pastas_processo2, gerar_pasta_validacao
+)
+
+JOBS_PADRAO = ["1", "2", "3", "4", "validacao"]
+
+_RE_AMOSTRA = re.compile(r'^(rpa_\w+)\{job="([^"]+)"(?:,fase="([^"]+)")?\} (\S+)$')
+
+
+def escrever_env(caminho: str, valores: dict):
+    with open(caminho, "w", encoding="utf-8") as f:
+        for chave, valor in valores.items():
+            f.write(f"{chave}={valor}\n")
+
+
+def ler_metricas_exportadas(pasta: str) -> dict:
+    """{job: {'fases': {fase: s}, 'contadores': {nome: v}, 'sucesso': 0/1}} a partir dos .prom"""
+    jobs = {}
+    for nome in os.listdir(pasta):
+        if not nome.endswith(".prom"):
+            continue
+        with open(os.path.join(pasta, nome), encoding="utf-8") as f:
+            for linha in f:
+                m = _RE_AMOSTRA.match(linha.strip())
+                if not m:
+                    continue
+                metrica, job, fase, valor = m.groups()
+                dados = jobs.setdefault(job, {'fases': {}, 'contadores': {}, 'sucesso': 0})
+                if metrica == "rpa_fase_segundos":
+                    dados['fases'][fase] = float(valor)
+                elif metrica == "rpa_execucao_sucesso":
+                    dados['sucesso'] = int(float(valor))
+                elif metrica != "rpa_execucao_timestamp_segundos":
+                    dados['contadores'][metrica[len("rpa_"):]] = float(valor)
+    return jobs
+
+
+def rodar_processo1(pasta_ftp: str, tracking_mb: float):
+    import Processo_1
+
+    nome = f"{datetime.now().strftime('%Y-%m-%d')}_TrackingRecord.xlsx"
+    with open(os.path.join(pasta_ftp, nome), "wb") as f:
+        f.write(os.urandom(int(tracking_mb * 1024 * 1024)))
+    return Processo_1.AutomacaoProcesso1().executar()
+
+
+def rodar_processo2():
+    import Processo_2
+
+    return Processo_2.AutomacaoProcesso2().executar()
+
+
+def rodar_processo3(pasta_share: str, arquivos: int):
+    import Processo_3
+
+    automacao = Processo_3.AutomacaoProcesso3()
+    automacao.folder_path = pasta_share
+    _, esperado = automacao.previous_run_schedule(datetime.now())
+    gerar_share_processo3(pasta_share, arquivos, esperado, com_prefixo=min(arquivos, 5000))
+    return automacao.executar()
+
+
+def rodar_processo4(pasta_share: str, arquivos: int):
+    import Processo_4
+
+    automacao = Processo_4.AutomacaoProcesso4()
+    automacao.folder_path = pasta_share
+    _, esperado = automacao.get_expected_datetime(datetime.now())
+    gerar_share_processo4(pasta_share, arquivos, esperado, com_prefixo=min(arquivos, 5000))
+    return automacao.executar()
+
+
+def rodar_validacao(pasta_tmp: str, ambiente: dict):
+    """Roda o script em subprocesso (o estado dos alertas fica no PASTA_LOGS temporário)"""
+    concluido = subprocess.run(
+        [sys.executable, os.path.join(PASTA_PROJETO, "validacao_pasta_auto_v1.py")], cwd=pasta_tmp,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=ambiente
+    )
+    return concluido.returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ponta a ponta com stand-ins locais")
+    parser.add_argument("--jobs", nargs="+", default=JOBS_PADRAO)
+    parser.add_argument("--arquivos", type=int, default=1000, help="Arquivos por pasta (SFTP e shares)")
+    parser.add_argument("--parados", type=int, default=50, help="Arquivos parados na pasta da validação")
+    parser.add_argument("--tracking-mb", type=float, default=5)
+    parser.add_argument("--latencia-ms", type=float, default=0, help="Atraso por requisição nos servidores")
+    args = parser.parse_args()
+    latencia = args.latencia_ms / 1000
+
+    pasta_tmp = tempfile.mkdtemp(prefix="bench_rpa_")
+    pastas = {n: os.path.join(pasta_tmp, n) for n in ("ftp", "sftp", "tracking", "logs", "metricas", "share3", "share4")}
+    for pasta in pastas.values():
+        os.makedirs(pasta, exist_ok=True)
+
+    ftp = ServidorFTPLocal(pastas['ftp']).iniciar()
+    smtp = ServidorSMTPLocal(latencia_s=latencia).iniciar()
+    sftp = ServidorSFTPLocal(pastas['sftp'], latencia_s=latencia).iniciar()
+    webhook = ServidorWebhookLocal(latencia_s=latencia).iniciar()
+
+    caminho_env = os.path.join(pasta_tmp, ".env")
+    escrever_env(caminho_env, {
+        "SFTP_HOST": "127.0.0.1", "SFTP_PORT": ftp.porta, "SFTP_USER": "bench", "SFTP_PASS": "bench",
+        "PASTA_TRACKING": pastas['tracking'], "DESTINATARIO_EMAIL": "destino@local",
+        "EMAIL_BACKEND": "smtp", "SMTP_HOST": "127.0.0.1", "SMTP_PORT": smtp.porta, "SMTP_TLS": "0",
+        "SMTP_REMETENTE": "rpa@local",
+        "SFTP_HOST_2": "127.0.0.1", "SFTP_PORT_2": sftp.porta, "SFTP_USER_2": "bench", "SFTP_PASS_2": "bench",
+        "PASTA_LOGS": pastas['logs'], "PASTA_METRICAS": pastas['metricas'], "TEAMS_WEBHOOK_URL": webhook.url,
+    })
+    os.environ["RPA_ENV"] = caminho_env
+
+    print(f"📁 Pasta do benchmark: {pasta_tmp}")
+    resultados = {}
+    try:
+        if "2" in args.jobs:
+            gerar_pastas_processo2(pastas['sftp'], args.arquivos)
+        if "validacao" in args.jobs:
+            gerar_pasta_validacao(pastas['sftp'], args.parados, recentes=args.parados)
+
+        execucoes = {
+            "1": lambda: rodar_processo1(pastas['ftp'], args.tracking_mb),
+            "2": rodar_processo2,
+            "3": lambda: rodar_processo3(pastas['share3'], args.arquivos),
+            "4": lambda: rodar_processo4(pastas['share4'], args.arquivos),
+            "validacao": lambda: rodar_validacao(pasta_tmp, dict(os.environ)),
+        }
+        for job in args.jobs:
+            inicio = time.perf_counter()
+            sucesso = execucoes[job]()
+            resultados[job] = (sucesso, time.perf_counter() - inicio)
+
+        metricas = ler_metricas_exportadas(pastas['metricas'])
+    finally:
+        for servidor in (ftp, smtp, sftp, webhook):
+            servidor.parar()
+
+    print("\n" + "=" * 80)
+    print(f"RESULTADO PONTA A PONTA ({args.arquivos} arquivos/pasta, latência {args.latencia_ms:.0f} ms)")
+    print("=" * 80)
+    for job, dados in sorted(metricas.items()):
+        status = "✅" if dados['sucesso'] else "❌"
+        print(f"{status} {job}")
+        for fase, segundos in sorted(dados['fases'].items(), key=lambda x: -x[1]):
+            print(f"    {fase:<10} {segundos * 1000:>10.1f} ms")
+        contadores = dados['contadores']
+        for nome, valor in sorted(contadores.items()):
+            print(f"    {nome:<16} {valor:>12.0f}")
+        if contadores.get('bytes_recebidos') and dados['fases'].get('download'):
+            print(f"    throughput download {contadores['bytes_recebidos'] / dados['fases']['download'] / 1024 / 1024:.1f} MB/s")
+        if contadores.get('round_trips') and dados['fases'].get('total'):
+            print(f"    round trips/s       {contadores['round_trips'] / dados['fases']['total']:.0f}")
+    print("-" * 80)
+    print(f"Cards recebidos pelo webhook: {len(webhook.config['mensagens'])} | "
+          f"Emails: {smtp.config['mensagens']} | Requisições SFTP: {sftp.config['requisicoes']}")
+    print("=" * 80)
+
+    shutil.rmtree(pasta_tmp, ignore_errors=True)
+    return 0 if all(sucesso for sucesso, _ in resultados.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
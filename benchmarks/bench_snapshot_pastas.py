@@ -0,0 +1,105 @@
+# - Benchmark do snapshot colunar de pasta (snapshot_pastas.py)
+# Para N arquivos (5M por padrão) com idades e tamanhos sintéticos, compara a análise da validação
+# e do Processo 2 (parados há mais de MINUTOS, N mais antigos, faixas de idade, volume total):
+# 1. python: laços sobre (nome, tamanho, mtime), como o feed.parados e os logs faziam;
+# 2. snapshot: as mesmas respostas de operações vetorizadas sobre as colunas NumPy;
+# 3. mmap: o snapshot salvo em disco e reaberto com carregar(mmap=True) antes de analisar.
+# Também mede o parse da saída do find (de_find) e confere que as três respostas são iguais.
+#
+# Uso: python benchmarks/bench_snapshot_pastas.py [--arquivos 5000000] [--minutos 15] [--top 10]
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot_pastas import SnapshotPasta, FAIXAS_PADRAO
+
+
+def gerar_colunas(quantidade: int, agora: int, semente: int = 7) -> tuple:
+    """mtimes (até 10 dias atrás, a maioria recente) e tamanhos sintéticos"""
+    rnd = np.random.default_rng(semente)
+    idades = (rnd.exponential(3 * 3600, quantidade) % (10 * 86400)).astype(np.int64)
+    return agora - idades, rnd.integers(0, 5_000_000, quantidade, dtype=np.int64)
+
+
+def analisar_python(atributos: list, agora: int, idade_s: float, top: int) -> tuple:
+    limite = agora - idade_s
+    parados = sorted((m, n) for n, _, m in atributos if m < limite)
+    quantidades = [0] * (len(FAIXAS_PADRAO) + 1)
+    for _, _, m in atributos:
+        idade, faixa = agora - m, 0
+        while faixa < len(FAIXAS_PADRAO) and idade > FAIXAS_PADRAO[faixa]:
+            faixa += 1
+        quantidades[faixa] += 1
+    total = sum(t for _, t, _ in atributos)
+    return len(parados), [n for _, n in parados[:top]], quantidades, total
+
+
+def analisar_snapshot(snapshot: SnapshotPasta, idade_s: float, top: int) -> tuple:
+    return (snapshot.contar_parados(idade_s), [n for n, _, _ in snapshot.mais_antigos(top, idade_s)],
+            [q for _, q, _ in snapshot.histograma()], snapshot.total_bytes())
+
+
+def cronometrar(funcao, *args) -> tuple:
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Laços Python x snapshot colunar NumPy na análise de pastas")
+    parser.add_argument("--arquivos", type=int, default=5_000_000)
+    parser.add_argument("--minutos", type=float, default=15)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    agora = int(time.time())
+    mtimes, tamanhos = gerar_colunas(args.arquivos, agora)
+    nomes = [f"ARQ_{i:08d}.txt" for i in range(args.arquivos)]
+    atributos = list(zip(nomes, tamanhos.tolist(), mtimes.tolist()))
+
+    saida_find = b"".join(f"{m}.0000000000\t{t}\t{n}\0".encode() for n, t, m in atributos[:1_000_000])
+    _, segundos_find = cronometrar(SnapshotPasta.de_find, "/bench", saida_find, agora)
+    del saida_find
+
+    snapshot, segundos_montar = cronometrar(SnapshotPasta.de_atributos, "/bench", atributos, agora)
+    idade_s = args.minutos * 60
+    resposta_python, segundos_python = cronometrar(analisar_python, atributos, agora, idade_s, args.top)
+    resposta_snapshot, segundos_snapshot = cronometrar(analisar_snapshot, snapshot, idade_s, args.top)
+
+    pasta_snapshot = tempfile.mkdtemp(prefix="bench_snapshot_")
+    try:
+        _, segundos_salvar = cronometrar(snapshot.salvar, pasta_snapshot)
+        mapeado, segundos_abrir = cronometrar(SnapshotPasta.carregar, pasta_snapshot)
+        resposta_mmap, segundos_mmap = cronometrar(analisar_snapshot, mapeado, idade_s, args.top)
+        del mapeado
+    finally:
+        shutil.rmtree(pasta_snapshot, ignore_errors=True)
+
+    memoria = snapshot.mtimes.nbytes + snapshot.tamanhos.nbytes + snapshot.offsets.nbytes + snapshot.nomes.nbytes
+
+    print("=" * 78)
+    print(f"{args.arquivos} arquivos | parados há mais de {args.minutos:g} min: {resposta_snapshot[0]} "
+          f"| snapshot: {memoria / 1e6:.0f} MB em colunas")
+    print("=" * 78)
+    print(f"  {'análise python (laços)':<34} {segundos_python * 1000:>10.0f} ms")
+    print(f"  {'análise snapshot (vetorizada)':<34} {segundos_snapshot * 1000:>10.1f} ms")
+    print(f"  {'análise snapshot via mmap':<34} {segundos_mmap * 1000:>10.1f} ms")
+    print(f"  {'montar snapshot (de_atributos)':<34} {segundos_montar * 1000:>10.0f} ms")
+    print(f"  {'parse find 1M registros (de_find)':<34} {segundos_find * 1000:>10.0f} ms")
+    print(f"  {'salvar / abrir com mmap':<34} {segundos_salvar * 1000:>7.0f} / {segundos_abrir * 1000:.1f} ms")
+    iguais = resposta_python == resposta_snapshot == resposta_mmap
+    print(f"  {'✅' if iguais else '❌'} Mesmas respostas (total, mais antigos, faixas, volume)")
+    print("=" * 78)
+    return 0 if iguais else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# - Gerador de exports sintéticos do GA (.xlsx)
+# Escreve o XML da planilha direto no ZIP, sem openpyxl, para gerar
+# arquivos de centenas de milhares de linhas em poucos segundos.
+
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+
+CABECALHO = ["ID", "Processo", "Data", "Arquivo", "Quantidade", "Usuário", "Status"]
+STATUS = ["ENTREGUE", "Entregue", "PENDENTE", "ERRO", "PROCESSANDO"]
+EXTENSOES = [".txt", ".fpl", ".SD1", ".csv", ".ret"]
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>
+</Types>"""
+
+_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>
+</Relationships>"""
+
+
+def gerar_export_ga(caminho: str, linhas: int, processo: str = "STONE", semente: int = 42) -> str:
+    """Gera um export sintético com o mesmo layout do GA (colunas A..G)"""
+    rnd = random.Random(semente)
+
+    strings = []
+    indices = {}
+
+    def sst(texto):
+        if texto not in indices:
+            indices[texto] = len(strings)
+            strings.append(texto)
+        return indices[texto]
+
+    nomes_arquivo = [f"{processo.lower()}_{i:05d}{rnd.choice(EXTENSOES)}" for i in range(5000)]
+
+    with zipfile.ZipFile(caminho, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK)
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as f:
+            f.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    b'<sheetData>')
+
+            celulas = "".join(
+                f'<c r="{chr(65 + i)}1" t="s"><v>{sst(titulo)}</v></c>' for i, titulo in enumerate(CABECALHO)
+            )
+            f.write(f'<row r="1">{celulas}</row>'.encode())
+
+            processo_idx = sst(processo)
+            usuario_idx = sst("ga-bot")
+            bloco = []
+            for n in range(2, linhas + 2):
+                arquivo_idx = sst(rnd.choice(nomes_arquivo))
+                status_idx = sst(rnd.choice(STATUS))
+                bloco.append(
+                    f'<row r="{n}">'
+                    f'<c r="A{n}"><v>{n - 1}</v></c>'
+                    f'<c r="B{n}" t="s"><v>{processo_idx}</v></c>'
+                    f'<c r="C{n}"><v>{45600 + n % 30}</v></c>'
+                    f'<c r="D{n}" t="s"><v>{arquivo_idx}</v></c>'
+                    f'<c r="E{n}"><v>{rnd.randint(0, 500)}</v></c>'
+                    f'<c r="F{n}" t="s"><v>{usuario_idx}</v></c>'
+                    f'<c r="G{n}" t="s"><v>{status_idx}</v></c>'
+                    f'</row>'
+                )
+                if len(bloco) >= 5000:
+                    f.write("".join(bloco).encode())
+                    bloco = []
+            f.write("".join(bloco).encode())
+            f.write(b"</sheetData></worksheet>")
+
+        partes = [f"<si><t>{escape(s)}</t></si>" for s in strings]
+        zf.writestr(
+            "xl/sharedStrings.xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="{len(strings)}" uniqueCount="{len(strings)}">'
+            + "".join(partes) + "</sst>"
+        )
+
+    return caminho
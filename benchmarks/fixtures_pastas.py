@@ -0,0 +1,126 @@
+# - Gerador de pastas sintéticas (share SMB, pastas SFTP e pasta auto da validação)
+# Cria de mil a um milhão de arquivos vazios (ou com N bytes) com mtimes espalhados,
+# mais o arquivo esperado de cada processo quando pedido, para medir varreduras sem a rede.
+#
+# Uso: python benchmarks/fixtures_pastas.py <pasta> [--arquivos 1000000] [--prefixo ARQ_] [--tamanho 0]
+
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+
+PASTAS_PROCESSO2 = [
+    "/home/sftp/uol/Inboxnetp",
+    "/home/sftp/uol/TrackingOPL",
+    "/home/sftp/uol/Outboxnetp",
+    "/home/sftp/uol/TrackingTransporte",
+]
+PASTA_VALIDACAO = "/flash2005/arquivos/auto"
+
+
+def _criar(caminho: str, mtime: float, conteudo: bytes = b""):
+    with open(caminho, "wb") as f:
+        if conteudo:
+            f.write(conteudo)
+    os.utime(caminho, (mtime, mtime))
+
+
+def gerar_pasta(pasta: str, quantidade: int, prefixo: str = "ARQ_", extensao: str = ".txt",
+                idade_max_s: int = 3 * 86400, tamanho: int = 0, semente: int = 42) -> int:
+    """Cria `quantidade` arquivos prefixo0000001.ext com mtime aleatório até idade_max_s atrás"""
+    os.makedirs(pasta, exist_ok=True)
+    rnd = random.Random(semente)
+    agora = time.time()
+    conteudo = b"x" * tamanho
+    for i in range(quantidade):
+        _criar(os.path.join(pasta, f"{prefixo}{i:07d}{extensao}"), agora - rnd.uniform(60, idade_max_s), conteudo)
+    return quantidade
+
+
+def local_remoto(raiz: str, caminho_remoto: str) -> str:
+    """Caminho local de um caminho remoto servido pelo ServidorSFTPLocal com esta raiz"""
+    return os.path.join(raiz, caminho_remoto.lstrip("/"))
+
+
+def gerar_share_processo3(pasta: str, quantidade: int, expected_dt: datetime, com_prefixo: int = 1000,
+                          incluir_esperado: bool = True) -> str:
+    """
+    Share do Processo 3 (\\\\172.20.1.43\\C\\SANTANDER\\retorno\\BKP)
+    - `com_prefixo` arquivos EXddmmyy de dias anteriores (entram na varredura) e o resto sem o prefixo
+    - Com incluir_esperado, cria EX<ddmmyy>.csv com mtime na janela esperada; retorna o nome
+    """
+    os.makedirs(pasta, exist_ok=True)
+    rnd = random.Random(3)
+    com_prefixo = min(com_prefixo, quantidade)
+    for i in range(com_prefixo):
+        dia = expected_dt - timedelta(days=1 + i % 90)
+        _criar(os.path.join(pasta, f"EX{dia.strftime('%d%m%y')}_{i:07d}.csv"),
+               dia.timestamp() + rnd.uniform(0, 3600))
+    gerar_pasta(pasta, quantidade - com_prefixo, prefixo="RET_", extensao=".csv")
+
+    if not incluir_esperado:
+        return None
+    nome = f"EX{expected_dt.strftime('%d%m%y')}.csv"
+    _criar(os.path.join(pasta, nome), expected_dt.timestamp())
+    return nome
+
+
+def gerar_share_processo4(pasta: str, quantidade: int, expected_dt: datetime, com_prefixo: int = 1000,
+                          incluir_esperado: bool = True) -> str:
+    """Share do Processo 4 (SCOPUS\\SAIDA\\BACKUP): flash_retorno_next_YYYYMMDD de dias anteriores + o esperado"""
+    os.makedirs(pasta, exist_ok=True)
+    com_prefixo = min(com_prefixo, quantidade)
+    for i in range(com_prefixo):
+        dia = expected_dt - timedelta(days=1 + i % 90)
+        _criar(os.path.join(pasta, f"flash_retorno_next_{dia.strftime('%Y%m%d')}_{i:07d}.txt"), dia.timestamp())
+    gerar_pasta(pasta, quantidade - com_prefixo, prefixo="scopus_", extensao=".dat")
+
+    if not incluir_esperado:
+        return None
+    nome = f"flash_retorno_next_{expected_dt.strftime('%Y%m%d')}.txt"
+    _criar(os.path.join(pasta, nome), expected_dt.timestamp())
+    return nome
+
+
+def gerar_pastas_processo2(raiz: str, arquivos_por_pasta: int, tamanho: int = 1024) -> list:
+    """As 4 pastas monitoradas pelo Processo 2, dentro da raiz do ServidorSFTPLocal"""
+    locais = []
+    for i, remoto in enumerate(PASTAS_PROCESSO2):
+        local = local_remoto(raiz, remoto)
+        gerar_pasta(local, arquivos_por_pasta, prefixo=f"{remoto.rsplit('/', 1)[-1]}_", tamanho=tamanho, semente=i)
+        locais.append(local)
+    return locais
+
+
+def gerar_pasta_validacao(raiz: str, parados: int, recentes: int = 0, minutos: int = 15) -> str:
+    """Pasta auto da validação: `parados` arquivos mais velhos que `minutos` e `recentes` mais novos"""
+    local = local_remoto(raiz, PASTA_VALIDACAO)
+    os.makedirs(local, exist_ok=True)
+    agora = time.time()
+    for i in range(parados):
+        _criar(os.path.join(local, f"parado_{i:07d}.txt"), agora - (minutos + 5) * 60 - i)
+    for i in range(recentes):
+        _criar(os.path.join(local, f"recente_{i:07d}.txt"), agora - 30)
+    return local
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera uma pasta com muitos arquivos sintéticos")
+    parser.add_argument("pasta")
+    parser.add_argument("--arquivos", type=int, default=1000)
+    parser.add_argument("--prefixo", default="ARQ_")
+    parser.add_argument("--extensao", default=".txt")
+    parser.add_argument("--tamanho", type=int, default=0, help="Bytes por arquivo")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    gerar_pasta(args.pasta, args.arquivos, args.prefixo, args.extensao, tamanho=args.tamanho)
+    print(f"✅ {args.arquivos} arquivo(s) criados em {args.pasta} ({time.perf_counter() - inicio:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
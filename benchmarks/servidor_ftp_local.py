@@ -0,0 +1,240 @@
+# - Servidor FTP local (stand-in do FTP 172.20.24.4)
+# Servidor mínimo em thread, só com a biblioteca padrão, servindo uma pasta local.
+# Suporta USER/PASS, TYPE, PASV/EPSV, LIST, NLST, MLSD, SIZE, MDTM, REST, RETR e QUIT.
+# Opções para simular rede ruim: limite de banda e queda da conexão de dados após N bytes.
+# Com cache_listagem=True a pasta é lida uma vez só, isolando o custo do lado do cliente.
+#
+# Uso programático:
+#     servidor = ServidorFTPLocal(pasta)
+#     servidor.iniciar()            # servidor.porta tem a porta sorteada
+#     ...
+#     servidor.parar()
+
+import os
+import time
+import socket
+import threading
+import socketserver
+from datetime import datetime, timezone
+
+
+class _SessaoFTP(socketserver.StreamRequestHandler):
+    """Atende uma conexão de controle FTP"""
+
+    def responder(self, texto: str):
+        self.wfile.write((texto + "\r\n").encode("utf-8"))
+
+    def handle(self):
+        config = self.server.config
+        self.rest = 0
+        self.socket_pasv = None
+        self.responder("220 Servidor FTP local")
+
+        while True:
+            linha = self.rfile.readline()
+            if not linha:
+                break
+
+            comando, _, argumento = linha.decode("utf-8").strip().partition(" ")
+            comando = comando.upper()
+            config['comandos'][comando] = config['comandos'].get(comando, 0) + 1
+
+            metodo = getattr(self, f"cmd_{comando.lower()}", None)
+            if metodo is None:
+                self.responder("502 Comando não implementado")
+                continue
+            if metodo(argumento) is False:
+                break
+
+    def _caminho(self, nome: str) -> str:
+        return os.path.join(self.server.config['pasta'], os.path.basename(nome))
+
+    def _abrir_dados(self):
+        conn, _ = self.socket_pasv.accept()
+        self.socket_pasv.close()
+        self.socket_pasv = None
+        return conn
+
+    def _enviar_dados(self, dados_iter):
+        config = self.server.config
+        self.responder("150 Abrindo conexão de dados")
+        conn = self._abrir_dados()
+        enviados = 0
+        try:
+            for dados in dados_iter:
+                if config['cair_apos_bytes'] is not None and enviados + len(dados) > config['cair_apos_bytes']:
+                    conn.sendall(dados[:max(0, config['cair_apos_bytes'] - enviados)])
+                    config['cair_apos_bytes'] = None
+                    conn.close()
+                    self.responder("426 Conexão de dados encerrada; transferência abortada")
+                    return
+                conn.sendall(dados)
+                enviados += len(dados)
+                if config['limite_bps']:
+                    time.sleep(len(dados) / config['limite_bps'])
+        finally:
+            conn.close()
+        self.responder("226 Transferência concluída")
+
+    def cmd_user(self, arg):
+        self.responder("331 Senha necessária")
+
+    def cmd_pass(self, arg):
+        self.responder("230 Login efetuado")
+
+    def cmd_syst(self, arg):
+        self.responder("215 UNIX Type: L8")
+
+    def cmd_feat(self, arg):
+        self.responder("211-Recursos:\r\n MDTM\r\n MLST type*;size*;modify*;\r\n REST STREAM\r\n SIZE\r\n211 Fim")
+
+    def cmd_opts(self, arg):
+        self.responder("200 OK")
+
+    def cmd_type(self, arg):
+        self.responder("200 Tipo definido")
+
+    def cmd_noop(self, arg):
+        self.responder("200 OK")
+
+    def cmd_pwd(self, arg):
+        self.responder('257 "/"')
+
+    def cmd_cwd(self, arg):
+        self.responder("250 OK")
+
+    def cmd_pasv(self, arg):
+        self.socket_pasv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket_pasv.bind(("127.0.0.1", 0))
+        self.socket_pasv.listen(1)
+        porta = self.socket_pasv.getsockname()[1]
+        self.responder(f"227 Entering Passive Mode (127,0,0,1,{porta >> 8},{porta & 0xFF})")
+
+    def cmd_epsv(self, arg):
+        self.socket_pasv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket_pasv.bind(("127.0.0.1", 0))
+        self.socket_pasv.listen(1)
+        self.responder(f"229 Entering Extended Passive Mode (|||{self.socket_pasv.getsockname()[1]}|)")
+
+    def cmd_size(self, arg):
+        caminho = self._caminho(arg)
+        if not os.path.isfile(caminho):
+            self.responder("550 Arquivo não encontrado")
+        else:
+            self.responder(f"213 {os.path.getsize(caminho)}")
+
+    def cmd_mdtm(self, arg):
+        caminho = self._caminho(arg)
+        if not os.path.isfile(caminho):
+            self.responder("550 Arquivo não encontrado")
+        else:
+            mtime = datetime.fromtimestamp(os.path.getmtime(caminho), tz=timezone.utc)
+            self.responder(f"213 {mtime.strftime('%Y%m%d%H%M%S')}")
+
+    def cmd_rest(self, arg):
+        self.rest = int(arg)
+        self.responder(f"350 Reiniciando em {self.rest}")
+
+    def cmd_retr(self, arg):
+        caminho = self._caminho(arg)
+        if not os.path.isfile(caminho):
+            self.responder("550 Arquivo não encontrado")
+            return
+
+        inicio, self.rest = self.rest, 0
+
+        def blocos():
+            with open(caminho, "rb") as f:
+                f.seek(inicio)
+                for bloco in iter(lambda: f.read(64 * 1024), b""):
+                    yield bloco
+
+        self._enviar_dados(blocos())
+
+    def _entradas(self):
+        """(nome, tamanho, mtime) dos arquivos da pasta; com cache_listagem, lidos uma vez só"""
+        config = self.server.config
+        if config['cache_listagem'] and config.get('_entradas') is not None:
+            return config['_entradas']
+
+        entradas = []
+        with os.scandir(config['pasta']) as it:
+            for entry in it:
+                if entry.is_file():
+                    st = entry.stat()
+                    entradas.append((entry.name, st.st_size, st.st_mtime))
+
+        if config['cache_listagem']:
+            config['_entradas'] = entradas
+        return entradas
+
+    def _em_lotes(self, linhas, tamanho: int = 64 * 1024):
+        """Agrupa as linhas da listagem em blocos para a conexão de dados"""
+        lote = []
+        acumulado = 0
+        for linha in linhas:
+            lote.append(linha)
+            acumulado += len(linha)
+            if acumulado >= tamanho:
+                yield b"".join(lote)
+                lote, acumulado = [], 0
+        if lote:
+            yield b"".join(lote)
+
+    def cmd_list(self, arg):
+        def linhas():
+            for nome, tamanho, mtime in self._entradas():
+                data = datetime.fromtimestamp(mtime).strftime("%b %d %H:%M")
+                yield f"-rw-r--r--   1 ftp      ftp      {tamanho:>10} {data} {nome}\r\n".encode("utf-8")
+
+        self._enviar_dados(self._em_lotes(linhas()))
+
+    def cmd_nlst(self, arg):
+        self._enviar_dados(self._em_lotes(f"{nome}\r\n".encode("utf-8") for nome, _, _ in self._entradas()))
+
+    def cmd_mlsd(self, arg):
+        def linhas():
+            for nome, tamanho, mtime in self._entradas():
+                modify = datetime.fromtimestamp(mtime, tz=timezone.utc).strftime("%Y%m%d%H%M%S")
+                yield f"type=file;size={tamanho};modify={modify}; {nome}\r\n".encode("utf-8")
+
+        self._enviar_dados(self._em_lotes(linhas()))
+
+    def cmd_quit(self, arg):
+        self.responder("221 Até logo")
+        return False
+
+
+class _ServidorThreads(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ServidorFTPLocal:
+    """Servidor FTP local para benchmarks e testes manuais do Processo 1"""
+
+    def __init__(self, pasta: str, limite_bps: int = None, cair_apos_bytes: int = None,
+                 cache_listagem: bool = False):
+        self.servidor = _ServidorThreads(("127.0.0.1", 0), _SessaoFTP)
+        self.servidor.config = {
+            'pasta': pasta,
+            'limite_bps': limite_bps,
+            'cair_apos_bytes': cair_apos_bytes,
+            'cache_listagem': cache_listagem,
+            'comandos': {}
+        }
+        self.porta = self.servidor.server_address[1]
+        self._thread = None
+
+    @property
+    def config(self) -> dict:
+        return self.servidor.config
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
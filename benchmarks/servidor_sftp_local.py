@@ -0,0 +1,200 @@
+# - Servidor SFTP local (stand-in do SFTP 177.126.179.190)
+# Servidor SSH/SFTP em thread com paramiko, servindo uma pasta local como raiz:
+# o caminho remoto /home/sftp/uol/Inboxnetp vira <raiz>/home/sftp/uol/Inboxnetp.
+# Aceita qualquer usuário/senha. Suporta listdir, stat/lstat, leitura de arquivos e exec
+# (o comando roda localmente, com os caminhos absolutos trocados para dentro da raiz),
+# o que cobre o `find` da validacao_pasta_auto_v1 e o feed de longa duração do feed_remoto.py
+# (a saída do exec é repassada enquanto o comando roda).
+# Opção latencia_s simula a ida e volta da rede em cada requisição SFTP/exec.
+#
+# Uso programático:
+#     servidor = ServidorSFTPLocal(raiz)
+#     servidor.iniciar()            # servidor.porta tem a porta sorteada
+#     ...
+#     servidor.parar()
+
+import os
+import re
+import time
+import socket
+import threading
+import subprocess
+
+import paramiko
+
+
+_RE_CAMINHO_ABSOLUTO = re.compile(r"(?<![\w'\"])(/[^\s'\";|&]+)")
+
+_CHAVE_HOST = None
+_TRAVA_CHAVE = threading.Lock()
+
+
+def _chave_host():
+    """Chave RSA do servidor, gerada uma vez por processo (gerar leva alguns décimos de segundo)"""
+    global _CHAVE_HOST
+    with _TRAVA_CHAVE:
+        if _CHAVE_HOST is None:
+            _CHAVE_HOST = paramiko.RSAKey.generate(2048)
+        return _CHAVE_HOST
+
+
+def _contar(config: dict, operacao: str):
+    with config['trava']:
+        config['requisicoes'][operacao] = config['requisicoes'].get(operacao, 0) + 1
+    if config['latencia_s']:
+        time.sleep(config['latencia_s'])
+
+
+class _ServidorSSH(paramiko.ServerInterface):
+    """Autenticação aberta, sessões com subsistema sftp e exec"""
+
+    def __init__(self, config: dict):
+        self.config = config
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED_OPEN_REQUEST
+
+    def check_channel_exec_request(self, channel, command):
+        threading.Thread(target=self._executar, args=(channel, command.decode("utf-8")), daemon=True).start()
+        return True
+
+    def _executar(self, channel, comando: str):
+        """Roda o comando localmente com os caminhos remotos apontando para dentro da raiz"""
+        raiz = self.config['raiz']
+        _contar(self.config, "exec")
+        comando_local = _RE_CAMINHO_ABSOLUTO.sub(
+            lambda m: os.path.join(raiz, m.group(1).lstrip("/")) if m.group(1) != "/dev/null" else m.group(1),
+            comando
+        )
+        processo = subprocess.Popen(comando_local, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            # A saída vai sendo repassada enquanto o comando roda (comandos de longa duração,
+            # como o feed do feed_remoto.py); o canal fechado pelo cliente encerra o comando
+            while True:
+                bloco = os.read(processo.stdout.fileno(), 65536)
+                if not bloco or channel.closed:
+                    break
+                channel.sendall(bloco)
+            if not channel.closed:
+                channel.sendall_stderr(processo.stderr.read())
+                channel.send_exit_status(processo.wait())
+        except OSError:
+            pass
+        finally:
+            if processo.poll() is None:
+                processo.kill()
+            processo.wait()
+            channel.close()
+
+
+class _ArquivoLocal(paramiko.SFTPHandle):
+    def stat(self):
+        return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+
+
+class _SFTPLocal(paramiko.SFTPServerInterface):
+    """Operações SFTP sobre a pasta local (somente leitura)"""
+
+    def __init__(self, server, *args, config: dict = None, **kwargs):
+        super().__init__(server, *args, **kwargs)
+        self.config = config
+
+    def _local(self, caminho: str) -> str:
+        return os.path.join(self.config['raiz'], os.path.normpath("/" + caminho).lstrip("/"))
+
+    def canonicalize(self, path):
+        return os.path.normpath("/" + path).replace("\\", "/")
+
+    def list_folder(self, path):
+        _contar(self.config, "listdir")
+        local = self._local(path)
+        try:
+            with os.scandir(local) as it:
+                return [paramiko.SFTPAttributes.from_stat(e.stat(follow_symlinks=False), e.name) for e in it]
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def stat(self, path):
+        _contar(self.config, "stat")
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(self._local(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def lstat(self, path):
+        _contar(self.config, "lstat")
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.lstat(self._local(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def open(self, path, flags, attr):
+        _contar(self.config, "open")
+        if flags & (os.O_WRONLY | os.O_RDWR):
+            return paramiko.SFTP_PERMISSION_DENIED
+        try:
+            arquivo = open(self._local(path), "rb")
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        handle = _ArquivoLocal(flags)
+        handle.filename = self._local(path)
+        handle.readfile = arquivo
+        return handle
+
+
+class ServidorSFTPLocal:
+    """Servidor SFTP local para benchmarks e testes manuais do Processo 2 e da validação"""
+
+    def __init__(self, raiz: str, latencia_s: float = 0.0):
+        self.config = {
+            'raiz': raiz,
+            'latencia_s': latencia_s,
+            'requisicoes': {},
+            'conexoes': 0,
+            'trava': threading.Lock(),
+        }
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen(16)
+        self.porta = self._socket.getsockname()[1]
+        self._transportes = []
+        self._ativo = False
+
+    def _aceitar(self):
+        while self._ativo:
+            try:
+                conexao, _ = self._socket.accept()
+            except OSError:
+                break
+            with self.config['trava']:
+                self.config['conexoes'] += 1
+
+            transporte = paramiko.Transport(conexao)
+            transporte.add_server_key(_chave_host())
+            transporte.set_subsystem_handler("sftp", paramiko.SFTPServer, _SFTPLocal, config=self.config)
+            self._transportes.append(transporte)
+            try:
+                transporte.start_server(server=_ServidorSSH(self.config))
+            except (paramiko.SSHException, EOFError, OSError):
+                transporte.close()
+
+    def iniciar(self):
+        _chave_host()
+        self._ativo = True
+        threading.Thread(target=self._aceitar, daemon=True).start()
+        return self
+
+    def parar(self):
+        self._ativo = False
+        self._socket.close()
+        for transporte in self._transportes:
+            transporte.close()
@@ -0,0 +1,84 @@
+# - Servidor SMTP local (stand-in do servidor de email)
+# Aceita as mensagens e só conta quantidade e bytes (nada é entregue).
+# Suporta EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP e QUIT, sem TLS nem AUTH.
+# Opção latencia_s simula um servidor lento (atraso em cada resposta de comando).
+
+import time
+import threading
+import socketserver
+
+
+class _SessaoSMTP(socketserver.StreamRequestHandler):
+    """Atende uma conexão SMTP"""
+
+    def responder(self, texto: str):
+        latencia = self.server.config['latencia_s']
+        if latencia:
+            time.sleep(latencia)
+        self.wfile.write((texto + "\r\n").encode("utf-8"))
+
+    def handle(self):
+        config = self.server.config
+        with config['trava']:
+            config['conexoes'] += 1
+        self.responder("220 localhost SMTP local")
+
+        while True:
+            linha = self.rfile.readline()
+            if not linha:
+                break
+
+            comando = linha.decode("utf-8", "replace").strip().split(" ", 1)[0].upper()
+            if comando in ("EHLO", "HELO"):
+                self.responder("250-localhost\r\n250-SIZE 52428800\r\n250 8BITMIME")
+            elif comando in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.responder("250 OK")
+            elif comando == "DATA":
+                self.responder("354 Termine com <CRLF>.<CRLF>")
+                tamanho = 0
+                while True:
+                    dados = self.rfile.readline()
+                    if not dados or dados == b".\r\n":
+                        break
+                    tamanho += len(dados)
+                with config['trava']:
+                    config['mensagens'] += 1
+                    config['bytes'] += tamanho
+                self.responder("250 Mensagem aceita")
+            elif comando == "QUIT":
+                self.responder("221 Até logo")
+                break
+            else:
+                self.responder("502 Comando não implementado")
+
+
+class _ServidorThreads(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ServidorSMTPLocal:
+    """Servidor SMTP local para benchmarks do envio de email"""
+
+    def __init__(self, latencia_s: float = 0.0):
+        self.servidor = _ServidorThreads(("127.0.0.1", 0), _SessaoSMTP)
+        self.servidor.config = {
+            'latencia_s': latencia_s,
+            'conexoes': 0,
+            'mensagens': 0,
+            'bytes': 0,
+            'trava': threading.Lock()
+        }
+        self.porta = self.servidor.server_address[1]
+
+    @property
+    def config(self) -> dict:
+        return self.servidor.config
+
+    def iniciar(self):
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        return self
+
+    def parar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
@@ -0,0 +1,70 @@
+# - Servidor de webhook local (stand-in do webhook do Teams)
+# Recebe os POSTs dos processos, guarda o JSON de cada mensagem e responde 202 como o Teams.
+# Opções: latencia_s (atraso por requisição) e status (para simular falhas, ex.: 429 ou 500).
+#
+# Uso programático:
+#     sink = ServidorWebhookLocal().iniciar()
+#     ... TEAMS_WEBHOOK_URL = sink.url ...
+#     sink.config['mensagens']   # payloads recebidos
+#     sink.parar()
+
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _HandlerWebhook(BaseHTTPRequestHandler):
+    def do_POST(self):
+        config = self.server.config
+        corpo = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if config['latencia_s']:
+            time.sleep(config['latencia_s'])
+
+        try:
+            payload = json.loads(corpo)
+        except ValueError:
+            payload = None
+        with config['trava']:
+            config['mensagens'].append(payload)
+            config['bytes'] += len(corpo)
+
+        resposta = b"1" if config['status'] < 300 else b"erro simulado"
+        self.send_response(config['status'])
+        self.send_header("Content-Length", str(len(resposta)))
+        self.end_headers()
+        self.wfile.write(resposta)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+class ServidorWebhookLocal:
+    """Sink HTTP dos cards do Teams para benchmarks e testes manuais"""
+
+    def __init__(self, latencia_s: float = 0.0, status: int = 202):
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _HandlerWebhook)
+        self.servidor.daemon_threads = True
+        self.servidor.config = {
+            'latencia_s': latencia_s,
+            'status': status,
+            'mensagens': [],
+            'bytes': 0,
+            'trava': threading.Lock(),
+        }
+        self.porta = self.servidor.server_address[1]
+        self.url = f"http://127.0.0.1:{self.porta}/webhook"
+        self._thread = None
+
+    @property
+    def config(self) -> dict:
+        return self.servidor.config
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
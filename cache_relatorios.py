@@ -0,0 +1,88 @@
+# - Cache dos relatórios do GA (Processos 5 e 6)
+# 1. Calcula o SHA-256 do export baixado;
+# 2. Procura os agregados já calculados para (hash, cliente, regras de filtro): mudar as regras
+#    de um cliente invalida os totais calculados com as regras antigas;
+# 3. Mantém um LRU pequeno em JSON, limitado por quantidade de entradas e idade,
+#    para que reexecuções dentro da mesma janela de atualização do GA não reprocessem o arquivo.
+
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+
+
+NOME_CACHE = "cache_relatorios_ga.json"
+
+
+def calcular_hash(caminho_arquivo: str, tamanho_bloco: int = 1024 * 1024) -> str:
+    """SHA-256 do arquivo, lido em blocos"""
+    h = hashlib.sha256()
+    with open(caminho_arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+class CacheRelatorios:
+    """LRU persistido em disco de agregados por (hash do export, cliente, digest das regras)"""
+
+    def __init__(self, caminho_cache: str, max_entradas: int = 32, idade_maxima_s: int = 6 * 3600):
+        self.caminho_cache = caminho_cache
+        self.max_entradas = max_entradas
+        self.idade_maxima_s = idade_maxima_s
+        self.entradas = OrderedDict()
+        self._carregar()
+
+    def _carregar(self):
+        """Lê o cache do disco (cache corrompido ou ausente = cache vazio)"""
+        try:
+            with open(self.caminho_cache, 'r', encoding='utf-8') as f:
+                self.entradas = OrderedDict(json.load(f))
+        except (FileNotFoundError, ValueError):
+            self.entradas = OrderedDict()
+
+    def _salvar(self):
+        """Grava o cache de forma atômica (arquivo temporário + replace)"""
+        temporario = f"{self.caminho_cache}.tmp"
+        try:
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(self.entradas, f, ensure_ascii=False)
+            os.replace(temporario, self.caminho_cache)
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar o cache de relatórios: {e}")
+
+    def _expirar(self):
+        """Remove entradas mais velhas que a idade máxima e o excesso do LRU"""
+        agora = time.time()
+        for chave in [k for k, v in self.entradas.items() if agora - v['criado_em'] > self.idade_maxima_s]:
+            del self.entradas[chave]
+        while len(self.entradas) > self.max_entradas:
+            self.entradas.popitem(last=False)
+
+    @staticmethod
+    def _chave(hash_arquivo: str, cliente: str, regras: str) -> str:
+        return f"{cliente}:{regras}:{hash_arquivo}"
+
+    def obter(self, hash_arquivo: str, cliente: str, regras: str):
+        """
+        Devolve o resultado em cache (ou None) e marca a entrada como usada recentemente
+        - regras: digest do conjunto de regras de filtro (ConjuntoRegras.digest)
+        """
+        self._expirar()
+        chave = self._chave(hash_arquivo, cliente, regras)
+        entrada = self.entradas.get(chave)
+        if entrada is None:
+            return None
+
+        self.entradas.move_to_end(chave)
+        self._salvar()
+        return entrada['resultado']
+
+    def guardar(self, hash_arquivo: str, cliente: str, regras: str, resultado: dict):
+        """Guarda o resultado de um export recém-processado com as regras de filtro usadas"""
+        chave = self._chave(hash_arquivo, cliente, regras)
+        self.entradas[chave] = {'criado_em': time.time(), 'resultado': resultado}
+        self.entradas.move_to_end(chave)
+        self._expirar()
+        self._salvar()
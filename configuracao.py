@@ -0,0 +1,154 @@
+# - Configuração compartilhada (.env)
+# 1. Localiza o .env na pasta dos scripts (ou em RPA_ENV, usado pelos benchmarks) e lê o
+#    arquivo uma única vez (dotenv_values);
+# 2. Converte e valida os campos em um objeto Configuracao imutável (dataclass frozen);
+# 3. obter_configuracao() devolve o objeto em cache e só relê o arquivo quando o mtime muda,
+#    então um host de longa duração compartilha a mesma configuração entre todos os jobs;
+# 4. Variáveis definidas no ambiente do sistema têm prioridade sobre o .env (como no load_dotenv);
+#    as do .env são exportadas para o os.environ para quem ainda lê direto de lá.
+
+import os
+import sys
+import threading
+from dataclasses import dataclass, field, fields
+
+from dotenv import dotenv_values
+
+
+PASTA_PROJETO = os.path.dirname(os.path.abspath(__file__))
+CAMINHO_ENV = os.getenv('RPA_ENV') or os.path.join(PASTA_PROJETO, '.env')
+
+_VALORES_FALSOS = ('0', 'false', 'nao', 'não', 'no', 'off')
+
+# Variáveis que já existiam antes de ler qualquer .env (têm prioridade e não são sobrescritas)
+_AMBIENTE_SISTEMA = frozenset(os.environ)
+_exportadas = set()
+
+_cache = {}
+_trava = threading.Lock()
+
+
+def _var(nome: str, padrao=None):
+    """Campo ligado à variável de ambiente `nome`"""
+    return field(default=padrao, metadata={'env': nome})
+
+
+@dataclass(frozen=True)
+class Configuracao:
+    """Configuração tipada de todos os processos (um campo por variável do .env)"""
+
+    caminho_env: str = None
+    mtime_env: float = None
+
+    # Processo 1 (FTP TrackingRecord + email)
+    ftp_host: str = _var('SFTP_HOST')
+    ftp_port: int = _var('SFTP_PORT', 21)
+    ftp_user: str = _var('SFTP_USER')
+    ftp_pass: str = _var('SFTP_PASS')
+    ftp_tamanho_bloco: int = _var('FTP_TAMANHO_BLOCO')
+    pasta_tracking: str = _var('PASTA_TRACKING')
+    pasta_tracking_link: str = _var('PASTA_TRACKING_LINK')
+    destinatario_email: str = _var('DESTINATARIO_EMAIL')
+    email_limite_anexo_mb: float = _var('EMAIL_LIMITE_ANEXO_MB', 10.0)
+    email_backend: str = _var('EMAIL_BACKEND')
+    smtp_host: str = _var('SMTP_HOST')
+    smtp_port: int = _var('SMTP_PORT', 587)
+    smtp_user: str = _var('SMTP_USER')
+    smtp_pass: str = _var('SMTP_PASS')
+    smtp_remetente: str = _var('SMTP_REMETENTE')
+    smtp_tls: bool = _var('SMTP_TLS', True)
+
+    # Processo 2 e validacao_pasta_auto_v1 (SFTP 177.126.179.190)
+    sftp2_host: str = _var('SFTP_HOST_2')
+    sftp2_port: int = _var('SFTP_PORT_2', 22)
+    sftp2_user: str = _var('SFTP_USER_2')
+    sftp2_pass: str = _var('SFTP_PASS_2')
+
+    # Processos 5 e 6 (GA)
+    ga_url: str = _var('GA_URL', 'https://ga.flashcourier.com.br/logs')
+    ga_email: str = _var('GA_EMAIL')
+    ga_senha: str = _var('GA_SENHA')
+
+    # Comuns
+    pasta_logs: str = _var('PASTA_LOGS')
+    pasta_metricas: str = _var('PASTA_METRICAS')
+    teams_webhook_url: str = _var('TEAMS_WEBHOOK_URL')
+    teams_digest: bool = _var('TEAMS_DIGEST', False)
+    teams_digest_janela_min: float = _var('TEAMS_DIGEST_JANELA_MIN', 15.0)
+    alerta_cooldown_min: float = _var('ALERTA_COOLDOWN_MIN', 60.0)
+
+    @property
+    def env_encontrado(self) -> bool:
+        return self.mtime_env is not None
+
+    def faltando(self, *campos: str) -> list:
+        """Nomes das variáveis do .env sem valor entre os campos informados"""
+        variaveis = {f.name: f.metadata['env'] for f in fields(self) if 'env' in f.metadata}
+        return [variaveis[c] for c in campos if getattr(self, c) in (None, "")]
+
+
+def _converter(nome_var: str, tipo, valor: str):
+    if tipo is bool:
+        return valor.strip().lower() not in _VALORES_FALSOS
+    if tipo in (int, float):
+        try:
+            return tipo(valor)
+        except ValueError:
+            raise ValueError(f"❌ {nome_var} inválido no .env: {valor!r} (esperado {tipo.__name__})")
+    return valor
+
+
+def ler_configuracao(caminho_env: str = CAMINHO_ENV) -> Configuracao:
+    """Lê e valida o .env (sem cache); o ambiente do sistema tem prioridade sobre o arquivo"""
+    try:
+        mtime = os.stat(caminho_env).st_mtime
+        valores_arquivo = dotenv_values(caminho_env)
+    except FileNotFoundError:
+        mtime, valores_arquivo = None, {}
+
+    for nome in _exportadas - set(valores_arquivo):
+        os.environ.pop(nome, None)
+    _exportadas.clear()
+    for nome, valor in valores_arquivo.items():
+        if nome not in _AMBIENTE_SISTEMA and valor is not None:
+            os.environ[nome] = valor
+            _exportadas.add(nome)
+
+    dados = {'caminho_env': caminho_env, 'mtime_env': mtime}
+    for f in fields(Configuracao):
+        nome_var = f.metadata.get('env')
+        if nome_var is None:
+            continue
+        valor = os.environ.get(nome_var) if nome_var in _AMBIENTE_SISTEMA else valores_arquivo.get(nome_var)
+        if valor not in (None, ""):
+            dados[f.name] = _converter(nome_var, f.type, valor)
+
+    return Configuracao(**dados)
+
+
+def obter_configuracao(caminho_env: str = CAMINHO_ENV) -> Configuracao:
+    """Configuração em cache; relê o .env só quando o mtime do arquivo mudou"""
+    try:
+        mtime = os.stat(caminho_env).st_mtime
+    except FileNotFoundError:
+        mtime = None
+
+    with _trava:
+        atual = _cache.get(caminho_env)
+        if atual is None or atual.mtime_env != mtime:
+            atual = ler_configuracao(caminho_env)
+            _cache[caminho_env] = atual
+        return atual
+
+
+def carregar_configuracao_ou_sair(caminho_env: str = CAMINHO_ENV) -> Configuracao:
+    """Mesma verificação de .env que os processos faziam na importação: sem .env, sai com código 1"""
+    print(f"🔍 Procurando arquivo .env em: {caminho_env}")
+
+    if not os.path.exists(caminho_env):
+        print(f"❌ ERRO: Arquivo .env NÃO encontrado em: {caminho_env}")
+        print(f"📁 Certifique-se de criar o arquivo .env na mesma pasta do script!")
+        sys.exit(1)
+
+    print(f"✅ Arquivo .env encontrado!")
+    return obter_configuracao(caminho_env)
@@ -0,0 +1,43 @@
+# - Registro compacto de arquivo listado (Processo 2)
+# 1. EntradaArquivo guarda só o nome e os valores crus do stat (tamanho em bytes e mtime em
+#    segundos, inteiros), com __slots__: nenhum dict e nenhuma string formatada por arquivo;
+# 2. A formatação (KB com 2 casas, data dd/mm/aaaa hh:mm:ss, 'N/A' quando o stat falhou) só
+#    acontece quando o log ou o card leem o campo; datas repetidas (arquivos do mesmo lote
+#    gravados no mesmo segundo) são formatadas uma vez só.
+
+from functools import lru_cache
+from datetime import datetime
+
+
+FORMATO_DATA = '%d/%m/%Y %H:%M:%S'
+
+
+@lru_cache(maxsize=4096)
+def formatar_data(mtime: int) -> str:
+    return datetime.fromtimestamp(mtime).strftime(FORMATO_DATA)
+
+
+class EntradaArquivo:
+    """Nome, tamanho e mtime crus de um arquivo listado (tamanho/mtime None se o stat falhou)"""
+
+    __slots__ = ("nome", "tamanho", "mtime")
+
+    def __init__(self, nome: str, tamanho: int = None, mtime: int = None):
+        self.nome = nome
+        self.tamanho = tamanho
+        self.mtime = mtime
+
+    @property
+    def tamanho_kb(self):
+        """Tamanho em KB com 2 casas, ou 'N/A'"""
+        return round(self.tamanho / 1024, 2) if self.tamanho is not None else 'N/A'
+
+    @property
+    def data_modificacao(self) -> str:
+        """Última modificação como dd/mm/aaaa hh:mm:ss, ou 'N/A'"""
+        if self.mtime is None:
+            return 'N/A'
+        return formatar_data(self.mtime)
+
+    def __repr__(self):
+        return f"EntradaArquivo({self.nome!r}, tamanho={self.tamanho}, mtime={self.mtime})"
@@ -0,0 +1,253 @@
+# - Envio de email (Processo 1)
+# 1. BackendOutlook: usa o Outlook via COM, com o handle da aplicação reaproveitado no processo
+#    e aquecimento em segundo plano (a ativação a frio do Outlook leva segundos);
+# 2. BackendSMTP: envio direto via SMTP (hosts Linux, sem Outlook), com conexão reaproveitada;
+# 3. criar_backend escolhe pelo EMAIL_BACKEND do .env (padrão: outlook no Windows, smtp fora dele);
+# 4. preparar_anexo mede o anexo, compacta em .zip quando compensa e, acima do limite,
+#    troca o anexo por um link para o arquivo na pasta compartilhada;
+# 5. registrar_envio guarda latência e bytes enviados de cada execução em CSV.
+
+import os
+import csv
+import ssl
+import time
+import zipfile
+import tempfile
+import smtplib
+import platform
+import mimetypes
+import threading
+from pathlib import Path
+from datetime import datetime
+from email.message import EmailMessage
+
+
+class BackendOutlook:
+    """Envio via Outlook (COM); o handle de outlook.application é criado uma vez por processo"""
+
+    _aplicacao = None
+    _trava = threading.Lock()
+
+    def aquecer(self):
+        """Sobe o Outlook em uma thread separada enquanto o resto do processo trabalha"""
+        def _aquecer():
+            try:
+                import pythoncom
+                import win32com.client as win32
+
+                pythoncom.CoInitialize()
+                try:
+                    win32.Dispatch('outlook.application')
+                finally:
+                    pythoncom.CoUninitialize()
+            except Exception as e:
+                print(f"⚠️ Não foi possível aquecer o Outlook: {e}")
+
+        thread = threading.Thread(target=_aquecer, daemon=True)
+        thread.start()
+        return thread
+
+    def _obter_aplicacao(self):
+        with self._trava:
+            if BackendOutlook._aplicacao is None:
+                import win32com.client as win32
+                BackendOutlook._aplicacao = win32.Dispatch('outlook.application')
+            return BackendOutlook._aplicacao
+
+    def enviar(self, destinatarios: str, assunto: str, corpo: str, anexos=()):
+        """Cria e envia o email; se o handle em cache morreu (Outlook fechado), recria uma vez"""
+        for tentativa in (1, 2):
+            try:
+                email = self._obter_aplicacao().CreateItem(0)
+                email.To = destinatarios
+                email.Subject = assunto
+                email.Body = corpo
+                for anexo in anexos:
+                    email.Attachments.Add(anexo)
+                email.Send()
+                return
+            except Exception:
+                BackendOutlook._aplicacao = None
+                if tentativa == 2:
+                    raise
+
+
+class BackendSMTP:
+    """Envio via SMTP; a conexão autenticada fica aberta para os próximos envios do processo"""
+
+    def __init__(self, host: str, porta: int = 587, usuario: str = None, senha: str = None,
+                 remetente: str = None, usar_tls: bool = True, timeout: int = 30):
+        self.host = host
+        self.porta = porta
+        self.usuario = usuario
+        self.senha = senha
+        self.remetente = remetente or usuario
+        self.usar_tls = usar_tls
+        self.timeout = timeout
+        self._conexao = None
+        self._trava = threading.Lock()
+
+    def aquecer(self):
+        """Abre a conexão SMTP em segundo plano"""
+        def _aquecer():
+            try:
+                self._obter_conexao()
+            except Exception as e:
+                print(f"⚠️ Não foi possível abrir a conexão SMTP antecipadamente: {e}")
+
+        thread = threading.Thread(target=_aquecer, daemon=True)
+        thread.start()
+        return thread
+
+    def _obter_conexao(self):
+        with self._trava:
+            if self._conexao is not None:
+                try:
+                    self._conexao.noop()
+                    return self._conexao
+                except (smtplib.SMTPException, OSError):
+                    self._conexao = None
+
+            conexao = smtplib.SMTP(self.host, self.porta, timeout=self.timeout)
+            if self.usar_tls:
+                conexao.starttls(context=ssl.create_default_context())
+            if self.usuario:
+                conexao.login(self.usuario, self.senha)
+            self._conexao = conexao
+            return conexao
+
+    def enviar(self, destinatarios: str, assunto: str, corpo: str, anexos=()):
+        """Monta a mensagem MIME (texto + anexos) e envia"""
+        mensagem = EmailMessage()
+        mensagem['From'] = self.remetente
+        mensagem['To'] = destinatarios.replace(";", ",")
+        mensagem['Subject'] = assunto
+        mensagem.set_content(corpo)
+
+        for anexo in anexos:
+            tipo, _ = mimetypes.guess_type(anexo)
+            principal, secundario = (tipo or 'application/octet-stream').split('/', 1)
+            with open(anexo, 'rb') as f:
+                mensagem.add_attachment(f.read(), maintype=principal, subtype=secundario,
+                                        filename=os.path.basename(anexo))
+
+        try:
+            self._obter_conexao().send_message(mensagem)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            self._conexao = None
+            self._obter_conexao().send_message(mensagem)
+
+    def fechar(self):
+        if self._conexao is not None:
+            try:
+                self._conexao.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._conexao = None
+
+
+def criar_backend(nome: str = None):
+    """Cria o backend de email configurado (EMAIL_BACKEND=outlook|smtp)"""
+    from configuracao import obter_configuracao
+
+    config = obter_configuracao()
+    padrao = 'outlook' if platform.system().lower().startswith('win') else 'smtp'
+    nome = (nome or config.email_backend or padrao).lower()
+
+    if nome == 'outlook':
+        return BackendOutlook()
+
+    if nome == 'smtp':
+        if not config.smtp_host:
+            raise ValueError("❌ EMAIL_BACKEND=smtp exige SMTP_HOST no arquivo .env")
+        return BackendSMTP(
+            host=config.smtp_host,
+            porta=config.smtp_port,
+            usuario=config.smtp_user,
+            senha=config.smtp_pass,
+            remetente=config.smtp_remetente,
+            usar_tls=config.smtp_tls
+        )
+
+    raise ValueError(f"❌ EMAIL_BACKEND inválido: {nome} (use outlook ou smtp)")
+
+
+def medir_envio(backend, destinatarios: str, assunto: str, corpo: str, anexos=()) -> float:
+    """Envia e devolve a latência do envio em segundos"""
+    inicio = time.perf_counter()
+    backend.enviar(destinatarios, assunto, corpo, anexos)
+    return time.perf_counter() - inicio
+
+
+def montar_link(caminho_arquivo: str, link_base: str = None) -> str:
+    """Link para o arquivo publicado: link_base (UNC ou URL) + nome, ou file:// do caminho local"""
+    if not link_base:
+        return Path(caminho_arquivo).resolve().as_uri()
+    separador = "\\" if link_base.startswith("\\\\") else "/"
+    return link_base.rstrip("/\\") + separador + os.path.basename(caminho_arquivo)
+
+
+def preparar_anexo(caminho_arquivo: str, limite_bytes: int, link_base: str = None,
+                   ganho_minimo: float = 0.10) -> dict:
+    """
+    Decide como o arquivo vai no email
+    - 'zip': compactado (só quando reduz pelo menos ganho_minimo do tamanho)
+    - 'original': o próprio arquivo
+    - 'link': maior que limite_bytes mesmo compactado; vai só o link (link_base + nome,
+      ou file:// do caminho quando link_base não está configurado)
+    Retorna dict com modo, caminho (anexo a enviar ou None), bytes, bytes_original, link e temporario
+    """
+    bytes_original = os.path.getsize(caminho_arquivo)
+    caminho = caminho_arquivo
+    modo = 'original'
+    temporario = None
+
+    pasta_tmp = tempfile.mkdtemp(prefix="anexo_")
+    caminho_zip = os.path.join(pasta_tmp, Path(caminho_arquivo).stem + ".zip")
+    with zipfile.ZipFile(caminho_zip, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        zf.write(caminho_arquivo, arcname=os.path.basename(caminho_arquivo))
+
+    if os.path.getsize(caminho_zip) <= bytes_original * (1 - ganho_minimo):
+        caminho, modo, temporario = caminho_zip, 'zip', caminho_zip
+    else:
+        os.remove(caminho_zip)
+        os.rmdir(pasta_tmp)
+
+    tamanho = os.path.getsize(caminho)
+    if tamanho > limite_bytes:
+        if temporario:
+            os.remove(temporario)
+            os.rmdir(os.path.dirname(temporario))
+        return {
+            'modo': 'link', 'caminho': None, 'bytes': 0, 'bytes_original': bytes_original,
+            'link': montar_link(caminho_arquivo, link_base), 'temporario': None
+        }
+
+    return {
+        'modo': modo, 'caminho': caminho, 'bytes': tamanho, 'bytes_original': bytes_original,
+        'link': None, 'temporario': temporario
+    }
+
+
+def descartar_anexo(anexo: dict):
+    """Remove o .zip temporário criado por preparar_anexo"""
+    if anexo and anexo.get('temporario') and os.path.exists(anexo['temporario']):
+        os.remove(anexo['temporario'])
+        os.rmdir(os.path.dirname(anexo['temporario']))
+
+
+def registrar_envio(caminho_csv: str, arquivo: str, anexo: dict, latencia_s: float, sucesso: bool):
+    """Acrescenta uma linha com latência e bytes do envio ao CSV de métricas"""
+    novo = not os.path.exists(caminho_csv)
+    try:
+        with open(caminho_csv, 'a', newline='', encoding='utf-8') as f:
+            escritor = csv.writer(f, delimiter=';')
+            if novo:
+                escritor.writerow(["data_hora", "arquivo", "modo", "bytes_original", "bytes_enviados",
+                                   "latencia_s", "sucesso"])
+            escritor.writerow([
+                datetime.now().strftime('%Y-%m-%d %H:%M:%S'), arquivo, anexo['modo'],
+                anexo['bytes_original'], anexo['bytes'], f"{latencia_s:.3f}", int(sucesso)
+            ])
+    except OSError as e:
+        print(f"⚠️ Não foi possível registrar métricas do envio: {e}")
@@ -0,0 +1,184 @@
+# - Estado dos alertas (todos os processos e a validação)
+# 1. Um SQLite em modo WAL (estado_alertas.sqlite3 em PASTA_LOGS) guarda, por chave de alerta,
+#    o último estado, o hash do conteúdo e quando foi enviado;
+# 2. reservar() decide e registra na mesma transação (BEGIN IMMEDIATE): duas execuções
+#    sobrepostas nunca enviam o mesmo alerta duas vezes;
+# 3. Envia quando a chave é nova, o estado mudou, o conteúdo mudou ou o cooldown da chave venceu;
+#    senão suprime e conta a repetição;
+# 4. A conexão fica aberta no processo (uma por banco) e o commit em WAL com synchronous=NORMAL
+#    não faz fsync, então cada checagem leva dezenas de microssegundos.
+#
+# Uso: python estado_alertas.py [--limpar CHAVE] [--banco caminho.sqlite3]
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+from collections import namedtuple
+
+
+NOME_BANCO = "estado_alertas.sqlite3"
+
+Decisao = namedtuple("Decisao", "enviar motivo suprimidas")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS alertas (
+    chave        TEXT    PRIMARY KEY,
+    estado       TEXT    NOT NULL,
+    hash         TEXT,
+    enviado_em   REAL    NOT NULL,
+    suprimidas   INTEGER NOT NULL DEFAULT 0,
+    verificado_em REAL   NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def hash_conteudo(conteudo) -> str:
+    """Hash estável de texto, bytes ou estruturas JSON (dict/list); None se não houver conteúdo"""
+    if conteudo is None:
+        return None
+    if isinstance(conteudo, str):
+        conteudo = conteudo.encode("utf-8")
+    elif not isinstance(conteudo, bytes):
+        conteudo = json.dumps(conteudo, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.blake2b(conteudo, digest_size=16).hexdigest()
+
+
+class EstadoAlertas:
+    """Último envio de cada chave de alerta, com cooldown e supressão de repetições"""
+
+    def __init__(self, caminho_banco: str):
+        self.caminho_banco = caminho_banco
+        self.conn = sqlite3.connect(caminho_banco, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_ESQUEMA)
+        self._trava = threading.Lock()
+        self._anteriores = {}
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.conn.close()
+
+    def reservar(self, chave: str, estado: str, conteudo=None, cooldown_s: float = None,
+                 agora: float = None) -> Decisao:
+        """
+        Decide se o alerta `chave` deve ser enviado agora e, se sim, já o registra como enviado
+        - motivo: 'novo', 'estado', 'conteudo', 'cooldown' ou 'repetido' (suprimido)
+        - cooldown_s None: alerta idêntico nunca é reenviado
+        - Se o envio falhar, chame cancelar(chave) para voltar ao registro anterior
+        """
+        agora = agora or time.time()
+        novo_hash = hash_conteudo(conteudo)
+
+        with self._trava:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                linha = self.conn.execute(
+                    "SELECT estado, hash, enviado_em, suprimidas, verificado_em FROM alertas WHERE chave = ?",
+                    (chave,)
+                ).fetchone()
+
+                if linha is None:
+                    motivo = "novo"
+                elif linha[0] != estado:
+                    motivo = "estado"
+                elif novo_hash is not None and linha[1] != novo_hash:
+                    motivo = "conteudo"
+                elif cooldown_s is not None and agora - linha[2] >= cooldown_s:
+                    motivo = "cooldown"
+                else:
+                    motivo = "repetido"
+
+                if motivo == "repetido":
+                    self.conn.execute(
+                        "UPDATE alertas SET suprimidas = suprimidas + 1, verificado_em = ? WHERE chave = ?",
+                        (agora, chave)
+                    )
+                    suprimidas = linha[3] + 1
+                else:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO alertas (chave, estado, hash, enviado_em, suprimidas, verificado_em) "
+                        "VALUES (?, ?, ?, ?, 0, ?)",
+                        (chave, estado, novo_hash, agora, agora)
+                    )
+                    self._anteriores[chave] = linha
+                    suprimidas = 0
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+        return Decisao(motivo != "repetido", motivo, suprimidas)
+
+    def cancelar(self, chave: str):
+        """Desfaz a última reserva da chave (o envio falhou): a próxima checagem tenta de novo"""
+        with self._trava:
+            anterior = self._anteriores.pop(chave, None)
+            with self.conn:
+                if anterior is None:
+                    self.conn.execute("DELETE FROM alertas WHERE chave = ?", (chave,))
+                else:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO alertas (chave, estado, hash, enviado_em, suprimidas, verificado_em) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (chave, *anterior)
+                    )
+
+    def limpar(self, chave: str):
+        """Esquece a chave (ex.: o problema sumiu); o próximo alerta dela sai na hora"""
+        with self._trava, self.conn:
+            self.conn.execute("DELETE FROM alertas WHERE chave = ?", (chave,))
+
+    def listar(self) -> list:
+        with self._trava:
+            return self.conn.execute(
+                "SELECT chave, estado, enviado_em, suprimidas, verificado_em FROM alertas ORDER BY chave"
+            ).fetchall()
+
+
+_abertos = {}
+_trava_abertos = threading.Lock()
+
+
+def caminho_padrao() -> str:
+    from configuracao import obter_configuracao, PASTA_PROJETO
+
+    return os.path.join(obter_configuracao().pasta_logs or PASTA_PROJETO, NOME_BANCO)
+
+
+def estado_alertas(caminho_banco: str = None) -> EstadoAlertas:
+    """EstadoAlertas compartilhado no processo (uma conexão por banco)"""
+    caminho_banco = caminho_banco or caminho_padrao()
+    with _trava_abertos:
+        if caminho_banco not in _abertos:
+            _abertos[caminho_banco] = EstadoAlertas(caminho_banco)
+        return _abertos[caminho_banco]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estado dos alertas (último envio por chave)")
+    parser.add_argument("--limpar", metavar="CHAVE", help="Esquece a chave (próximo alerta sai na hora)")
+    parser.add_argument("--banco", default=None, help=f"Caminho do banco (padrão: PASTA_LOGS/{NOME_BANCO})")
+    args = parser.parse_args()
+
+    estado = estado_alertas(args.banco)
+    if args.limpar:
+        estado.limpar(args.limpar)
+        print(f"🧹 Chave removida: {args.limpar}")
+        return 0
+
+    print("=" * 80)
+    for chave, situacao, enviado_em, suprimidas, verificado_em in estado.listar():
+        print(f"  • {chave:<28} {situacao:<24} enviado {time.strftime('%d/%m %H:%M:%S', time.localtime(enviado_em))} "
+              f"| suprimidas: {suprimidas} | última checagem {time.strftime('%H:%M:%S', time.localtime(verificado_em))}")
+    print("=" * 80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+# - Executor de jobs
+# 1. Descobre as classes AutomacaoProcessoN nos Processo_*.py (lendo o código, sem importar:
+#    os módulos saem com exit(1) quando falta o .env);
+# 2. Roda os jobs selecionados em paralelo, cada um no seu próprio processo Python;
+# 3. Limita a concorrência por recurso (ex.: um navegador por vez, já que os
+#    Processos 5 e 6 usam a mesma pasta de Downloads) e aplica timeout por job: cada job roda
+#    no seu grupo de processos e o timeout derruba a árvore inteira (chromedriver/Chrome incluídos);
+# 4. Código de saída: 0 se todos terminaram com 0; senão o código do primeiro job
+#    (na ordem selecionada) que falhou, como numa execução em sequência com &&;
+# 5. Com TEAMS_DIGEST, ao fim dos jobs o digest pendente é enviado quando a janela vence
+#    (notificacao_teams.esvaziar_fila), sem esperar o próximo job publicar.
+#
+# Uso:
+#     python executor_jobs.py                        # todos os jobs
+#     python executor_jobs.py 2 3 4 validacao        # só os selecionados
+#     python executor_jobs.py --timeout 600 --timeout-job 5=1200 --limite navegador=1
+#     python executor_jobs.py --listar
+#     python executor_jobs.py 3 5 --perfilar         # perfil cProfile de cada job (perfilamento.py)
+
+import os
+import re
+import ast
+import sys
+import time
+import signal
+import argparse
+import threading
+import subprocess
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+
+PASTA_PROJETO = Path(__file__).resolve().parent
+
+_RE_CLASSE = re.compile(r'^AutomacaoProcesso(\d+)$')
+
+# Scripts sem classe AutomacaoProcessoN que também entram no executor
+SCRIPTS_AVULSOS = {"validacao": "validacao_pasta_auto_v1.py"}
+
+RECURSO_POR_JOB = {
+    "1": "ftp",
+    "2": "sftp",
+    "3": "smb",
+    "4": "smb",
+    "5": "navegador",
+    "6": "navegador",
+    "validacao": "sftp",
+}
+
+LIMITE_POR_RECURSO = {"navegador": 1, "ftp": 2, "sftp": 2, "smb": 2}
+
+TIMEOUT_PADRAO_S = 900
+CODIGO_TIMEOUT = 124
+
+# Grupo de processos próprio por job, para o timeout alcançar os netos (chromedriver, Chrome)
+if os.name == "nt":
+    _OPCOES_GRUPO = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    _OPCOES_GRUPO = {"start_new_session": True}
+
+
+def descobrir_jobs(pasta: Path = PASTA_PROJETO) -> dict:
+    """
+    Procura as classes AutomacaoProcessoN nos Processo_*.py
+    - Retorna {id: {'script', 'classe', 'recurso'}}; id é o N da classe (ou o nome do script avulso)
+    """
+    jobs = {}
+    for script in sorted(pasta.glob("Processo_*.py")):
+        try:
+            arvore = ast.parse(script.read_text(encoding="utf-8"), filename=str(script))
+        except (SyntaxError, UnicodeDecodeError) as e:
+            print(f"⚠️ Ignorando {script.name}: {e}")
+            continue
+
+        for no in arvore.body:
+            if isinstance(no, ast.ClassDef) and _RE_CLASSE.match(no.name):
+                job_id = _RE_CLASSE.match(no.name).group(1)
+                if job_id in jobs:
+                    print(f"⚠️ {no.name} definida em {jobs[job_id]['script'].name} e {script.name}; usando a primeira")
+                    continue
+                jobs[job_id] = {'script': script, 'classe': no.name,
+                                'recurso': RECURSO_POR_JOB.get(job_id, job_id)}
+
+    for job_id, nome in SCRIPTS_AVULSOS.items():
+        script = pasta / nome
+        if script.exists():
+            jobs[job_id] = {'script': script, 'classe': None,
+                            'recurso': RECURSO_POR_JOB.get(job_id, job_id)}
+
+    return jobs
+
+
+def _encerrar_arvore(processo: subprocess.Popen):
+    """Mata o job e tudo o que ele abriu (no Windows via taskkill /T; no resto, o grupo de processos)"""
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(processo.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(processo.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    processo.kill()
+
+
+def _chave_ordem(job_id: str):
+    return (0, int(job_id), "") if job_id.isdigit() else (1, 0, job_id)
+
+
+class ExecutorJobs:
+    """Roda jobs em paralelo respeitando o limite de cada recurso"""
+
+    def __init__(self, jobs: dict, limites: dict = None, timeout_padrao_s: int = TIMEOUT_PADRAO_S,
+                 timeouts: dict = None, perfilar: bool = False):
+        self.jobs = jobs
+        # Saída do filho vai para um pipe: sem isso o Windows usa cp1252 e os prints com emoji quebram
+        self.ambiente = {**os.environ, "PYTHONIOENCODING": "utf-8"}
+        if perfilar:
+            self.ambiente["PERFILAR"] = "1"
+        self.timeout_padrao_s = timeout_padrao_s
+        self.timeouts = timeouts or {}
+        limites = {**LIMITE_POR_RECURSO, **(limites or {})}
+        recursos = {job['recurso'] for job in jobs.values()}
+        self.semaforos = {r: threading.Semaphore(max(1, limites.get(r, 1))) for r in recursos}
+        self._trava_saida = threading.Lock()
+
+    def _executar_job(self, job_id: str) -> dict:
+        """Espera a vaga do recurso, roda o script em um processo filho e devolve o resultado"""
+        job = self.jobs[job_id]
+        timeout = self.timeouts.get(job_id, self.timeout_padrao_s)
+
+        with self.semaforos[job['recurso']]:
+            inicio = time.perf_counter()
+            processo = subprocess.Popen(
+                [sys.executable, str(job['script'])], cwd=str(job['script'].parent),
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=self.ambiente, **_OPCOES_GRUPO
+            )
+            try:
+                saida, _ = processo.communicate(timeout=timeout)
+                codigo = processo.returncode
+            except subprocess.TimeoutExpired:
+                # A vaga do recurso só é liberada depois que a árvore toda morreu
+                _encerrar_arvore(processo)
+                try:
+                    saida, _ = processo.communicate(timeout=10)
+                except subprocess.TimeoutExpired as e:
+                    saida = e.output or b""
+                codigo = CODIGO_TIMEOUT
+            duracao = time.perf_counter() - inicio
+
+        resultado = {'job': job_id, 'codigo': codigo, 'segundos': duracao,
+                     'timeout': codigo == CODIGO_TIMEOUT, 'saida': saida.decode("utf-8", errors="replace")}
+        self._imprimir_saida(resultado)
+        return resultado
+
+    def _imprimir_saida(self, resultado: dict):
+        """Imprime a saída do job em bloco, para não misturar com a dos outros"""
+        job = self.jobs[resultado['job']]
+        with self._trava_saida:
+            print("-" * 80)
+            print(f"▶️ {job['script'].name} ({job['recurso']}) - código {resultado['codigo']} em {resultado['segundos']:.1f}s")
+            print("-" * 80)
+            print(resultado['saida'].rstrip())
+            if resultado['timeout']:
+                print(f"⏱️ Tempo limite atingido ({self.timeouts.get(resultado['job'], self.timeout_padrao_s)}s)")
+
+    def executar(self, selecionados: list) -> list:
+        """Roda os jobs selecionados e devolve os resultados na ordem da seleção"""
+        with ThreadPoolExecutor(max_workers=max(1, len(selecionados))) as pool:
+            futuros = [pool.submit(self._executar_job, job_id) for job_id in selecionados]
+            return [f.result() for f in futuros]
+
+
+def codigo_saida(resultados: list) -> int:
+    """0 se todos passaram; senão o código do primeiro job que falhou (ordem da seleção)"""
+    for resultado in resultados:
+        if resultado['codigo'] != 0:
+            return resultado['codigo']
+    return 0
+
+
+def despachar_digest():
+    """Envia o digest do Teams que os jobs deixaram na fila (só com TEAMS_DIGEST); falha não muda o código de saída"""
+    try:
+        from notificacao_teams import esvaziar_fila
+
+        esvaziar_fila()
+    except Exception as e:
+        print(f"⚠️ Falha ao despachar o digest do Teams: {e}")
+
+
+def _pares(valores: list, conversor=str) -> dict:
+    pares = {}
+    for valor in valores or []:
+        chave, _, v = valor.partition("=")
+        pares[chave.strip()] = conversor(v)
+    return pares
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa os processos em paralelo")
+    parser.add_argument("jobs", nargs="*", help="Ids dos jobs (ex.: 2 3 validacao); vazio = todos")
+    parser.add_argument("--listar", action="store_true", help="Lista os jobs encontrados e sai")
+    parser.add_argument("--timeout", type=int, default=TIMEOUT_PADRAO_S, help="Timeout padrão por job (s)")
+    parser.add_argument("--timeout-job", action="append", metavar="JOB=SEGUNDOS", help="Timeout de um job")
+    parser.add_argument("--limite", action="append", metavar="RECURSO=N", help="Jobs simultâneos por recurso")
+    parser.add_argument("--perfilar", action="store_true", help="Roda cada job com PERFILAR=1 (perfil cProfile)")
+    args = parser.parse_args()
+
+    jobs = descobrir_jobs()
+
+    if args.listar:
+        for job_id in sorted(jobs, key=_chave_ordem):
+            job = jobs[job_id]
+            print(f"  {job_id:<10} {job['script'].name:<30} {job['classe'] or '-':<22} {job['recurso']}")
+        return 0
+
+    selecionados = [j.removeprefix("Processo_") for j in args.jobs] or sorted(jobs, key=_chave_ordem)
+    desconhecidos = [j for j in selecionados if j not in jobs]
+    if desconhecidos:
+        print(f"❌ Jobs não encontrados: {', '.join(desconhecidos)} (disponíveis: {', '.join(sorted(jobs, key=_chave_ordem))})")
+        return 2
+
+    executor = ExecutorJobs(
+        jobs,
+        limites=_pares(args.limite, int),
+        timeout_padrao_s=args.timeout,
+        timeouts=_pares(args.timeout_job, int),
+        perfilar=args.perfilar
+    )
+
+    print("=" * 80)
+    print(f"🚀 Executando {len(selecionados)} job(s) em paralelo - {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
+    print("=" * 80)
+
+    inicio = time.perf_counter()
+    resultados = executor.executar(selecionados)
+    total = time.perf_counter() - inicio
+
+    print("=" * 80)
+    print("RESUMO")
+    print("=" * 80)
+    for resultado in resultados:
+        job = jobs[resultado['job']]
+        status = "✅" if resultado['codigo'] == 0 else ("⏱️" if resultado['timeout'] else "❌")
+        print(f"  {status} {job['script'].name:<30} código {resultado['codigo']:>4} | {resultado['segundos']:>7.1f}s")
+    soma = sum(r['segundos'] for r in resultados)
+    print(f"Tempo total: {total:.1f}s (em sequência seriam ~{soma:.1f}s)")
+
+    despachar_digest()
+
+    return codigo_saida(resultados)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+# - Feed de alterações das pastas remotas (modo observação do Processo 2 e da validação)
+# 1. Um único canal exec na conexão SSH roda um script no servidor que manda, linha a linha:
+#    a listagem inicial de cada pasta e depois os eventos de criação, escrita, movimentação e
+#    remoção (inotifywait -m); sem inotifywait no servidor, um laço com `find` reenvia a listagem
+#    só quando o mtime de alguma pasta muda (senão manda só um sinal de vida);
+# 2. Uma thread consome o fluxo e mantém em memória, por pasta, nome -> (mtime, tamanho):
+#    contagens e idades dos arquivos parados ficam sempre atuais sem novas listagens;
+# 3. Protocolo (campos separados por TAB): M modo | D i caminho | S i nome mtime tamanho |
+#    P (fim de listagem) | H (sinal de vida) | E epoch eventos caminho/ nome.
+# O script termina sozinho quando o canal fecha (a próxima escrita dá SIGPIPE).
+#
+# Uso: python feed_remoto.py /pasta1 /pasta2 [--modo auto|inotify|find] [--intervalo 5]
+#      (conexão do SFTP_HOST_2 do .env)
+
+import sys
+import time
+import shlex
+import argparse
+import threading
+
+
+MODOS = ("auto", "inotify", "find")
+
+_EVENTOS_CHEGADA = {"CREATE", "CLOSE_WRITE", "MOVED_TO"}
+_EVENTOS_SAIDA = {"DELETE", "MOVED_FROM"}
+
+
+def montar_script(pastas: list, intervalo_s: float = 5.0, modo: str = "auto") -> str:
+    """Script sh do servidor: listagem inicial + eventos do inotifywait, ou laço de `find`"""
+    pastas_sh = " ".join(shlex.quote(p) for p in pastas)
+    declarar = "\n".join(f"printf 'D\\t{i}\\t%s\\n' {shlex.quote(p)}" for i, p in enumerate(pastas))
+    listar = "\n".join(
+        f"  find {shlex.quote(p)} -maxdepth 1 -type f -printf 'S\\t{i}\\t%f\\t%T@\\t%s\\n' 2>/dev/null"
+        for i, p in enumerate(pastas)
+    )
+    vida = max(1, int(intervalo_s * 6))
+    usar_inotify = "false" if modo == "find" else "command -v inotifywait >/dev/null 2>&1"
+    return f"""T=$(printf '\\t')
+listar() {{
+{listar}
+  echo P
+}}
+{declarar}
+if {usar_inotify}; then
+  echo 'M inotify'
+  d=$(mktemp -d) && mkfifo "$d/f" || exit 1
+  inotifywait -m -e create,close_write,moved_to,delete,moved_from --timefmt %s \\
+    --format "E$T%T$T%e$T%w$T%f" {pastas_sh} >"$d/f" 2>"$d/e" &
+  p=$!
+  # Sinal de vida pela mesma fila: com o cliente desconectado, o `cat` morre por SIGPIPE em até
+  # {vida}s mesmo sem eventos; com o inotifywait morto, a fila fecha e o feed termina
+  while kill -0 $p 2>/dev/null; do echo H; sleep {vida}; done >"$d/f" &
+  h=$!
+  trap 'kill $p $h 2>/dev/null; rm -rf "$d"' EXIT HUP INT TERM
+  exec 3<"$d/f"
+  n=0
+  until grep -q established "$d/e" 2>/dev/null || [ $n -ge 100 ]; do sleep 0.1; n=$((n + 1)); done
+  listar
+  cat <&3
+  cat "$d/e" >&2
+else
+  echo 'M find'
+  anterior=
+  while :; do
+    atual=$(stat -c %Y {pastas_sh} 2>/dev/null | tr '\\n' ' ')
+    agora=$(date +%s)
+    recente=0
+    for m in $atual; do [ $((agora - m)) -lt 3 ] && recente=1; done
+    if [ "$atual" != "$anterior" ] || [ $recente = 1 ]; then listar; anterior=$atual; else echo H; fi
+    sleep {intervalo_s:g}
+  done
+fi
+"""
+
+
+class FeedPastasRemotas:
+    """Visão em memória das pastas remotas, atualizada por um canal exec de longa duração"""
+
+    def __init__(self, ssh, pastas: list, intervalo_s: float = 5.0, modo: str = "auto"):
+        self.pastas = list(pastas)
+        self.modo = None
+        self.versao = 0
+        self.listagens = 0
+        self.eventos = 0
+        self.atualizado_em = None
+        self.erro = None
+        self._visao = {p: {} for p in self.pastas}
+        self._indices = {}
+        self._parcial = {}
+        self._pronto = threading.Event()
+        self._mudou = threading.Condition()
+
+        self._canal = ssh.get_transport().open_session()
+        self._canal.exec_command(montar_script(self.pastas, intervalo_s, modo))
+        self._leitor = threading.Thread(target=self._consumir, daemon=True)
+        self._leitor.start()
+
+    @property
+    def vivo(self) -> bool:
+        return self._leitor.is_alive()
+
+    def fechar(self):
+        """Fecha o canal (o script no servidor recebe EOF/SIGPIPE e termina)"""
+        self._canal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def aguardar(self, timeout_s: float = 60) -> bool:
+        """Espera a listagem inicial; False se não chegou no tempo ou se o canal caiu antes"""
+        limite = time.monotonic() + timeout_s
+        while not self._pronto.wait(0.1):
+            if not self.vivo or time.monotonic() > limite:
+                return False
+        return True
+
+    def esperar_mudanca(self, versao: int, timeout_s: float) -> int:
+        """Bloqueia até a visão mudar depois de `versao` (ou timeout); devolve a versão atual"""
+        with self._mudou:
+            self._mudou.wait_for(lambda: self.versao != versao or not self.vivo, timeout_s)
+            return self.versao
+
+    def arquivos(self, pasta: str) -> dict:
+        """nome -> (mtime, tamanho em bytes ou None) da pasta"""
+        with self._mudou:
+            return dict(self._visao[pasta])
+
+    def contagem(self, pasta: str) -> int:
+        with self._mudou:
+            return len(self._visao[pasta])
+
+    def parados(self, pasta: str, idade_s: float, agora: float = None) -> list:
+        """Nomes com mtime há mais de idade_s segundos, do mais antigo para o mais novo"""
+        limite = (agora or time.time()) - idade_s
+        with self._mudou:
+            itens = [(m, n) for n, (m, _) in self._visao[pasta].items() if m < limite]
+        return [n for _, n in sorted(itens)]
+
+    def _consumir(self):
+        arquivo = self._canal.makefile("rb")
+        try:
+            for bruta in arquivo:
+                self._aplicar(bruta.decode("utf-8", errors="replace").rstrip("\r\n").split("\t"))
+        except Exception as e:
+            self.erro = e
+        finally:
+            if self.erro is None and self._canal.recv_stderr_ready():
+                self.erro = self._canal.recv_stderr(4096).decode("utf-8", errors="replace").strip() or None
+            with self._mudou:
+                self._mudou.notify_all()
+
+    def _aplicar(self, campos: list):
+        tipo = campos[0]
+        if tipo == "S" and len(campos) == 5:
+            i = int(campos[1])
+            self._parcial.setdefault(i, {})[campos[2]] = (float(campos[3]), int(campos[4]))
+        elif tipo == "E" and len(campos) == 5:
+            i = self._indices.get(campos[3].rstrip("/"))
+            eventos = set(campos[2].split(","))
+            if i is None or "ISDIR" in eventos or not campos[4]:
+                return
+            with self._mudou:
+                pasta = self._visao[self.pastas[i]]
+                if eventos & _EVENTOS_CHEGADA:
+                    anterior = pasta.get(campos[4])
+                    tamanho = anterior[1] if anterior and "CREATE" not in eventos else None
+                    pasta[campos[4]] = (float(campos[1]), tamanho)
+                elif eventos & _EVENTOS_SAIDA:
+                    pasta.pop(campos[4], None)
+                self.eventos += 1
+                self.versao += 1
+                self.atualizado_em = time.time()
+                self._mudou.notify_all()
+        elif tipo == "P":
+            with self._mudou:
+                novas = {self.pastas[i]: self._parcial.get(i, {}) for i in range(len(self.pastas))}
+                if novas != self._visao:
+                    self._visao = novas
+                    self.versao += 1
+                self._parcial = {}
+                self.listagens += 1
+                self.atualizado_em = time.time()
+                self._mudou.notify_all()
+            self._pronto.set()
+        elif tipo == "H":
+            self.atualizado_em = time.time()
+        elif tipo == "D" and len(campos) == 3:
+            self._indices[campos[2].rstrip("/")] = int(campos[1])
+        elif tipo.startswith("M "):
+            self.modo = tipo[2:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Acompanha pastas do SFTP por um canal exec")
+    parser.add_argument("pastas", nargs="+")
+    parser.add_argument("--modo", choices=MODOS, default="auto")
+    parser.add_argument("--intervalo", type=float, default=5.0, help="Segundos entre checagens no modo find")
+    args = parser.parse_args()
+
+    from configuracao import carregar_configuracao_ou_sair
+    import paramiko
+
+    config = carregar_configuracao_ou_sair()
+    ssh = paramiko.SSHClient()
+    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    ssh.connect(hostname=config.sftp2_host, port=config.sftp2_port,
+                username=config.sftp2_user, password=config.sftp2_pass, timeout=10)
+
+    with FeedPastasRemotas(ssh, args.pastas, args.intervalo, args.modo) as feed:
+        if not feed.aguardar():
+            print(f"❌ Feed não iniciou: {feed.erro or 'sem resposta'}")
+            return 1
+        print(f"👀 Feed ativo ({feed.modo})")
+        versao = None
+        try:
+            while feed.vivo:
+                versao = feed.esperar_mudanca(versao, 60)
+                print(f"{time.strftime('%H:%M:%S')} " + " | ".join(
+                    f"{p.rstrip('/').split('/')[-1]}: {feed.contagem(p)}" for p in feed.pastas))
+        except KeyboardInterrupt:
+            pass
+    ssh.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,466 @@
+# - Gravação e reprodução do tráfego de rede dos processos
+# 1. RPA_GRAVAR=<arquivo.zip>: as conexões reais (FTP do Processo 1, SSH/SFTP do Processo 2,
+#    export do GA dos Processos 5/6) passam por um envoltório que registra cada resposta
+#    (LIST/MLSD, SIZE/MDTM, RETR em blocos, listdir/stat) com o tempo que o servidor levou;
+# 2. O arquivo é um zip compacto: eventos.jsonl (uma linha por chamada) + dados/<sha256>
+#    com o conteúdo baixado (deduplicado); é gravado ao fim do processo;
+# 3. RPA_REPRODUZIR=<arquivo.zip>: nenhuma conexão é aberta; os mesmos métodos dos processos
+#    recebem as respostas gravadas, na ordem gravada para cada chamada (canal, operação, argumentos);
+# 4. RPA_REPRODUZIR_VELOCIDADE=gravada (padrão, dorme o tempo gravado de cada chamada),
+#    maxima (sem esperas) ou um fator (ex.: 4 = quatro vezes mais rápido);
+# 5. Sem nenhuma das variáveis, conexao_ftp/conexao_ssh só chamam a função de conexão.
+#
+# Uso: python gravacao_rede.py <arquivo.zip>      (resumo da gravação)
+
+import os
+import sys
+import json
+import time
+import atexit
+import ftplib
+import hashlib
+import zipfile
+import argparse
+import threading
+from collections import defaultdict, deque
+
+
+NOME_EVENTOS = "eventos.jsonl"
+PASTA_DADOS = "dados/"
+
+_ERROS_CONHECIDOS = {
+    cls.__name__: cls for cls in (
+        OSError, IOError, FileNotFoundError, PermissionError, EOFError, TimeoutError,
+        ConnectionError, ftplib.error_perm, ftplib.error_temp, ftplib.error_reply, ftplib.error_proto,
+    )
+}
+
+
+class AtributosGravados:
+    """Resultado de stat/listdir_attr reproduzido (mesmos campos usados do SFTPAttributes)"""
+
+    __slots__ = ("filename", "st_mode", "st_size", "st_mtime", "st_atime", "st_uid", "st_gid")
+
+    CAMPOS = ("st_mode", "st_size", "st_mtime", "st_atime", "st_uid", "st_gid")
+
+    def __init__(self, valores: list, filename: str = None):
+        self.filename = filename
+        for campo, valor in zip(self.CAMPOS, valores):
+            setattr(self, campo, valor)
+
+    @classmethod
+    def serializar(cls, attrs) -> list:
+        return [getattr(attrs, campo, None) for campo in cls.CAMPOS]
+
+
+def _erro_serializado(e: Exception) -> list:
+    return [type(e).__name__, *[str(a) for a in e.args]]
+
+
+def _recriar_erro(erro: list) -> Exception:
+    tipo, *args = erro
+    return _ERROS_CONHECIDOS.get(tipo, OSError)(*args)
+
+
+class SessaoRede:
+    """Gravação ou reprodução de todas as conexões do processo atual"""
+
+    def __init__(self, caminho: str, modo: str, velocidade: str = "gravada"):
+        self.caminho = caminho
+        self.modo = modo
+        self.fator = self._fator(velocidade)
+        self.eventos = []
+        self.dados = {}
+        self._filas = defaultdict(deque)
+        self._trava = threading.Lock()
+        self._inicio = time.perf_counter()
+        self._salvos = 0
+
+        if modo == "reproduzir":
+            self._carregar()
+        else:
+            atexit.register(self.salvar)
+
+    @staticmethod
+    def _fator(velocidade: str) -> float:
+        """0 = sem esperas; 1 = tempo gravado; N = N vezes mais rápido"""
+        velocidade = (velocidade or "gravada").strip().lower()
+        if velocidade in ("maxima", "máxima", "0"):
+            return 0.0
+        if velocidade == "gravada":
+            return 1.0
+        return 1.0 / float(velocidade)
+
+    @property
+    def reproduzindo(self) -> bool:
+        return self.modo == "reproduzir"
+
+    # --- gravação ---
+
+    def registrar(self, canal: str, operacao: str, args: list, duracao: float, **campos):
+        evento = {
+            'canal': canal, 'op': operacao, 'args': args,
+            't': round(time.perf_counter() - self._inicio - duracao, 6), 'dur': round(duracao, 6),
+            **campos
+        }
+        with self._trava:
+            self.eventos.append(evento)
+
+    def guardar_dados(self, conteudo: bytes) -> str:
+        sha = hashlib.sha256(conteudo).hexdigest()
+        with self._trava:
+            self.dados.setdefault(sha, conteudo)
+        return sha
+
+    def gravar_chamada(self, canal: str, operacao: str, args: list, funcao, serializar=lambda r: r):
+        """Executa a chamada real e registra resultado (ou erro) e duração"""
+        inicio = time.perf_counter()
+        try:
+            resultado = funcao()
+        except Exception as e:
+            self.registrar(canal, operacao, args, time.perf_counter() - inicio, erro=_erro_serializado(e))
+            raise
+        self.registrar(canal, operacao, args, time.perf_counter() - inicio, resultado=serializar(resultado))
+        return resultado
+
+    def salvar(self):
+        """Grava o zip (eventos + conteúdos) de forma atômica"""
+        if self.reproduzindo or len(self.eventos) == self._salvos:
+            return
+        temporario = f"{self.caminho}.tmp"
+        with self._trava:
+            with zipfile.ZipFile(temporario, "w", compression=zipfile.ZIP_DEFLATED) as arquivo:
+                arquivo.writestr(NOME_EVENTOS, "\n".join(json.dumps(e, ensure_ascii=False) for e in self.eventos))
+                for sha, conteudo in self.dados.items():
+                    arquivo.writestr(PASTA_DADOS + sha, conteudo)
+            os.replace(temporario, self.caminho)
+            self._salvos = len(self.eventos)
+        print(f"📼 Tráfego gravado em {self.caminho} ({len(self.eventos)} chamada(s), {len(self.dados)} arquivo(s))")
+
+    # --- reprodução ---
+
+    def _carregar(self):
+        with zipfile.ZipFile(self.caminho) as arquivo:
+            linhas = arquivo.read(NOME_EVENTOS).decode("utf-8").splitlines()
+            self.eventos = [json.loads(linha) for linha in linhas if linha]
+            self.dados = {
+                nome[len(PASTA_DADOS):]: arquivo.read(nome)
+                for nome in arquivo.namelist() if nome.startswith(PASTA_DADOS)
+            }
+        for evento in self.eventos:
+            self._filas[self._chave(evento['canal'], evento['op'], evento['args'])].append(evento)
+        print(f"📼 Reproduzindo {self.caminho} ({len(self.eventos)} chamada(s), fator de tempo {self.fator:g})")
+
+    @staticmethod
+    def _chave(canal: str, operacao: str, args: list) -> str:
+        return json.dumps([canal, operacao, args], ensure_ascii=False)
+
+    def esperar(self, segundos: float):
+        if self.fator and segundos > 0:
+            time.sleep(segundos * self.fator)
+
+    def proximo(self, canal: str, operacao: str, args: list) -> dict:
+        """Próximo evento gravado para a chamada; espera a duração gravada; relança o erro gravado"""
+        chave = self._chave(canal, operacao, args)
+        with self._trava:
+            fila = self._filas.get(chave)
+            evento = fila.popleft() if fila else None
+        if evento is None:
+            raise LookupError(f"Chamada não encontrada na gravação: {chave}")
+        if 'timeline' not in evento:
+            self.esperar(evento['dur'])
+        if 'erro' in evento:
+            raise _recriar_erro(evento['erro'])
+        return evento
+
+
+class FTPGravador:
+    """Envolve uma conexão ftplib.FTP real registrando as respostas"""
+
+    def __init__(self, ftp, sessao: SessaoRede, canal: str):
+        self._ftp = ftp
+        self._sessao = sessao
+        self._canal = canal
+
+    def __getattr__(self, nome):
+        return getattr(self._ftp, nome)
+
+    def retrlines(self, cmd, callback=None):
+        linhas = []
+        callback = callback or print
+
+        def coletar(linha):
+            linhas.append(linha)
+            callback(linha)
+
+        return self._sessao.gravar_chamada(
+            self._canal, "retrlines", [cmd], lambda: self._ftp.retrlines(cmd, coletar),
+            lambda resposta: {'resposta': resposta, 'linhas': linhas}
+        )
+
+    def retrbinary(self, cmd, callback, blocksize=8192, rest=None):
+        blocos = []
+        partes = []
+        inicio = time.perf_counter()
+
+        def coletar(bloco):
+            partes.append(bloco)
+            blocos.append([round(time.perf_counter() - inicio, 6), len(bloco)])
+            callback(bloco)
+
+        try:
+            resposta = self._ftp.retrbinary(cmd, coletar, blocksize=blocksize, rest=rest)
+            erro = None
+        except Exception as e:
+            resposta, erro = None, e
+        campos = {'timeline': blocos, 'dados': self._sessao.guardar_dados(b"".join(partes))}
+        if erro is not None:
+            campos['erro'] = _erro_serializado(erro)
+        else:
+            campos['resultado'] = resposta
+        self._sessao.registrar(self._canal, "retrbinary", [cmd, rest], time.perf_counter() - inicio, **campos)
+        if erro is not None:
+            raise erro
+        return resposta
+
+    def voidcmd(self, cmd):
+        return self._sessao.gravar_chamada(self._canal, "voidcmd", [cmd], lambda: self._ftp.voidcmd(cmd))
+
+    def sendcmd(self, cmd):
+        return self._sessao.gravar_chamada(self._canal, "sendcmd", [cmd], lambda: self._ftp.sendcmd(cmd))
+
+    def size(self, nome):
+        return self._sessao.gravar_chamada(self._canal, "size", [nome], lambda: self._ftp.size(nome))
+
+
+class FTPReproducao:
+    """Mesma interface usada do ftplib.FTP, respondida pela gravação"""
+
+    def __init__(self, sessao: SessaoRede, canal: str):
+        self._sessao = sessao
+        self._canal = canal
+
+    def retrlines(self, cmd, callback=None):
+        evento = self._sessao.proximo(self._canal, "retrlines", [cmd])
+        callback = callback or print
+        for linha in evento['resultado']['linhas']:
+            callback(linha)
+        return evento['resultado']['resposta']
+
+    def retrbinary(self, cmd, callback, blocksize=8192, rest=None):
+        evento = self._sessao.proximo(self._canal, "retrbinary", [cmd, rest])
+        conteudo = self._sessao.dados[evento['dados']]
+        inicio = time.perf_counter()
+        posicao = 0
+        for instante, tamanho in evento['timeline']:
+            if self._sessao.fator:
+                self._sessao.esperar(instante - (time.perf_counter() - inicio) / self._sessao.fator)
+            callback(conteudo[posicao:posicao + tamanho])
+            posicao += tamanho
+        if 'erro' in evento:
+            raise _recriar_erro(evento['erro'])
+        return evento['resultado']
+
+    def voidcmd(self, cmd):
+        return self._sessao.proximo(self._canal, "voidcmd", [cmd])['resultado']
+
+    def sendcmd(self, cmd):
+        return self._sessao.proximo(self._canal, "sendcmd", [cmd])['resultado']
+
+    def size(self, nome):
+        return self._sessao.proximo(self._canal, "size", [nome])['resultado']
+
+    def quit(self):
+        return "221 Goodbye."
+
+    def close(self):
+        pass
+
+
+def _serializar_listagem(itens) -> list:
+    return [[a.filename, AtributosGravados.serializar(a)] for a in itens]
+
+
+class SFTPGravador:
+    """Envolve um paramiko.SFTPClient registrando listagens e stats"""
+
+    def __init__(self, sftp, sessao: SessaoRede, canal: str):
+        self._sftp = sftp
+        self._sessao = sessao
+        self._canal = canal
+
+    def __getattr__(self, nome):
+        return getattr(self._sftp, nome)
+
+    def listdir(self, caminho="."):
+        return self._sessao.gravar_chamada(self._canal, "listdir", [caminho], lambda: self._sftp.listdir(caminho))
+
+    def listdir_attr(self, caminho="."):
+        return self._sessao.gravar_chamada(
+            self._canal, "listdir_attr", [caminho], lambda: self._sftp.listdir_attr(caminho), _serializar_listagem
+        )
+
+    def stat(self, caminho):
+        return self._sessao.gravar_chamada(
+            self._canal, "stat", [caminho], lambda: self._sftp.stat(caminho), AtributosGravados.serializar
+        )
+
+    def lstat(self, caminho):
+        return self._sessao.gravar_chamada(
+            self._canal, "lstat", [caminho], lambda: self._sftp.lstat(caminho), AtributosGravados.serializar
+        )
+
+
+class SFTPReproducao:
+    """Mesma interface usada do paramiko.SFTPClient, respondida pela gravação"""
+
+    def __init__(self, sessao: SessaoRede, canal: str):
+        self._sessao = sessao
+        self._canal = canal
+
+    def listdir(self, caminho="."):
+        return list(self._sessao.proximo(self._canal, "listdir", [caminho])['resultado'])
+
+    def listdir_attr(self, caminho="."):
+        itens = self._sessao.proximo(self._canal, "listdir_attr", [caminho])['resultado']
+        return [AtributosGravados(valores, nome) for nome, valores in itens]
+
+    def stat(self, caminho):
+        return AtributosGravados(self._sessao.proximo(self._canal, "stat", [caminho])['resultado'])
+
+    def lstat(self, caminho):
+        return AtributosGravados(self._sessao.proximo(self._canal, "lstat", [caminho])['resultado'])
+
+    def close(self):
+        pass
+
+
+class SSHGravador:
+    """Envolve um paramiko.SSHClient: cada open_sftp() devolve um SFTPGravador"""
+
+    def __init__(self, ssh, sessao: SessaoRede, canal: str):
+        self._ssh = ssh
+        self._sessao = sessao
+        self._canal = canal
+
+    def __getattr__(self, nome):
+        return getattr(self._ssh, nome)
+
+    def open_sftp(self):
+        sftp = self._sessao.gravar_chamada(self._canal, "open_sftp", [], self._ssh.open_sftp, lambda _: None)
+        return SFTPGravador(sftp, self._sessao, self._canal)
+
+
+class SSHReproducao:
+    def __init__(self, sessao: SessaoRede, canal: str):
+        self._sessao = sessao
+        self._canal = canal
+
+    def open_sftp(self):
+        self._sessao.proximo(self._canal, "open_sftp", [])
+        return SFTPReproducao(self._sessao, self._canal)
+
+    def close(self):
+        pass
+
+
+_sessao = None
+_trava_sessao = threading.Lock()
+
+
+def sessao_rede():
+    """Sessão de gravação/reprodução configurada no ambiente (None quando desligada)"""
+    global _sessao
+    with _trava_sessao:
+        if _sessao is None:
+            if os.getenv("RPA_REPRODUZIR"):
+                _sessao = SessaoRede(os.environ["RPA_REPRODUZIR"], "reproduzir",
+                                     os.getenv("RPA_REPRODUZIR_VELOCIDADE", "gravada"))
+            elif os.getenv("RPA_GRAVAR"):
+                _sessao = SessaoRede(os.environ["RPA_GRAVAR"], "gravar")
+        return _sessao
+
+
+def em_reproducao() -> bool:
+    sessao = sessao_rede()
+    return sessao is not None and sessao.reproduzindo
+
+
+def _conexao(canal: str, conectar, gravador, reproducao):
+    sessao = sessao_rede()
+    if sessao is None:
+        return conectar()
+    if sessao.reproduzindo:
+        sessao.proximo(canal, "conectar", [])
+        return reproducao(sessao, canal)
+    conexao = sessao.gravar_chamada(canal, "conectar", [], conectar, lambda _: None)
+    return gravador(conexao, sessao, canal) if conexao is not None else None
+
+
+def conexao_ftp(canal: str, conectar):
+    """conectar() (função que devolve um ftplib.FTP logado) passando pela gravação/reprodução"""
+    return _conexao(canal, conectar, FTPGravador, FTPReproducao)
+
+
+def conexao_ssh(canal: str, conectar):
+    """conectar() (função que devolve um paramiko.SSHClient conectado) passando pela gravação/reprodução"""
+    return _conexao(canal, conectar, SSHGravador, SSHReproducao)
+
+
+def registrar_arquivo(canal: str, caminho: str, segundos: float):
+    """Grava um arquivo obtido por um meio não interceptável (download do navegador) e quanto levou"""
+    sessao = sessao_rede()
+    if sessao is None or sessao.reproduzindo:
+        return
+    with open(caminho, "rb") as f:
+        sha = sessao.guardar_dados(f.read())
+    sessao.registrar(canal, "arquivo", [], segundos, resultado=os.path.basename(caminho), dados=sha)
+
+
+def reproduzir_arquivo(canal: str, pasta_destino: str) -> str:
+    """Espera o tempo gravado e recria o arquivo gravado em pasta_destino; retorna o caminho"""
+    sessao = sessao_rede()
+    evento = sessao.proximo(canal, "arquivo", [])
+    os.makedirs(pasta_destino, exist_ok=True)
+    caminho = os.path.join(pasta_destino, evento['resultado'])
+    with open(caminho, "wb") as f:
+        f.write(sessao.dados[evento['dados']])
+    return caminho
+
+
+def resumo(caminho: str) -> dict:
+    """Chamadas, tempo gravado e bytes por canal/operação"""
+    with zipfile.ZipFile(caminho) as arquivo:
+        eventos = [json.loads(linha) for linha in arquivo.read(NOME_EVENTOS).decode("utf-8").splitlines() if linha]
+        tamanhos = {i.filename[len(PASTA_DADOS):]: i.file_size for i in arquivo.infolist()
+                    if i.filename.startswith(PASTA_DADOS)}
+    agregado = defaultdict(lambda: {'chamadas': 0, 'segundos': 0.0, 'bytes': 0, 'erros': 0})
+    for evento in eventos:
+        item = agregado[(evento['canal'], evento['op'])]
+        item['chamadas'] += 1
+        item['segundos'] += evento['dur']
+        item['erros'] += 'erro' in evento
+        if 'timeline' in evento:
+            item['bytes'] += sum(tamanho for _, tamanho in evento['timeline'])
+        elif 'dados' in evento:
+            item['bytes'] += tamanhos.get(evento['dados'], 0)
+    return dict(agregado)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumo de uma gravação de tráfego (RPA_GRAVAR)")
+    parser.add_argument("arquivo")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"GRAVAÇÃO {args.arquivo} ({os.path.getsize(args.arquivo) / 1024:.1f} KB)")
+    print("=" * 80)
+    for (canal, operacao), item in sorted(resumo(args.arquivo).items()):
+        print(f"  {canal:<28} {operacao:<13} {item['chamadas']:>7} chamada(s) "
+              f"{item['segundos']:>9.3f}s {item['bytes'] / 1024:>10.1f} KB  erros: {item['erros']}")
+    print("=" * 80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+# - Histórico de chegada dos arquivos (Processos 3 e 4)
+# 1. Guarda, por regra (processo + horário da execução) e dia, o arquivo que confirmou a janela
+#    com o mtime e o tamanho;
+# 2. Com o dia já confirmado, as próximas execuções só conferem esse arquivo com um stat, sem
+#    varrer a pasta de novo;
+# 3. Dos últimos dias aprende o horário típico de chegada de cada regra (mediana e desvio) e
+#    calcula quando checar de novo: mais perto do horário típico, checagens mais frequentes.
+#
+# Uso: python historico_chegadas.py [--dias 30] [--banco caminho.sqlite3]
+
+import os
+import sys
+import sqlite3
+import argparse
+import statistics
+from datetime import date, datetime, timedelta
+
+
+NOME_BANCO = "historico_chegadas.sqlite3"
+
+# Sem histórico, considera a chegada espalhada em ±10 min do horário esperado
+DESVIO_PADRAO_S = 600
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS chegadas (
+    regra         TEXT    NOT NULL,
+    dia           TEXT    NOT NULL,
+    arquivo       TEXT    NOT NULL,
+    mtime         REAL    NOT NULL,
+    tamanho       INTEGER NOT NULL,
+    confirmado_em TEXT    NOT NULL,
+    PRIMARY KEY (regra, dia)
+) WITHOUT ROWID;
+"""
+
+
+class HistoricoChegadas:
+    """Chegadas confirmadas por regra e dia (SQLite), com o horário típico de cada regra"""
+
+    def __init__(self, caminho_banco: str):
+        self.caminho_banco = caminho_banco
+        self.conn = sqlite3.connect(caminho_banco, timeout=30)
+        self.conn.executescript(_ESQUEMA)
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.conn.close()
+
+    def registrar(self, regra: str, arquivo: str, mtime: float, tamanho: int, dia: date = None):
+        """Marca a regra como satisfeita no dia pelo arquivo (substitui a confirmação anterior do dia)"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO chegadas (regra, dia, arquivo, mtime, tamanho, confirmado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (regra, (dia or date.today()).isoformat(), arquivo, mtime, int(tamanho),
+                 datetime.now().isoformat(timespec="seconds"))
+            )
+
+    def esquecer(self, regra: str, dia: date = None):
+        """Remove a confirmação do dia (o arquivo sumiu ou mudou): a próxima execução varre a pasta"""
+        with self.conn:
+            self.conn.execute("DELETE FROM chegadas WHERE regra = ? AND dia = ?",
+                              (regra, (dia or date.today()).isoformat()))
+
+    def confirmado(self, regra: str, dia: date = None) -> tuple:
+        """(arquivo, mtime, tamanho) que confirmou a regra no dia, ou None"""
+        return self.conn.execute(
+            "SELECT arquivo, mtime, tamanho FROM chegadas WHERE regra = ? AND dia = ?",
+            (regra, (dia or date.today()).isoformat())
+        ).fetchone()
+
+    def horario_tipico(self, regra: str, dias: int = 30, ate: date = None) -> tuple:
+        """
+        (mediana, desvio, amostras) do horário de chegada em segundos desde a meia-noite
+        - desvio: MAD escalado (robusto a um dia atípico), no mínimo 60s
+        - None se a regra não tem chegadas nos últimos N dias
+        """
+        fim = ate or date.today()
+        inicio = fim - timedelta(days=dias)
+
+        mtimes = [m for (m,) in self.conn.execute(
+            "SELECT mtime FROM chegadas WHERE regra = ? AND dia BETWEEN ? AND ?",
+            (regra, inicio.isoformat(), fim.isoformat())
+        )]
+        if not mtimes:
+            return None
+
+        segundos = []
+        for m in mtimes:
+            dt = datetime.fromtimestamp(m)
+            segundos.append(dt.hour * 3600 + dt.minute * 60 + dt.second)
+        mediana = statistics.median(segundos)
+        desvio = statistics.median(abs(s - mediana) for s in segundos) * 1.4826
+        return mediana, max(60.0, desvio), len(segundos)
+
+    def proxima_checagem(self, regra: str, agora: datetime, esperado: datetime,
+                         intervalo_min_s: float = 60, intervalo_max_s: float = 1800) -> float:
+        """
+        Segundos até a próxima checagem da regra
+        - Dentro da faixa típica de chegada (mediana ± desvio): intervalo_min_s
+        - Fora dela: um quarto da distância até a faixa, limitado a intervalo_max_s
+        - Sem histórico, a faixa é o horário esperado ± 10 min
+        """
+        tipico = self.horario_tipico(regra, ate=agora.date())
+        if tipico is None:
+            centro, desvio = esperado, DESVIO_PADRAO_S
+        else:
+            mediana, desvio, _ = tipico
+            centro = datetime.combine(agora.date(), datetime.min.time()) + timedelta(seconds=mediana)
+
+        distancia = abs((agora - centro).total_seconds()) - desvio
+        return min(intervalo_max_s, max(intervalo_min_s, distancia / 4))
+
+    def regras(self) -> list:
+        return [r for (r,) in self.conn.execute("SELECT DISTINCT regra FROM chegadas ORDER BY regra")]
+
+
+def _hhmm(segundos: float) -> str:
+    segundos = int(segundos)
+    return f"{segundos // 3600:02d}:{segundos % 3600 // 60:02d}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Horário típico de chegada dos arquivos por regra")
+    parser.add_argument("--dias", type=int, default=30)
+    parser.add_argument("--banco", default=None, help=f"Caminho do banco (padrão: PASTA_LOGS/{NOME_BANCO})")
+    args = parser.parse_args()
+
+    caminho_banco = args.banco
+    if caminho_banco is None:
+        from configuracao import obter_configuracao, PASTA_PROJETO
+
+        caminho_banco = os.path.join(obter_configuracao().pasta_logs or PASTA_PROJETO, NOME_BANCO)
+
+    historico = HistoricoChegadas(caminho_banco)
+    try:
+        print("=" * 80)
+        for regra in historico.regras():
+            tipico = historico.horario_tipico(regra, args.dias)
+            hoje = historico.confirmado(regra)
+            situacao = f"✅ hoje: {os.path.basename(hoje[0])}" if hoje else "⏳ hoje: não confirmado"
+            if tipico is None:
+                print(f"  • {regra:<24} sem chegadas nos últimos {args.dias} dias | {situacao}")
+            else:
+                mediana, desvio, amostras = tipico
+                print(f"  • {regra:<24} típico {_hhmm(mediana)} ± {desvio / 60:.0f} min "
+                      f"({amostras} dia(s)) | {situacao}")
+        print("=" * 80)
+    finally:
+        historico.fechar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
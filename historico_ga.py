@@ -0,0 +1,138 @@
+# - Histórico das extrações do GA (Processos 5 e 6)
+# 1. Guarda, por cliente e dia, o total extraído e os agregados por arquivo/status;
+# 2. Armazena em um SQLite local (tabelas WITHOUT ROWID indexadas por cliente + dia);
+# 3. Responde consultas de tendência e dias zerados sem baixar o relatório de novo.
+#
+# Uso: python historico_ga.py <CLIENTE> [--dias 30] [--banco caminho.sqlite3]
+
+import os
+import sys
+import sqlite3
+import argparse
+from datetime import date, datetime, timedelta
+
+
+NOME_BANCO = "historico_ga.sqlite3"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS execucoes (
+    cliente      TEXT    NOT NULL,
+    dia          TEXT    NOT NULL,
+    executado_em TEXT    NOT NULL,
+    arquivo      TEXT,
+    total        INTEGER NOT NULL,
+    PRIMARY KEY (cliente, dia)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS grupos (
+    cliente TEXT    NOT NULL,
+    dia     TEXT    NOT NULL,
+    tipo    TEXT    NOT NULL,
+    chave   TEXT    NOT NULL,
+    soma    INTEGER NOT NULL,
+    PRIMARY KEY (cliente, dia, tipo, chave)
+) WITHOUT ROWID;
+"""
+
+
+class HistoricoGA:
+    """Série temporal compacta (SQLite) dos resultados de extração do GA"""
+
+    def __init__(self, caminho_banco: str):
+        self.caminho_banco = caminho_banco
+        self.conn = sqlite3.connect(caminho_banco)
+        self.conn.executescript(_ESQUEMA)
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.conn.close()
+
+    def registrar(self, cliente: str, resultado: dict, dia: date = None):
+        """
+        Registra o resultado de uma extração (substitui a execução anterior do mesmo dia)
+        - resultado: dict com 'total', 'arquivo', 'por_arquivo' e 'por_status'
+        """
+        dia_str = (dia or date.today()).isoformat()
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO execucoes (cliente, dia, executado_em, arquivo, total) VALUES (?, ?, ?, ?, ?)",
+                (cliente, dia_str, datetime.now().isoformat(timespec="seconds"),
+                 resultado.get('arquivo'), int(resultado['total']))
+            )
+            self.conn.execute("DELETE FROM grupos WHERE cliente = ? AND dia = ?", (cliente, dia_str))
+            self.conn.executemany(
+                "INSERT INTO grupos (cliente, dia, tipo, chave, soma) VALUES (?, ?, ?, ?, ?)",
+                [(cliente, dia_str, "arquivo", k, v) for k, v in resultado.get('por_arquivo', {}).items()] +
+                [(cliente, dia_str, "status", k, v) for k, v in resultado.get('por_status', {}).items()]
+            )
+
+    def tendencia(self, cliente: str, dias: int = 30, ate: date = None) -> list:
+        """Lista (dia, total) dos últimos N dias; dias sem execução vêm com total None"""
+        fim = ate or date.today()
+        inicio = fim - timedelta(days=dias - 1)
+
+        linhas = self.conn.execute(
+            "SELECT dia, total FROM execucoes WHERE cliente = ? AND dia BETWEEN ? AND ?",
+            (cliente, inicio.isoformat(), fim.isoformat())
+        ).fetchall()
+        totais = dict(linhas)
+
+        return [
+            ((inicio + timedelta(days=i)).isoformat(), totais.get((inicio + timedelta(days=i)).isoformat()))
+            for i in range(dias)
+        ]
+
+    def dias_zerados(self, cliente: str, dias: int = 30, ate: date = None) -> list:
+        """Dias dos últimos N em que a extração rodou e o total foi zero"""
+        return [dia for dia, total in self.tendencia(cliente, dias, ate) if total == 0]
+
+    def dias_sem_execucao(self, cliente: str, dias: int = 30, ate: date = None) -> list:
+        """Dias dos últimos N sem nenhuma extração registrada"""
+        return [dia for dia, total in self.tendencia(cliente, dias, ate) if total is None]
+
+    def grupos_do_dia(self, cliente: str, tipo: str, dia: date = None) -> dict:
+        """Agregados ('arquivo' ou 'status') de um dia, do maior para o menor"""
+        dia_str = (dia or date.today()).isoformat()
+        linhas = self.conn.execute(
+            "SELECT chave, soma FROM grupos WHERE cliente = ? AND dia = ? AND tipo = ? ORDER BY soma DESC",
+            (cliente, dia_str, tipo)
+        ).fetchall()
+        return dict(linhas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consulta o histórico de extrações do GA")
+    parser.add_argument("cliente", help="Processo pesquisado no GA (ex.: STONE)")
+    parser.add_argument("--dias", type=int, default=30)
+    parser.add_argument("--banco", default=os.path.join(os.getenv('PASTA_LOGS', '.'), NOME_BANCO))
+    args = parser.parse_args()
+
+    if not os.path.exists(args.banco):
+        print(f"❌ Banco de histórico não encontrado: {args.banco}")
+        return 1
+
+    historico = HistoricoGA(args.banco)
+    try:
+        print("=" * 80)
+        print(f"HISTÓRICO GA - {args.cliente} (últimos {args.dias} dias)")
+        print("=" * 80)
+
+        for dia, total in historico.tendencia(args.cliente, args.dias):
+            if total is None:
+                print(f"  {dia} | {'-':>10} | sem execução")
+            else:
+                marca = " ⚠️ zerado" if total == 0 else ""
+                print(f"  {dia} | {total:>10}{marca}")
+
+        zerados = historico.dias_zerados(args.cliente, args.dias)
+        print("=" * 80)
+        print(f"Dias zerados: {len(zerados)} | Dias sem execução: {len(historico.dias_sem_execucao(args.cliente, args.dias))}")
+    finally:
+        historico.fechar()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+# - Leitor de relatórios do GA (Processos 5 e 6)
+# 1. Abre o .xlsx exportado pelo GA direto como ZIP;
+# 2. Percorre o XML da primeira planilha em blocos, sem montar DataFrame;
+# 3. Converte apenas as colunas necessárias (ex.: D, E e G);
+# 4. Soma a coluna de valor das linhas que passam no filtro em uma única passada,
+#    já agrupando por arquivo (coluna D) e por status (coluna G).
+# Os atributos r="..." de <row>/<c> são opcionais no SpreadsheetML: sem eles (exports de outras
+# ferramentas) a planilha é lida por posição (iterparse), em vez de ser pulada em silêncio.
+
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import unescape
+
+
+NS_PLANILHA = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_RELACAO = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PACOTE = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+TAG_TEXTO = NS_PLANILHA + "t"
+TAG_SHARED = NS_PLANILHA + "si"
+TAG_LINHA = NS_PLANILHA + "row"
+TAG_CELULA = NS_PLANILHA + "c"
+TAG_VALOR = NS_PLANILHA + "v"
+
+TAMANHO_BLOCO = 4 * 1024 * 1024
+
+_RE_LETRAS = re.compile(r"[A-Z]+")
+_RE_INICIO_LINHA = re.compile(rb'<(?:\w+:)?row\b[^>]*?\br="(\d+)"[^>]*>')
+_RE_FIM_LINHA = re.compile(rb'</(?:\w+:)?row>|<(?:\w+:)?row\b[^>]*/>')
+_RE_REF_CELULA = re.compile(rb'<(?:\w+:)?c\b[^>]*?\br="([A-Z]+)\d+"')
+_RE_TIPO = re.compile(rb'\bt="(\w+)"')
+_RE_VALOR = re.compile(rb'<(?:\w+:)?v>([^<]*)</(?:\w+:)?v>')
+_RE_TEXTO = re.compile(rb'<(?:\w+:)?t(?:\s[^>]*)?>([^<]*)</(?:\w+:)?t>')
+_RE_TAG_LINHA = re.compile(rb'<(?:\w+:)?row\b([^>]*)>')
+_RE_TAG_CELULA = re.compile(rb'<(?:\w+:)?c\b([^>]*)>')
+_RE_ATRIBUTO_R = re.compile(rb'\sr="')
+
+
+def indice_coluna(referencia: str) -> int:
+    """Converte a referência da célula (ex.: 'D12') no índice 0-based da coluna"""
+    letras = _RE_LETRAS.match(referencia).group(0)
+    indice = 0
+    for letra in letras:
+        indice = indice * 26 + (ord(letra) - 64)
+    return indice - 1
+
+
+def letra_coluna(indice: int) -> str:
+    """Converte o índice 0-based da coluna na letra do Excel (3 -> 'D')"""
+    letras = ""
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def para_numero(valor):
+    """Converte o valor da célula em número (None se vazio ou não numérico)"""
+    if valor is None or isinstance(valor, (int, float)):
+        return valor
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+class LeitorPlanilhaGA:
+    """Leitor em streaming da primeira planilha de um .xlsx, restrito às colunas pedidas"""
+
+    def __init__(self, caminho_arquivo: str):
+        self.caminho_arquivo = caminho_arquivo
+        self.linhas = 0
+        self.colunas = 0
+
+    def _caminho_primeira_planilha(self, zf: zipfile.ZipFile) -> str:
+        """Resolve o caminho da primeira planilha via workbook.xml + rels"""
+        try:
+            with zf.open("xl/workbook.xml") as f:
+                rel_id = None
+                for _, elem in iterparse(f):
+                    if elem.tag == NS_PLANILHA + "sheet":
+                        rel_id = elem.get(NS_RELACAO + "id")
+                        break
+
+            with zf.open("xl/_rels/workbook.xml.rels") as f:
+                for _, elem in iterparse(f):
+                    if elem.tag == NS_PACOTE + "Relationship" and elem.get("Id") == rel_id:
+                        destino = elem.get("Target").lstrip("/")
+                        return destino if destino.startswith("xl/") else f"xl/{destino}"
+        except KeyError:
+            pass
+
+        return "xl/worksheets/sheet1.xml"
+
+    def _carregar_shared_strings(self, zf: zipfile.ZipFile) -> list:
+        """Carrega a tabela de strings compartilhadas (vazia se não existir)"""
+        strings = []
+        try:
+            f = zf.open("xl/sharedStrings.xml")
+        except KeyError:
+            return strings
+
+        with f:
+            for _, elem in iterparse(f):
+                if elem.tag == TAG_SHARED:
+                    strings.append("".join(t.text or "" for t in elem.iter(TAG_TEXTO)))
+                    elem.clear()
+        return strings
+
+    def _converter(self, atributos: bytes, valor: bytes, conteudo: bytes, shared: list):
+        """
+        Converte o conteúdo bruto de uma célula conforme o atributo t="..."
+        - valor: texto do <v> quando ele é o primeiro filho da célula
+        - conteudo: restante do XML da célula (fórmulas, inlineStr...)
+        """
+        m = _RE_TIPO.search(atributos) if b"t=" in atributos else None
+        tipo = m.group(1) if m else None
+
+        if tipo == b"inlineStr":
+            partes = _RE_TEXTO.findall(conteudo)
+            return unescape(b"".join(partes).decode("utf-8")) if partes else None
+
+        if not valor:
+            m = _RE_VALOR.search(conteudo)
+            if not m:
+                return None
+            valor = m.group(1)
+
+        if tipo == b"s":
+            return shared[int(valor)]
+        if tipo is None or tipo == b"n":
+            return float(valor)
+        if tipo == b"b":
+            return valor == b"1"
+        return unescape(valor.decode("utf-8"))
+
+    def _tem_referencias(self, zf: zipfile.ZipFile, caminho_planilha: str) -> bool:
+        """A primeira linha e a primeira célula da planilha trazem r="..."? (sem linhas: True)"""
+        with zf.open(caminho_planilha) as f:
+            buffer = b""
+            while True:
+                bloco = f.read(64 * 1024)
+                buffer += bloco
+                linha = _RE_TAG_LINHA.search(buffer)
+                celula = _RE_TAG_CELULA.search(buffer, linha.end()) if linha else None
+                if celula:
+                    return bool(_RE_ATRIBUTO_R.search(linha.group(1)) and _RE_ATRIBUTO_R.search(celula.group(1)))
+                if not bloco:
+                    return linha is None or bool(_RE_ATRIBUTO_R.search(linha.group(1)))
+
+    def _valor_elemento(self, celula, shared: list):
+        """Valor de uma célula já parseada (caminho posicional), conforme o atributo t"""
+        tipo = celula.get("t")
+        if tipo == "inlineStr":
+            partes = [t.text or "" for t in celula.iter(TAG_TEXTO)]
+            return "".join(partes) if partes else None
+
+        v = celula.find(TAG_VALOR)
+        if v is None or not v.text:
+            return None
+        if tipo == "s":
+            return shared[int(v.text)]
+        if tipo is None or tipo == "n":
+            return float(v.text)
+        if tipo == "b":
+            return v.text == "1"
+        return v.text
+
+    def _iterar_posicional(self, zf: zipfile.ZipFile, caminho_planilha: str, shared: list,
+                           colunas: tuple, pular_cabecalho: bool):
+        """
+        Caminho para planilhas sem r="..." nas linhas/células
+        - A coluna de cada célula é a anterior + 1 (ou a do r, quando a célula traz)
+        - Mesmo contrato do iterar(): só linhas com alguma das colunas pedidas são devolvidas
+        """
+        posicoes = {col: i for i, col in enumerate(colunas)}
+        primeira = True
+
+        with zf.open(caminho_planilha) as f:
+            for _, elem in iterparse(f):
+                if elem.tag != TAG_LINHA:
+                    continue
+
+                valores = [None] * len(colunas)
+                encontrou = False
+                coluna = -1
+                for celula in elem.iter(TAG_CELULA):
+                    ref = celula.get("r")
+                    coluna = indice_coluna(ref) if ref else coluna + 1
+                    i = posicoes.get(coluna)
+                    if i is not None:
+                        valores[i] = self._valor_elemento(celula, shared)
+                        encontrou = True
+                elem.clear()
+
+                if primeira:
+                    primeira = False
+                    self.colunas = coluna + 1
+                    if pular_cabecalho:
+                        continue
+                self.linhas += 1
+                if encontrou:
+                    yield tuple(valores)
+
+    def iterar(self, colunas: tuple, pular_cabecalho: bool = True):
+        """
+        Itera as linhas devolvendo uma tupla com os valores das colunas pedidas
+        - Colunas são índices 0-based (D=3, E=4, G=6)
+        - Células ausentes vêm como None
+        - Só as células das colunas pedidas são convertidas: a regex é montada
+          com as letras dessas colunas e o resto do XML é pulado pelo motor de regex
+        - Ao final, self.linhas (sem o cabeçalho, como o pd.read_excel) e
+          self.colunas (largura do cabeçalho) refletem o tamanho da planilha
+        """
+        letras = {letra_coluna(col).encode(): i for i, col in enumerate(colunas)}
+        re_celula = re.compile(
+            rb'<(?:\w+:)?c\b([^>]*?)\br="(' + b"|".join(letras) + rb')(\d+)"([^>]*?)'
+            rb'(?:/>|>(?:<(?:\w+:)?v>([^<]*)</(?:\w+:)?v>)?(.*?)</(?:\w+:)?c>)',
+            re.S
+        )
+        vazio = [None] * len(colunas)
+        self.linhas = 0
+        self.colunas = 0
+
+        with zipfile.ZipFile(self.caminho_arquivo) as zf:
+            shared = self._carregar_shared_strings(zf)
+            caminho_planilha = self._caminho_primeira_planilha(zf)
+
+            if not self._tem_referencias(zf, caminho_planilha):
+                yield from self._iterar_posicional(zf, caminho_planilha, shared, colunas, pular_cabecalho)
+                return
+
+            with zf.open(caminho_planilha) as f:
+                linha_cabecalho = None
+                linha_atual = None
+                valores = list(vazio)
+                resto = b""
+
+                while True:
+                    bloco = f.read(TAMANHO_BLOCO)
+                    buffer = resto + bloco
+
+                    if bloco:
+                        # Corta depois da última tag de linha para nunca partir uma célula ao meio
+                        corte = buffer.rfind(b"row>") + 4
+                        if corte < 4:
+                            resto = buffer
+                            continue
+                        buffer, resto = buffer[:corte], buffer[corte:]
+                    elif not buffer:
+                        break
+                    else:
+                        resto = b""
+
+                    if linha_cabecalho is None:
+                        m = _RE_INICIO_LINHA.search(buffer)
+                        if m:
+                            linha_cabecalho = m.group(1)
+                            fim = _RE_FIM_LINHA.search(buffer, m.end())
+                            trecho = buffer[m.end():fim.start() if fim else len(buffer)]
+                            refs = _RE_REF_CELULA.findall(trecho)
+                            if refs:
+                                self.colunas = max(indice_coluna(r.decode()) for r in refs) + 1
+
+                    self.linhas += len(_RE_FIM_LINHA.findall(buffer))
+
+                    for antes, letra, linha, depois, valor, conteudo in re_celula.findall(buffer):
+                        if linha != linha_atual:
+                            if linha_atual is not None and not (pular_cabecalho and linha_atual == linha_cabecalho):
+                                yield tuple(valores)
+                            linha_atual = linha
+                            valores = list(vazio)
+
+                        # Caminho rápido para os dois tipos que dominam o export: string compartilhada e número
+                        atributos = antes + depois
+                        if valor and b't="s"' in atributos:
+                            valores[letras[letra]] = shared[int(valor)]
+                        elif valor and b"t=" not in atributos:
+                            valores[letras[letra]] = float(valor)
+                        elif valor or conteudo:
+                            valores[letras[letra]] = self._converter(atributos, valor, conteudo, shared)
+
+                    if not bloco:
+                        break
+
+                if linha_atual is not None and not (pular_cabecalho and linha_atual == linha_cabecalho):
+                    yield tuple(valores)
+
+                if pular_cabecalho and linha_cabecalho is not None and self.linhas:
+                    self.linhas -= 1
+
+    def somar_filtrado(self, coluna_valor: int, colunas_filtro: tuple, filtro) -> int:
+        """
+        Soma a coluna de valor nas linhas em que filtro(*valores_filtro) é verdadeiro
+        - Uma única passada pelo XML, sem DataFrame intermediário
+        - Valores não numéricos/vazios são ignorados (como o sum() do pandas)
+        """
+        colunas = (coluna_valor,) + tuple(colunas_filtro)
+        total = 0
+        for valor, *valores_filtro in self.iterar(colunas):
+            if filtro(*valores_filtro):
+                numero = para_numero(valor)
+                if numero is not None:
+                    total += numero
+        return int(total)
+
+    def agregar(self, coluna_valor: int, colunas_filtro: tuple, filtro,
+                coluna_arquivo: int = 3, coluna_status: int = 6) -> dict:
+        """
+        Soma filtrada + agregados por grupo na mesma passada
+        - total: soma da coluna de valor nas linhas que passam no filtro
+        - por_arquivo: soma por nome de arquivo (somente linhas filtradas)
+        - por_status: soma por status (todas as linhas, para enxergar o que ficou de fora)
+        """
+        colunas = [coluna_valor, coluna_arquivo, coluna_status]
+        for col in colunas_filtro:
+            if col not in colunas:
+                colunas.append(col)
+        indices_filtro = [colunas.index(col) for col in colunas_filtro]
+
+        total = 0
+        por_arquivo = {}
+        por_status = {}
+
+        for valores in self.iterar(tuple(colunas)):
+            numero = para_numero(valores[0]) or 0
+            status = "" if valores[2] is None else str(valores[2])
+            por_status[status] = por_status.get(status, 0) + numero
+
+            if filtro(*[valores[i] for i in indices_filtro]):
+                total += numero
+                arquivo = "" if valores[1] is None else str(valores[1])
+                por_arquivo[arquivo] = por_arquivo.get(arquivo, 0) + numero
+
+        return {
+            'total': int(total),
+            'por_arquivo': {k: int(v) for k, v in por_arquivo.items()},
+            'por_status': {k: int(v) for k, v in por_status.items()}
+        }
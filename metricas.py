@@ -0,0 +1,258 @@
+# - Métricas de execução dos processos
+# 1. MetricasExecucao mede o tempo de cada fase (connect, list, stat, download, parse, notify, total)
+#    e conta round trips e bytes da execução;
+# 2. O decorador instrumentar(job) envolve o executar() de cada AutomacaoProcessoN: cria
+#    self.metricas, mede o total, registra sucesso/falha e exporta ao final, mesmo com exceção;
+#    medir_fase(nome) marca os métodos de cada fase (fases podem se sobrepor: stat dentro de list);
+#    com PERFILAR/--perfilar, o mesmo decorador roda o executar() sob cProfile (perfilamento.py);
+# 3. A exportação é um arquivo no formato texto do Prometheus (rpa_<job>.prom) em
+#    PASTA_METRICAS (ou PASTA_LOGS), pronto para o textfile collector do node_exporter;
+# 4. Opcionalmente, `python metricas.py --porta 9108` serve todos os .prom da pasta em /metrics.
+
+import os
+import re
+import sys
+import time
+import argparse
+import functools
+import threading
+from contextlib import contextmanager
+
+from perfilamento import perfilar_se_ativado
+
+
+PREFIXO_ARQUIVO = "rpa_"
+PORTA_PADRAO = 9108
+
+_RE_NOME_INVALIDO = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def _nome_metrica(nome: str) -> str:
+    return _RE_NOME_INVALIDO.sub("_", nome).lower()
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def pasta_metricas() -> str:
+    """PASTA_METRICAS do .env, senão PASTA_LOGS, senão a pasta do projeto"""
+    from configuracao import obter_configuracao, PASTA_PROJETO
+
+    config = obter_configuracao()
+    return config.pasta_metricas or config.pasta_logs or PASTA_PROJETO
+
+
+class MetricasExecucao:
+    """Tempos por fase e contadores (round trips, bytes) de uma execução de um job"""
+
+    def __init__(self, job: str):
+        self.job = _nome_metrica(job)
+        self.fases = {}
+        self.contadores = {}
+        self.sucesso = None
+        self.inicio = time.time()
+        self._trava = threading.Lock()
+
+    @contextmanager
+    def fase(self, nome: str):
+        """Mede o bloco e soma na fase (fases repetidas acumulam)"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.somar(nome, time.perf_counter() - inicio)
+
+    def somar(self, nome: str, segundos: float):
+        """Soma um tempo já medido na fase"""
+        with self._trava:
+            self.fases[nome] = self.fases.get(nome, 0.0) + segundos
+
+    def medir(self, nome: str, func, *args, **kwargs):
+        """Chama func dentro da fase `nome` e devolve o resultado"""
+        with self.fase(nome):
+            return func(*args, **kwargs)
+
+    def contar(self, nome: str, quantidade: int = 1):
+        """Soma no contador (ex.: 'round_trips', 'bytes_recebidos', 'bytes_enviados')"""
+        with self._trava:
+            self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def finalizar(self, sucesso: bool):
+        self.sucesso = bool(sucesso)
+
+    def texto_prometheus(self) -> str:
+        """Métricas da execução no formato texto do Prometheus"""
+        job = _escapar(self.job)
+        linhas = [
+            "# HELP rpa_fase_segundos Duração de cada fase na última execução do job",
+            "# TYPE rpa_fase_segundos gauge",
+        ]
+        for fase, segundos in sorted(self.fases.items()):
+            linhas.append(f'rpa_fase_segundos{{job="{job}",fase="{_escapar(fase)}"}} {segundos:.6f}')
+
+        for nome, valor in sorted(self.contadores.items()):
+            metrica = f"rpa_{_nome_metrica(nome)}"
+            linhas.append(f"# HELP {metrica} Contador {nome} da última execução do job")
+            linhas.append(f"# TYPE {metrica} gauge")
+            linhas.append(f'{metrica}{{job="{job}"}} {valor}')
+
+        linhas += [
+            "# HELP rpa_execucao_sucesso 1 se a última execução terminou com sucesso",
+            "# TYPE rpa_execucao_sucesso gauge",
+            f'rpa_execucao_sucesso{{job="{job}"}} {int(bool(self.sucesso))}',
+            "# HELP rpa_execucao_timestamp_segundos Início da última execução (epoch)",
+            "# TYPE rpa_execucao_timestamp_segundos gauge",
+            f'rpa_execucao_timestamp_segundos{{job="{job}"}} {self.inicio:.0f}',
+        ]
+        return "\n".join(linhas) + "\n"
+
+    def exportar(self, pasta: str = None) -> str:
+        """Grava rpa_<job>.prom de forma atômica (o collector nunca lê um arquivo pela metade)"""
+        pasta = pasta or pasta_metricas()
+        caminho = os.path.join(pasta, f"{PREFIXO_ARQUIVO}{self.job}.prom")
+        temporario = f"{caminho}.tmp"
+        try:
+            os.makedirs(pasta, exist_ok=True)
+            with open(temporario, 'w', encoding='utf-8') as f:
+                f.write(self.texto_prometheus())
+            os.replace(temporario, caminho)
+            return caminho
+        except OSError as e:
+            print(f"⚠️ Não foi possível exportar as métricas: {e}")
+            return None
+
+    def resumo(self) -> str:
+        """Linha curta para o console/log"""
+        fases = " | ".join(f"{f} {s:.2f}s" for f, s in self.fases.items())
+        contadores = " | ".join(f"{n} {v}" for n, v in self.contadores.items())
+        return " | ".join(p for p in (fases, contadores) if p)
+
+
+def instrumentar(job: str):
+    """Decorador do executar(): mede o total, registra sucesso e exporta as métricas ao final"""
+    def decorador(executar):
+        @functools.wraps(executar)
+        def _executar(self, *args, **kwargs):
+            self.metricas = MetricasExecucao(job)
+            sucesso = False
+            try:
+                with perfilar_se_ativado(self.metricas.job), self.metricas.fase("total"):
+                    sucesso = executar(self, *args, **kwargs)
+                return sucesso
+            finally:
+                self.metricas.finalizar(sucesso)
+                self.metricas.exportar()
+                print(f"📈 Métricas: {self.metricas.resumo()}")
+        return _executar
+    return decorador
+
+
+def medir_fase(nome: str):
+    """Decorador de método: mede a chamada na fase `nome` quando a execução está instrumentada"""
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def _metodo(self, *args, **kwargs):
+            metricas = getattr(self, 'metricas', None)
+            if metricas is None:
+                return metodo(self, *args, **kwargs)
+            with metricas.fase(nome):
+                return metodo(self, *args, **kwargs)
+        return _metodo
+    return decorador
+
+
+def contar(obj, nome: str, quantidade: int = 1):
+    """Soma no contador de obj.metricas (não faz nada fora de uma execução instrumentada)"""
+    metricas = getattr(obj, 'metricas', None)
+    if metricas is not None:
+        metricas.contar(nome, quantidade)
+
+
+def somar_fase(obj, nome: str, segundos: float):
+    """Soma um tempo já medido na fase de obj.metricas (não faz nada fora de uma execução instrumentada)"""
+    metricas = getattr(obj, 'metricas', None)
+    if metricas is not None:
+        metricas.somar(nome, segundos)
+
+
+def combinar_prometheus(textos: list) -> str:
+    """Junta vários .prom agrupando as amostras por métrica (HELP/TYPE uma vez só)"""
+    cabecalhos = {}
+    amostras = {}
+    for texto in textos:
+        for linha in texto.splitlines():
+            if not linha.strip():
+                continue
+            if linha.startswith("#"):
+                partes = linha.split(" ", 3)
+                if len(partes) >= 3 and partes[1] in ("HELP", "TYPE"):
+                    cabecalhos.setdefault(partes[2], {}).setdefault(partes[1], linha)
+                continue
+            metrica = linha.split("{", 1)[0].split(" ", 1)[0]
+            amostras.setdefault(metrica, []).append(linha)
+
+    saida = []
+    for metrica, linhas in amostras.items():
+        for tipo in ("HELP", "TYPE"):
+            if tipo in cabecalhos.get(metrica, {}):
+                saida.append(cabecalhos[metrica][tipo])
+        saida.extend(linhas)
+    return "\n".join(saida) + "\n"
+
+
+def ler_metricas(pasta: str) -> str:
+    """Conteúdo combinado de todos os rpa_*.prom da pasta"""
+    textos = []
+    for nome in sorted(os.listdir(pasta)):
+        if nome.startswith(PREFIXO_ARQUIVO) and nome.endswith(".prom"):
+            try:
+                with open(os.path.join(pasta, nome), 'r', encoding='utf-8') as f:
+                    textos.append(f.read())
+            except OSError:
+                continue
+    return combinar_prometheus(textos)
+
+
+def servir_metricas(pasta: str, porta: int = PORTA_PADRAO, host: str = "0.0.0.0"):
+    """Servidor HTTP local com as métricas de todos os jobs em /metrics"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            corpo = ler_metricas(pasta).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            pass
+
+    return ThreadingHTTPServer((host, porta), _Handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve as métricas dos processos no formato Prometheus")
+    parser.add_argument("--pasta", default=None, help="Pasta dos .prom (padrão: PASTA_METRICAS/PASTA_LOGS)")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    args = parser.parse_args()
+
+    pasta = args.pasta or pasta_metricas()
+    servidor = servir_metricas(pasta, args.porta)
+    print(f"📈 Métricas de {pasta} em http://localhost:{args.porta}/metrics")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
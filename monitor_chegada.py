@@ -0,0 +1,261 @@
+# - Acompanhamento da chegada do arquivo do dia (Processos 3 e 4)
+# 1. MonitorChegada é herdado pelas automações dos Processos 3 e 4: modo observação
+#    (observador_pasta.py), confirmação do dia com um stat e modo adaptativo
+#    (historico_chegadas.py) ficam num lugar só;
+# 2. O que muda entre os processos vem da classe que herda:
+#    - JOB_CHEGADA (processo_3), TITULO_CHEGADA (card do Teams) e FORMATO_TOKEN (data no nome do arquivo);
+#    - horarios_execucao() com os HH:MM das execuções do dia;
+#    - folder_path, prefix, pasta_logs, logger, check_mode, minutes_lag, parse_hhmm_on,
+#      within_time_window, find_matches, enviar_para_teams e executar, que os processos já têm;
+# 3. main() é o ponto de entrada de linha de comando comum aos dois processos; com --perfilar
+#    (ou PERFILAR=processo_3), o modo observação é perfilado inteiro e o adaptativo a cada executar().
+
+import os
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime, date, timedelta
+from metricas import contar
+from perfilamento import adicionar_argumento, perfilar_se_ativado
+from observador_pasta import GRANULARIDADE_MTIME_S
+
+
+class MonitorChegada:
+    """Observação, confirmação do dia e modo adaptativo para as automações dos Processos 3 e 4"""
+
+    JOB_CHEGADA = None
+    TITULO_CHEGADA = None
+    FORMATO_TOKEN = None
+
+    def horarios_execucao(self) -> list:
+        """HH:MM das execuções do dia, em ordem"""
+        raise NotImplementedError
+
+    def avaliar_chegada(self, caminho: Path) -> tuple:
+        """
+        Classifica um arquivo que acabou de chegar: ('encontrado', run_dt), ('fora_janela', None) ou (None, None)
+        - Só o nome prefixo + data de hoje interessa; o stat é feito apenas nesse caso
+        - No modo 'both', o mtime tem que cair na janela de algum dos horários de hoje
+        """
+        hoje = date.today()
+        if not caminho.name.lower().startswith((self.prefix + hoje.strftime(self.FORMATO_TOKEN)).lower()):
+            return None, None
+
+        st = caminho.stat()
+        for s in self.horarios_execucao():
+            run_dt = self.parse_hhmm_on(hoje, s)
+            expected_dt = run_dt - timedelta(minutes=self.minutes_lag)
+            if self.check_mode == "filename" or self.within_time_window(st.st_mtime, expected_dt):
+                return "encontrado", run_dt
+        return "fora_janela", None
+
+    def observar(self, intervalo_s: float = 5.0, duracao_s: float = None) -> int:
+        """
+        Modo observação: avisa no Teams assim que o arquivo do dia chega na pasta
+        - Pasta local: inotify; share montado: polling com atalho pelo mtime da pasta (ver observador_pasta.py)
+        - Só a listagem inicial percorre a pasta; depois só os nomes novos com o prefixo são avaliados
+        - Retorna quantos arquivos do dia foram avisados
+        """
+        from observador_pasta import ObservadorPasta
+
+        observador = ObservadorPasta(self.folder_path, self.prefix, intervalo_s=intervalo_s)
+        self.logger.info(
+            f"👀 Observando {self.folder_path} ({observador.modo}) | "
+            f"{len(observador.existentes)} arquivo(s) {self.prefix}* já existentes"
+        )
+
+        avisados = 0
+        try:
+            for nome in observador.observar(duracao_s, incluir_existentes=True):
+                caminho = Path(self.folder_path) / nome
+                try:
+                    situacao, run_dt = self.avaliar_chegada(caminho)
+                    if situacao is None:
+                        continue
+                    st = caminho.stat()
+                except FileNotFoundError:
+                    continue
+
+                atraso = max(0.0, time.time() - st.st_mtime)
+                self.logger.info(f"📥 Chegou {nome} ({situacao}) | detectado {atraso:.1f}s após o mtime")
+
+                facts = [
+                    ("Pasta", self.folder_path),
+                    ("Execução considerada", run_dt.strftime("%Y-%m-%d %H:%M") if run_dt else "-"),
+                    (f"• {nome}", f"mtime {datetime.fromtimestamp(st.st_mtime).strftime('%H:%M:%S')} — {st.st_size} bytes")
+                ]
+
+                self.enviar_para_teams(
+                    titulo=self.TITULO_CHEGADA,
+                    subtitulo_markdown=f"Pasta: `{self.folder_path}`",
+                    facts=facts,
+                    status_geral="✅ Arquivo recebido" if situacao == "encontrado" else "⚠️ Arquivo recebido fora da janela",
+                    container_style="good" if situacao == "encontrado" else "warning"
+                )
+                avisados += 1
+        finally:
+            observador.fechar()
+            self.logger.info(
+                f"Observação encerrada: {observador.checagens} checagens, "
+                f"{observador.listagens} listagem(ns) da pasta, {avisados} aviso(s)"
+            )
+
+        return avisados
+
+    def regra_chegada(self, run_dt: datetime) -> str:
+        """Chave da janela no histórico de chegadas (ex.: processo_3@07:40)"""
+        return f"{self.JOB_CHEGADA}@{run_dt.strftime('%H:%M')}"
+
+    def _abrir_historico(self):
+        from historico_chegadas import HistoricoChegadas, NOME_BANCO
+
+        return HistoricoChegadas(os.path.join(self.pasta_logs, NOME_BANCO))
+
+    def arquivo_confirmado(self, run_dt: datetime, expected_dt: datetime) -> Path:
+        """
+        Arquivo que já confirmou a janela no dia, conferido com um único stat (sem varrer a pasta)
+        - Se o arquivo sumiu ou mudou de mtime, a confirmação é descartada e retorna None
+        """
+        regra = self.regra_chegada(run_dt)
+        try:
+            historico = self._abrir_historico()
+        except Exception as e:
+            self.logger.warning(f"Histórico de chegadas indisponível: {e}")
+            return None
+
+        try:
+            registro = historico.confirmado(regra, expected_dt.date())
+            if registro is None:
+                return None
+
+            arquivo, mtime, _ = registro
+            contar(self, "round_trips")
+            try:
+                st = os.stat(arquivo)
+            except OSError:
+                st = None
+
+            if st is None or st.st_mtime != mtime:
+                self.logger.warning(f"Arquivo confirmado {arquivo} sumiu ou mudou; a pasta será varrida de novo")
+                historico.esquecer(regra, expected_dt.date())
+                return None
+            return Path(arquivo)
+        finally:
+            historico.fechar()
+
+    def registrar_chegada(self, run_dt: datetime, expected_dt: datetime, matches: list):
+        """Guarda o primeiro arquivo que chegou na janela (confirma o dia e alimenta o horário típico)"""
+        try:
+            primeiro = min(matches, key=lambda p: p.stat().st_mtime)
+            st = primeiro.stat()
+            historico = self._abrir_historico()
+            try:
+                historico.registrar(self.regra_chegada(run_dt), str(primeiro), st.st_mtime, st.st_size,
+                                    expected_dt.date())
+            finally:
+                historico.fechar()
+        except Exception as e:
+            self.logger.warning(f"Não foi possível registrar a chegada no histórico: {e}")
+
+    def checar_chegada(self, run_dt: datetime, expected_dt: datetime):
+        """
+        Uma checagem do modo adaptativo: True se a janela ficou confirmada, False se varreu e não achou
+        - None quando o mtime da pasta não mudou desde a última varredura (nada foi listado)
+        """
+        try:
+            mtime_pasta = os.stat(self.folder_path).st_mtime
+        except OSError as e:
+            self.logger.warning(f"Falha ao consultar a pasta {self.folder_path}: {e}")
+            return None
+
+        # mtime de pasta com resolução grossa no SMB: varredura feita logo após a mudança é refeita
+        if self._mtime_pasta is not None:
+            mtime_anterior, varrido_em = self._mtime_pasta
+            if mtime_pasta == mtime_anterior and varrido_em - mtime_pasta > GRANULARIDADE_MTIME_S:
+                return None
+        self._mtime_pasta = (mtime_pasta, time.time())
+
+        try:
+            matches, _ = self.find_matches(expected_dt)
+        except (TimeoutError, OSError) as e:
+            self.logger.warning(f"Checagem adaptativa interrompida: {e}")
+            return False
+
+        if not matches:
+            return False
+        self.registrar_chegada(run_dt, expected_dt, matches)
+        return True
+
+    def executar_adaptativo(self, intervalo_min_s: float = 60.0, intervalo_max_s: float = 1800.0) -> int:
+        """
+        Modo adaptativo: um processo cobrindo as execuções que ainda faltam hoje
+        - Antes de cada execução, checa a pasta mais vezes perto do horário típico de chegada da janela
+          (historico_chegadas.py) e para de checar assim que a janela é confirmada
+        - Checagem sem mudança no mtime da pasta não lista nada
+        - No horário da execução roda executar(), que com a janela confirmada só faz um stat
+        - Retorna quantas varreduras da pasta foram feitas
+        """
+        hoje = date.today()
+        varreduras = 0
+
+        for s in self.horarios_execucao():
+            run_dt = self.parse_hhmm_on(hoje, s)
+            if datetime.now() >= run_dt:
+                continue
+            expected_dt = run_dt - timedelta(minutes=self.minutes_lag)
+            regra = self.regra_chegada(run_dt)
+            self._mtime_pasta = None
+
+            confirmado = self.arquivo_confirmado(run_dt, expected_dt) is not None
+            historico = self._abrir_historico()
+            try:
+                while not confirmado:
+                    agora = datetime.now()
+                    espera = historico.proxima_checagem(regra, agora, expected_dt, intervalo_min_s, intervalo_max_s)
+                    if espera >= (run_dt - agora).total_seconds():
+                        break
+                    time.sleep(espera)
+
+                    resultado = self.checar_chegada(run_dt, expected_dt)
+                    if resultado is not None:
+                        varreduras += 1
+                    confirmado = bool(resultado)
+            finally:
+                historico.fechar()
+
+            if confirmado:
+                self.logger.info(f"📌 {regra}: janela confirmada antes da execução ({varreduras} varredura(s) hoje)")
+
+            time.sleep(max(0.0, (run_dt - datetime.now()).total_seconds()))
+            self.executar()
+
+        self.logger.info(f"Modo adaptativo encerrado: {varreduras} varredura(s) da pasta")
+        return varreduras
+
+
+def main(classe_automacao, descricao: str) -> int:
+    """Linha de comando dos Processos 3 e 4: execução única, --observar ou --adaptativo"""
+    parser = argparse.ArgumentParser(description=descricao)
+    parser.add_argument("--observar", action="store_true",
+                        help="Fica observando a pasta e avisa assim que o arquivo do dia chegar")
+    parser.add_argument("--pasta", default=None, help="Pasta alvo (ex.: ponto de montagem do share no Linux)")
+    parser.add_argument("--intervalo", type=float, default=5.0, help="Segundos entre checagens no modo observação")
+    parser.add_argument("--duracao", type=float, default=None, help="Encerra a observação após N segundos")
+    parser.add_argument("--adaptativo", action="store_true",
+                        help="Cobre as execuções que faltam hoje checando a pasta perto do horário típico de chegada")
+    adicionar_argumento(parser)
+    args = parser.parse_args()
+
+    automacao = classe_automacao()
+    if args.pasta:
+        automacao.folder_path = args.pasta
+    if args.adaptativo:
+        automacao.executar_adaptativo()
+        sucesso = True
+    elif args.observar:
+        with perfilar_se_ativado(automacao.JOB_CHEGADA):
+            automacao.observar(intervalo_s=args.intervalo, duracao_s=args.duracao)
+        sucesso = True
+    else:
+        sucesso = automacao.executar()
+    return 0 if sucesso else 1
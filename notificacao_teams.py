@@ -0,0 +1,433 @@
+# - Envio dos cards do Teams com modo digest (Processos 2 a 6 e validação)
+# 1. publicar_card() recebe o Adaptive Card já montado pelo processo e o estilo do container
+#    (good / warning / attention), que vira a severidade (ok / aviso / urgente);
+# 2. Sem TEAMS_DIGEST, posta direto no webhook, como antes (POST assíncrono de nucleo_async.py, sem requests);
+# 3. Com TEAMS_DIGEST=1, o card entra numa fila local (SQLite em modo WAL, fila_teams.sqlite3 em
+#    PASTA_LOGS) e cada publicação tenta despachar a fila: um único card de resumo é enviado quando
+#    o item mais antigo passa da janela (TEAMS_DIGEST_JANELA_MIN, padrão 15) ou quando algum job
+#    piora em relação ao último estado publicado (a recuperação sai no digest da janela, então um
+#    job oscilando entre ok e aviso não dispara um card a cada execução);
+# 4. Severidade urgente não espera a janela: o card original é postado na hora;
+# 5. Com `conteudo` (resumo estável do card, sem horário), um card igual ao último enviado do job
+#    (mesma severidade e mesmo hash) é suprimido até vencer ALERTA_COOLDOWN_MIN (estado_alertas.py);
+# 6. Ao fim dos jobs, executor_jobs.py chama esvaziar_fila(): o que ficou pendente sai quando a janela
+#    vence, em vez de esperar o próximo job publicar (ex.: o aviso da execução das 19:40);
+# 7. `python notificacao_teams.py --despachar [--aguardar]` faz o mesmo fora do executor,
+#    `--status` mostra a fila e as chamadas ao webhook na última hora.
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from datetime import datetime
+from collections import namedtuple, OrderedDict
+
+from estado_alertas import estado_alertas
+
+
+NOME_FILA = "fila_teams.sqlite3"
+JANELA_PADRAO_MIN = 15.0
+TIMEOUT_PADRAO_S = 15
+FATOS_POR_JOB = 8
+RETENCAO_S = 7 * 86400
+
+OK, AVISO, URGENTE = 0, 1, 2
+NOMES_SEVERIDADE = {OK: "ok", AVISO: "aviso", URGENTE: "urgente"}
+_ESTILO_POR_SEVERIDADE = {OK: "good", AVISO: "warning", URGENTE: "attention"}
+
+Envio = namedtuple("Envio", "enfileirado status texto suprimido", defaults=(False,))
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS fila (
+    id         INTEGER PRIMARY KEY,
+    job        TEXT    NOT NULL,
+    severidade INTEGER NOT NULL,
+    url        TEXT    NOT NULL,
+    payload    TEXT    NOT NULL,
+    criado_em  REAL    NOT NULL,
+    enviado_em REAL
+);
+CREATE INDEX IF NOT EXISTS fila_pendentes ON fila (criado_em) WHERE enviado_em IS NULL;
+
+CREATE TABLE IF NOT EXISTS estado (
+    job        TEXT    PRIMARY KEY,
+    severidade INTEGER NOT NULL,
+    publicado_em REAL  NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS chamadas (
+    enviado_em REAL    NOT NULL,
+    itens      INTEGER NOT NULL
+);
+"""
+
+
+def severidade_do_estilo(estilo: str) -> int:
+    """attention -> urgente, warning -> aviso, demais (good, default, accent) -> ok"""
+    estilo = (estilo or "").lower()
+    if estilo == "attention":
+        return URGENTE
+    if estilo == "warning":
+        return AVISO
+    return OK
+
+
+def postar(url: str, payload: dict, timeout_s: float = TIMEOUT_PADRAO_S) -> tuple:
+    """POST do card no webhook; retorna (status_code, texto)"""
+    import asyncio
+    from nucleo_async import postar_json
+
+    return asyncio.run(postar_json(url, payload, timeout_s))
+
+
+def _caminho_fila() -> str:
+    from configuracao import obter_configuracao, PASTA_PROJETO
+
+    return os.path.join(obter_configuracao().pasta_logs or PASTA_PROJETO, NOME_FILA)
+
+
+def _titulo_e_fatos(payload: dict) -> tuple:
+    """Primeiro TextBlock com peso Bolder (ou o primeiro TextBlock) e o primeiro FactSet do card"""
+    titulo, primeiro_texto, fatos = None, None, None
+    pilha = [payload]
+    while pilha:
+        item = pilha.pop(0)
+        if isinstance(item, list):
+            pilha[:0] = item
+        elif isinstance(item, dict):
+            if item.get("type") == "TextBlock":
+                primeiro_texto = primeiro_texto or item.get("text")
+                if titulo is None and item.get("weight") == "Bolder":
+                    titulo = item.get("text")
+            elif item.get("type") == "FactSet" and fatos is None:
+                fatos = item.get("facts", [])
+            pilha[:0] = [v for v in item.values() if isinstance(v, (list, dict))]
+    return titulo or primeiro_texto or "", fatos or []
+
+
+def montar_digest(itens: list) -> dict:
+    """Um Adaptive Card com o último estado de cada job da janela (itens: linhas da fila)"""
+    por_job = OrderedDict()
+    for item in itens:
+        por_job.setdefault(item['job'], []).append(item)
+
+    pior = max(item['severidade'] for item in itens)
+    inicio = datetime.fromtimestamp(min(item['criado_em'] for item in itens)).strftime('%H:%M:%S')
+    fim = datetime.fromtimestamp(max(item['criado_em'] for item in itens)).strftime('%H:%M:%S')
+
+    corpo = [
+        {
+            "type": "TextBlock",
+            "weight": "Bolder",
+            "size": "Medium",
+            "text": f"📬 Resumo RPA - {len(itens)} execução(ões) de {len(por_job)} job(s)"
+        },
+        {
+            "type": "TextBlock",
+            "isSubtle": True,
+            "wrap": True,
+            "spacing": "None",
+            "text": f"**Janela:** {inicio} a {fim} | **Pior estado:** {NOMES_SEVERIDADE[pior]}"
+        },
+    ]
+    for job, execucoes in por_job.items():
+        ultima = execucoes[-1]
+        titulo, fatos = _titulo_e_fatos(json.loads(ultima['payload']))
+        pior_job = max(e['severidade'] for e in execucoes)
+        corpo.append({
+            "type": "Container",
+            "style": _ESTILO_POR_SEVERIDADE[ultima['severidade']],
+            "separator": True,
+            "items": [
+                {"type": "TextBlock", "weight": "Bolder", "wrap": True, "text": f"{job}: {titulo}"},
+                {
+                    "type": "TextBlock",
+                    "isSubtle": True,
+                    "spacing": "None",
+                    "wrap": True,
+                    "text": f"{len(execucoes)} execução(ões), última às "
+                            f"{datetime.fromtimestamp(ultima['criado_em']).strftime('%H:%M:%S')}"
+                            + (f" | pior na janela: {NOMES_SEVERIDADE[pior_job]}" if pior_job != ultima['severidade'] else "")
+                },
+                {"type": "FactSet", "facts": fatos[:FATOS_POR_JOB]},
+            ]
+        })
+
+    return {
+        "type": "message",
+        "attachments": [{
+            "contentType": "application/vnd.microsoft.card.adaptive",
+            "contentUrl": None,
+            "content": {
+                "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                "type": "AdaptiveCard",
+                "version": "1.4",
+                "body": corpo
+            }
+        }]
+    }
+
+
+class FilaTeams:
+    """Fila de cards (SQLite WAL, segura entre processos) e despacho do digest"""
+
+    def __init__(self, caminho_banco: str, janela_s: float = JANELA_PADRAO_MIN * 60):
+        self.caminho_banco = caminho_banco
+        self.janela_s = janela_s
+        self.conn = sqlite3.connect(caminho_banco, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_ESQUEMA)
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.conn.close()
+
+    def enfileirar(self, job: str, severidade: int, url: str, payload: dict, agora: float = None):
+        self.conn.execute(
+            "INSERT INTO fila (job, severidade, url, payload, criado_em) VALUES (?, ?, ?, ?, ?)",
+            (job, severidade, url, json.dumps(payload, ensure_ascii=False), agora or time.time())
+        )
+
+    def registrar_publicacao(self, job: str, severidade: int, itens: int = 1, agora: float = None):
+        """Guarda a severidade publicada do job e conta a chamada ao webhook"""
+        agora = agora or time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO estado (job, severidade, publicado_em) VALUES (?, ?, ?)",
+                (job, severidade, agora)
+            )
+            self.conn.execute("INSERT INTO chamadas (enviado_em, itens) VALUES (?, ?)", (agora, itens))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _motivo_despacho(self, pendentes: list, agora: float) -> str:
+        """'janela', 'piora' ou None (ainda não é hora de enviar); job nunca publicado conta como ok"""
+        if agora - pendentes[0]['criado_em'] >= self.janela_s:
+            return "janela"
+        publicados = {
+            linha['job']: linha['severidade']
+            for linha in self.conn.execute("SELECT job, severidade FROM estado")
+        }
+        for item in pendentes:
+            if item['severidade'] > publicados.get(item['job'], OK):
+                return "piora"
+        return None
+
+    def despachar(self, forcar: bool = False, agora: float = None, postar_card=None) -> int:
+        """
+        Envia o digest se a janela venceu ou algum job piorou (ou se forcar)
+        - Os itens são reservados numa transação (outro processo não envia os mesmos)
+        - Um digest por webhook, todos postados ao mesmo tempo (postar_card, se informado, posta um a um)
+        - Se o POST falhar, voltam para a fila
+        Retorna quantos itens foram enviados
+        """
+        agora = agora or time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            pendentes = self.conn.execute(
+                "SELECT * FROM fila WHERE enviado_em IS NULL ORDER BY criado_em, id"
+            ).fetchall()
+            motivo = ("forcado" if forcar else self._motivo_despacho(pendentes, agora)) if pendentes else None
+            if motivo is None:
+                self.conn.execute("COMMIT")
+                return 0
+            ids = [item['id'] for item in pendentes]
+            self.conn.executemany("UPDATE fila SET enviado_em = ? WHERE id = ?", [(agora, i) for i in ids])
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        enviados = 0
+        por_url = OrderedDict()
+        for item in pendentes:
+            por_url.setdefault(item['url'], []).append(item)
+
+        envios = [(url, montar_digest(itens)) for url, itens in por_url.items()]
+        if postar_card is None:
+            import asyncio
+            from nucleo_async import postar_varios
+
+            respostas = asyncio.run(postar_varios(envios))
+        else:
+            respostas = []
+            for url, card in envios:
+                try:
+                    respostas.append(postar_card(url, card))
+                except Exception as e:
+                    respostas.append((None, str(e)))
+
+        for (status, texto), itens in zip(respostas, por_url.values()):
+            if status in (200, 202):
+                enviados += len(itens)
+                for item in itens:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO estado (job, severidade, publicado_em) VALUES (?, ?, ?)",
+                        (item['job'], item['severidade'], agora)
+                    )
+                self.conn.execute("INSERT INTO chamadas (enviado_em, itens) VALUES (?, ?)", (agora, len(itens)))
+                print(f"📬 Digest do Teams enviado ({motivo}): {len(itens)} card(s) em 1 mensagem")
+            else:
+                self.conn.executemany(
+                    "UPDATE fila SET enviado_em = NULL WHERE id = ?", [(item['id'],) for item in itens]
+                )
+                print(f"❌ Falha ao enviar digest do Teams ({status}): {texto}")
+
+        self.conn.execute("DELETE FROM fila WHERE enviado_em < ?", (agora - RETENCAO_S,))
+        self.conn.execute("DELETE FROM chamadas WHERE enviado_em < ?", (agora - RETENCAO_S,))
+        return enviados
+
+    def espera_janela(self, agora: float = None):
+        """Segundos até o pendente mais antigo completar a janela (None se não há pendentes)"""
+        mais_antigo = self.conn.execute("SELECT MIN(criado_em) FROM fila WHERE enviado_em IS NULL").fetchone()[0]
+        if mais_antigo is None:
+            return None
+        return max(0.0, mais_antigo + self.janela_s - (agora or time.time()))
+
+    def despachar_ao_vencer(self, prazo_s: float = None) -> int:
+        """
+        Despacha e, se sobrar pendente, espera a janela dele vencer e despacha de novo
+        - prazo_s limita a espera (padrão: uma janela); o que vencer depois fica para a próxima publicação
+        - Se o POST falhar, os itens ficam na fila e a espera termina
+        """
+        limite = time.time() + (self.janela_s if prazo_s is None else prazo_s)
+        enviados = self.despachar()
+        while True:
+            espera = self.espera_janela()
+            if espera is None or time.time() + espera > limite:
+                return enviados
+            if espera > 0:
+                print(f"⏳ Digest do Teams pendente: envio em {espera:.0f}s, quando a janela vencer")
+                time.sleep(espera)
+            enviados_agora = self.despachar()
+            if not enviados_agora:
+                return enviados
+            enviados += enviados_agora
+
+    def status(self, agora: float = None) -> dict:
+        agora = agora or time.time()
+        pendentes = self.conn.execute("SELECT COUNT(*) FROM fila WHERE enviado_em IS NULL").fetchone()[0]
+        chamadas, itens = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(itens), 0) FROM chamadas WHERE enviado_em >= ?", (agora - 3600,)
+        ).fetchone()
+        estados = {
+            linha['job']: NOMES_SEVERIDADE[linha['severidade']]
+            for linha in self.conn.execute("SELECT job, severidade FROM estado ORDER BY job")
+        }
+        return {'pendentes': pendentes, 'chamadas_hora': chamadas, 'cards_hora': itens, 'estados': estados}
+
+
+def _postar_ou_cancelar(url: str, payload: dict, timeout_s: float, job: str, reservado: bool) -> tuple:
+    """POST do card; se falhar, desfaz a reserva do job no estado dos alertas"""
+    try:
+        status, texto = postar(url, payload, timeout_s)
+    except Exception:
+        if reservado:
+            estado_alertas().cancelar(job)
+        raise
+    if reservado and status not in (200, 202):
+        estado_alertas().cancelar(job)
+    return status, texto
+
+
+def publicar_card(url: str, payload: dict, job: str, estilo: str, timeout_s: float = TIMEOUT_PADRAO_S,
+                  conteudo=None) -> Envio:
+    """
+    Envia (ou enfileira, no modo digest) o card de um job
+    - conteudo: resumo estável do card; card repetido dentro do cooldown não é enviado (Envio.suprimido)
+    - Envio.enfileirado=True: o card foi para a fila e sai no próximo digest
+    - Senão, Envio.status/texto são a resposta do webhook (status None se o POST falhou)
+    """
+    from configuracao import obter_configuracao
+
+    config = obter_configuracao()
+    severidade = severidade_do_estilo(estilo)
+
+    reservado = conteudo is not None
+    if reservado:
+        decisao = estado_alertas().reservar(
+            job, NOMES_SEVERIDADE[severidade], conteudo, cooldown_s=config.alerta_cooldown_min * 60
+        )
+        if not decisao.enviar:
+            return Envio(False, None, None, suprimido=True)
+
+    if not config.teams_digest:
+        status, texto = _postar_ou_cancelar(url, payload, timeout_s, job, reservado)
+        return Envio(False, status, texto)
+
+    fila = FilaTeams(_caminho_fila(), config.teams_digest_janela_min * 60)
+    try:
+        if severidade == URGENTE:
+            status, texto = _postar_ou_cancelar(url, payload, timeout_s, job, reservado)
+            if status in (200, 202):
+                fila.registrar_publicacao(job, severidade)
+            fila.despachar()
+            return Envio(False, status, texto)
+
+        fila.enfileirar(job, severidade, url, payload)
+        fila.despachar()
+        return Envio(True, None, None)
+    finally:
+        fila.fechar()
+
+
+def esvaziar_fila(prazo_s: float = None) -> int:
+    """
+    Fim de um lote de jobs: com TEAMS_DIGEST, envia o pendente assim que a janela vencer (ver despachar_ao_vencer)
+    - Sem TEAMS_DIGEST não há fila e retorna 0
+    """
+    from configuracao import obter_configuracao
+
+    config = obter_configuracao()
+    if not config.teams_digest:
+        return 0
+
+    fila = FilaTeams(_caminho_fila(), config.teams_digest_janela_min * 60)
+    try:
+        return fila.despachar_ao_vencer(prazo_s)
+    finally:
+        fila.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fila de cards do Teams (modo digest)")
+    parser.add_argument("--despachar", action="store_true", help="Envia o digest se a janela venceu")
+    parser.add_argument("--forcar", action="store_true", help="Com --despachar, envia o pendente mesmo dentro da janela")
+    parser.add_argument("--aguardar", action="store_true",
+                        help="Com --despachar, espera a janela do pendente vencer (no máximo uma janela) e envia")
+    parser.add_argument("--status", action="store_true", help="Mostra pendentes, chamadas na última hora e estados")
+    parser.add_argument("--banco", default=None, help=f"Caminho do banco (padrão: PASTA_LOGS/{NOME_FILA})")
+    args = parser.parse_args()
+
+    from configuracao import obter_configuracao
+
+    fila = FilaTeams(args.banco or _caminho_fila(), obter_configuracao().teams_digest_janela_min * 60)
+    try:
+        if args.despachar:
+            if args.aguardar and not args.forcar:
+                enviados = fila.despachar_ao_vencer()
+            else:
+                enviados = fila.despachar(forcar=args.forcar)
+            print(f"✅ {enviados} card(s) despachado(s)" if enviados else "Nada a despachar")
+        if args.status or not args.despachar:
+            resumo = fila.status()
+            print("=" * 60)
+            print(f"Pendentes: {resumo['pendentes']} | Chamadas ao webhook na última hora: "
+                  f"{resumo['chamadas_hora']} ({resumo['cards_hora']} card(s))")
+            for job, severidade in resumo['estados'].items():
+                print(f"  • {job:<28} {severidade}")
+            print("=" * 60)
+    finally:
+        fila.fechar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
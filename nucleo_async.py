@@ -0,0 +1,252 @@
+# - Núcleo assíncrono (Processos 2, 3, 4 e avisos no Teams)
+# 1. Acessibilidade de servidor: ping em subprocesso assíncrono e conexão TCP (SMB 445) ao mesmo
+#    tempo, no mesmo event loop; o primeiro que responder encerra a checagem (Processos 3/4);
+# 2. POST JSON (webhook do Teams) direto sobre asyncio streams, sem requests: os digests de vários
+#    webhooks saem em paralelo (notificacao_teams.py); com proxy no ambiente, o POST vai pelo requests;
+# 3. Listagem SFTP concorrente: um canal SFTP por pasta na mesma conexão SSH,
+#    com as chamadas bloqueantes do paramiko em threads (asyncio.to_thread) (Processo 2);
+# 4. verificar_alvos checa centenas de host:porta de uma vez em um único processo (CLI abaixo).
+#
+# Uso: python nucleo_async.py host[:porta] [host[:porta] ...] [--timeout 1.0] [--concorrencia 200]
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+from urllib.parse import urlsplit
+
+
+PORTA_SMB = 445
+TIMEOUT_PADRAO_S = 15
+CONCORRENCIA_PADRAO = 200
+
+
+async def limitar(corrotinas, concorrencia: int = CONCORRENCIA_PADRAO) -> list:
+    """gather com no máximo `concorrencia` corrotinas ativas; resultados na ordem de entrada"""
+    semaforo = asyncio.Semaphore(max(1, concorrencia))
+
+    async def _com_vaga(corrotina):
+        async with semaforo:
+            return await corrotina
+
+    return await asyncio.gather(*(_com_vaga(c) for c in corrotinas))
+
+
+async def host_acessivel(host: str, porta: int = PORTA_SMB, timeout_s: float = 1.0) -> bool:
+    """Tenta abrir uma conexão TCP (ex.: SMB 445) dentro do timeout"""
+    try:
+        _, escritor = await asyncio.wait_for(asyncio.open_connection(host, porta), timeout_s)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    escritor.close()
+    try:
+        await escritor.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+async def executar_comando(cmd: list, timeout_s: float = TIMEOUT_PADRAO_S) -> tuple:
+    """
+    Roda um comando em subprocesso assíncrono; retorna (código, stdout, stderr)
+    - No timeout retorna (None, b'', b''); cancelado ou no timeout, o processo é morto
+    """
+    processo = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        saida, erro = await asyncio.wait_for(processo.communicate(), timeout_s)
+    except asyncio.TimeoutError:
+        return None, b"", b""
+    finally:
+        if processo.returncode is None:
+            processo.kill()
+            await processo.wait()
+    return processo.returncode, saida, erro
+
+
+async def ping(host: str, timeout_ms: int = 1000) -> bool:
+    """Mesmo ping dos Processos 3/4 (-n/-w no Windows, -c/-W fora dele), sem bloquear o loop"""
+    if not host:
+        return False
+
+    if platform.system().lower().startswith("win"):
+        cmd = ["ping", "-n", "1", "-w", str(timeout_ms), host]
+    else:
+        cmd = ["ping", "-c", "1", "-W", str(max(1, timeout_ms // 1000)), host]
+
+    try:
+        codigo, _, _ = await executar_comando(cmd, timeout_s=(timeout_ms / 1000) + 1)
+    except OSError:
+        return False
+    return codigo == 0
+
+
+async def servidor_acessivel(host: str, porta: int = PORTA_SMB, timeout_ms: int = 1000) -> bool:
+    """
+    Ping e conexão TCP na porta (SMB 445) ao mesmo tempo; True assim que um dos dois responder
+    - Firewall que bloqueia ICMP não derruba a checagem se o compartilhamento está no ar
+    - A checagem que sobrar é cancelada (o ping em andamento é morto)
+    """
+    if not host:
+        return False
+
+    pendentes = {
+        asyncio.create_task(ping(host, timeout_ms)),
+        asyncio.create_task(host_acessivel(host, porta, timeout_ms / 1000)),
+    }
+    try:
+        while pendentes:
+            prontas, pendentes = await asyncio.wait(pendentes, return_when=asyncio.FIRST_COMPLETED)
+            if any(not t.cancelled() and t.exception() is None and t.result() for t in prontas):
+                return True
+        return False
+    finally:
+        for tarefa in pendentes:
+            tarefa.cancel()
+        await asyncio.gather(*pendentes, return_exceptions=True)
+
+
+async def _ler_corpo(leitor: asyncio.StreamReader, cabecalhos: dict) -> bytes:
+    if cabecalhos.get("transfer-encoding", "").lower() == "chunked":
+        partes = []
+        while True:
+            tamanho = int((await leitor.readline()).split(b";")[0].strip() or b"0", 16)
+            if tamanho == 0:
+                await leitor.readline()
+                return b"".join(partes)
+            partes.append(await leitor.readexactly(tamanho))
+            await leitor.readline()
+
+    if "content-length" in cabecalhos:
+        return await leitor.readexactly(int(cabecalhos["content-length"]))
+    return await leitor.read()
+
+
+def _usa_proxy(partes) -> bool:
+    from urllib.request import getproxies, proxy_bypass
+
+    return bool(getproxies().get(partes.scheme)) and not proxy_bypass(partes.hostname or "")
+
+
+async def postar_json(url: str, payload, timeout_s: float = TIMEOUT_PADRAO_S) -> tuple:
+    """
+    POST de JSON (ex.: Adaptive Card no webhook do Teams) sobre asyncio streams
+    - Retorna (status_http, corpo_texto); erros de rede e timeout sobem como OSError/TimeoutError
+    - Com HTTP(S)_PROXY no ambiente, o POST vai pelo requests numa thread (túnel CONNECT, autenticação)
+    """
+    partes = urlsplit(url)
+    if _usa_proxy(partes):
+        import requests
+
+        resposta = await asyncio.to_thread(requests.post, url, json=payload, timeout=timeout_s)
+        return resposta.status_code, resposta.text
+
+    https = partes.scheme == "https"
+    if https:
+        import ssl
+    porta = partes.port or (443 if https else 80)
+    caminho = (partes.path or "/") + (f"?{partes.query}" if partes.query else "")
+    corpo = json.dumps(payload).encode("utf-8")
+
+    async def _postar():
+        leitor, escritor = await asyncio.open_connection(
+            partes.hostname, porta, ssl=ssl.create_default_context() if https else None
+        )
+        try:
+            escritor.write(
+                f"POST {caminho} HTTP/1.1\r\n"
+                f"Host: {partes.netloc}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(corpo)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + corpo
+            )
+            await escritor.drain()
+
+            status = int((await leitor.readline()).split()[1])
+            cabecalhos = {}
+            while True:
+                linha = (await leitor.readline()).decode("latin-1").strip()
+                if not linha:
+                    break
+                nome, _, valor = linha.partition(":")
+                cabecalhos[nome.strip().lower()] = valor.strip()
+
+            return status, (await _ler_corpo(leitor, cabecalhos)).decode("utf-8", errors="replace")
+        finally:
+            escritor.close()
+
+    return await asyncio.wait_for(_postar(), timeout_s)
+
+
+async def postar_varios(envios: list, timeout_s: float = TIMEOUT_PADRAO_S) -> list:
+    """POST de vários (url, payload) ao mesmo tempo; falha de um envio vira (None, mensagem) na sua posição"""
+    async def _postar(url, payload):
+        try:
+            return await postar_json(url, payload, timeout_s)
+        except Exception as e:
+            return None, str(e) or type(e).__name__
+
+    return await limitar([_postar(url, payload) for url, payload in envios])
+
+
+async def listar_pastas_sftp(ssh, pastas: list, listar, concorrencia: int = 4) -> list:
+    """
+    Lista várias pastas em paralelo na mesma conexão SSH
+    - Cada pasta usa o seu próprio canal SFTP (ssh.open_sftp()), aberto e fechado em uma thread
+    - listar(sftp, pasta) é a função de listagem do processo; resultados na ordem de `pastas`
+    - Falha ao abrir o canal dá None para a pasta, como um erro de listagem
+    """
+    def _listar(pasta):
+        try:
+            sftp = ssh.open_sftp()
+        except Exception as e:
+            print(f"Erro ao abrir canal SFTP para {pasta}: {e}")
+            return None
+        try:
+            return listar(sftp, pasta)
+        finally:
+            sftp.close()
+
+    return await limitar([asyncio.to_thread(_listar, pasta) for pasta in pastas], concorrencia)
+
+
+async def verificar_alvos(alvos: list, timeout_s: float = 1.0, concorrencia: int = CONCORRENCIA_PADRAO) -> list:
+    """Checa (host, porta) de todos os alvos concorrentemente; devolve dicts com acessivel e ms"""
+    async def _verificar(host, porta):
+        inicio = time.perf_counter()
+        acessivel = await host_acessivel(host, porta, timeout_s)
+        return {'host': host, 'porta': porta, 'acessivel': acessivel,
+                'ms': (time.perf_counter() - inicio) * 1000}
+
+    return await limitar([_verificar(h, p) for h, p in alvos], concorrencia)
+
+
+def _alvo(texto: str) -> tuple:
+    host, _, porta = texto.rpartition(":") if ":" in texto else (texto, "", "")
+    return (host, int(porta)) if porta else (texto, PORTA_SMB)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica a acessibilidade TCP de vários hosts em paralelo")
+    parser.add_argument("alvos", nargs="+", help="host ou host:porta (padrão: 445/SMB)")
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--concorrencia", type=int, default=CONCORRENCIA_PADRAO)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultados = asyncio.run(verificar_alvos([_alvo(a) for a in args.alvos], args.timeout, args.concorrencia))
+    total = time.perf_counter() - inicio
+
+    for r in resultados:
+        status = "✅" if r['acessivel'] else "❌"
+        print(f"  {status} {r['host']}:{r['porta']:<6} {r['ms']:>8.1f} ms")
+    print(f"{len(resultados)} alvo(s) em {total:.2f}s")
+
+    return 0 if all(r['acessivel'] for r in resultados) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+# - Observação de pastas (modo observação dos Processos 3 e 4)
+# 1. Em vez de varrer a pasta inteira a cada execução agendada, avisa os nomes novos assim que
+#    aparecem, já filtrados pelo prefixo (EX, flash_retorno_next_);
+# 2. Pasta local no Linux: inotify via ctypes (IN_CLOSE_WRITE / IN_MOVED_TO), sem varredura nenhuma;
+# 3. Share montado (cifs/smb3/nfs) ou fora do Linux: o inotify não vê o que outros clientes gravam,
+#    então cai no polling: a cada intervalo só um stat da pasta, e a listagem só acontece quando
+#    o mtime da pasta muda (arquivo criado, renomeado ou apagado);
+# 4. Só a listagem inicial percorre a pasta inteira.
+#
+# Uso: python observador_pasta.py <pasta> --prefixo EX [--intervalo 5] [--modo auto|inotify|polling]
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import argparse
+
+
+# Sistemas de arquivos de rede: alterações feitas por outros clientes não geram evento inotify
+FS_REDE = {"cifs", "smb3", "smbfs", "nfs", "nfs4", "fuse.sshfs", "9p", "afs"}
+
+# mtime de pasta com resolução grossa (SMB/FAT): listagem feita logo após a mudança é refeita
+# no próximo ciclo, senão um arquivo criado no mesmo "tique" passaria despercebido
+GRANULARIDADE_MTIME_S = 2.0
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_CABECALHO = struct.Struct("iIII")
+
+
+def tipo_fs(pasta: str) -> str:
+    """Tipo do sistema de arquivos onde a pasta está montada (de /proc/mounts); None se não souber"""
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            montagens = [linha.split()[1:3] for linha in f]
+    except OSError:
+        return None
+
+    real = os.path.realpath(pasta)
+    melhor, tipo = "", None
+    for ponto, fs in montagens:
+        ponto = ponto.replace("\\040", " ")
+        if (real == ponto or real.startswith(ponto.rstrip("/") + "/")) and len(ponto) > len(melhor):
+            melhor, tipo = ponto, fs
+    return tipo
+
+
+def _libc_inotify():
+    """libc com inotify (ctypes), ou None fora do Linux"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class ObservadorPasta:
+    """Nomes novos de uma pasta (um nível, arquivos com o prefixo), por inotify ou polling"""
+
+    def __init__(self, pasta: str, prefixo: str = "", intervalo_s: float = 5.0, modo: str = "auto"):
+        self.pasta = pasta
+        self.prefixo = prefixo.upper()
+        self.intervalo_s = intervalo_s
+        self.checagens = 0
+        self.listagens = 0
+        self._fd = None
+        self._mtime = None
+        self._relistar = False
+
+        self.modo = self._escolher_modo(modo)
+        if self.modo == "inotify":
+            self._abrir_inotify()
+        self.existentes = self._listar()
+        self.conhecidos = set(self.existentes)
+
+    def _escolher_modo(self, modo: str) -> str:
+        if modo != "auto":
+            return modo
+        if _libc_inotify() is None or tipo_fs(self.pasta) in FS_REDE:
+            return "polling"
+        return "inotify"
+
+    def _abrir_inotify(self):
+        libc = _libc_inotify()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify indisponível neste sistema")
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(_errno(), "inotify_init1 falhou")
+        if libc.inotify_add_watch(fd, os.fsencode(self.pasta), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            erro = _errno()
+            os.close(fd)
+            raise OSError(erro, f"inotify_add_watch falhou em {self.pasta}")
+        self._fd = fd
+
+    def fechar(self):
+        """Fecha o descritor do inotify (no polling não há nada aberto)"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _aceita(self, nome: str) -> bool:
+        return nome.upper().startswith(self.prefixo)
+
+    def _listar(self) -> list:
+        """Listagem completa (só arquivos com o prefixo); guarda o mtime da pasta para o atalho"""
+        self.listagens += 1
+        antes = os.stat(self.pasta).st_mtime
+        with os.scandir(self.pasta) as it:
+            nomes = [e.name for e in it if self._aceita(e.name) and e.is_file(follow_symlinks=False)]
+        self._mtime = antes
+        self._relistar = time.time() - antes < GRANULARIDADE_MTIME_S
+        return nomes
+
+    def _novos_da_listagem(self) -> list:
+        novos = [n for n in self._listar() if n not in self.conhecidos]
+        self.conhecidos.update(novos)
+        return novos
+
+    def _novos_polling(self, timeout_s: float) -> list:
+        limite = time.monotonic() + timeout_s
+        while True:
+            self.checagens += 1
+            if self._relistar or os.stat(self.pasta).st_mtime != self._mtime:
+                novos = self._novos_da_listagem()
+                if novos:
+                    return novos
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                return []
+            time.sleep(min(self.intervalo_s, restante))
+
+    def _novos_inotify(self, timeout_s: float) -> list:
+        self.checagens += 1
+        prontos, _, _ = select.select([self._fd], [], [], max(0.0, timeout_s))
+        if not prontos:
+            return []
+
+        try:
+            dados = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        novos, transbordou = [], False
+        pos = 0
+        while pos < len(dados):
+            _, mascara, _, tamanho = _CABECALHO.unpack_from(dados, pos)
+            pos += _CABECALHO.size
+            nome = dados[pos:pos + tamanho].rstrip(b"\0").decode(errors="surrogateescape")
+            pos += tamanho
+            if mascara & IN_Q_OVERFLOW:
+                transbordou = True
+            elif mascara & IN_IGNORED:
+                raise FileNotFoundError(f"Pasta observada deixou de existir: {self.pasta}")
+            elif nome and not mascara & IN_ISDIR and self._aceita(nome) and nome not in self.conhecidos:
+                self.conhecidos.add(nome)
+                novos.append(nome)
+
+        # Fila de eventos do kernel estourou: a única forma de não perder nada é listar de novo
+        if transbordou:
+            novos.extend(self._novos_da_listagem())
+        return novos
+
+    def novos(self, timeout_s: float = None) -> list:
+        """Nomes que apareceram desde a última chamada (espera até timeout_s; padrão: um intervalo)"""
+        timeout_s = self.intervalo_s if timeout_s is None else timeout_s
+        if self.modo == "inotify":
+            return self._novos_inotify(timeout_s)
+        return self._novos_polling(timeout_s)
+
+    def observar(self, duracao_s: float = None, incluir_existentes: bool = False):
+        """Gera os nomes novos conforme chegam (para sempre, ou por duracao_s segundos)"""
+        if incluir_existentes:
+            yield from self.existentes
+        fim = None if duracao_s is None else time.monotonic() + duracao_s
+        while fim is None or time.monotonic() < fim:
+            espera = self.intervalo_s if fim is None else min(self.intervalo_s, max(0.0, fim - time.monotonic()))
+            yield from self.novos(espera)
+
+
+def _errno() -> int:
+    import ctypes
+
+    return ctypes.get_errno()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Observa uma pasta e imprime os arquivos novos")
+    parser.add_argument("pasta")
+    parser.add_argument("--prefixo", default="")
+    parser.add_argument("--intervalo", type=float, default=5.0, help="Segundos entre checagens (polling)")
+    parser.add_argument("--modo", choices=("auto", "inotify", "polling"), default="auto")
+    args = parser.parse_args()
+
+    with ObservadorPasta(args.pasta, args.prefixo, args.intervalo, args.modo) as observador:
+        print(f"👀 Observando {args.pasta} ({observador.modo}, fs {tipo_fs(args.pasta) or '?'}) "
+              f"| {len(observador.existentes)} arquivo(s) já existentes")
+        try:
+            for nome in observador.observar():
+                print(f"📥 {time.strftime('%H:%M:%S')} {nome}")
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# - Perfilamento sob demanda dos processos
+# 1. Ligado por job: PERFILAR=1 (todos) ou PERFILAR=processo_3,processo_5 no ambiente/.env,
+#    ou --perfilar na linha de comando do script (declarado no argparse de cada job com
+#    adicionar_argumento, para o parser não recusar a flag);
+# 2. Roda o executar() sob cProfile, incluindo as threads abertas durante a execução
+#    (varredura do Processo 3/4 em thread, listagem SFTP do Processo 2 via asyncio.to_thread);
+#    os modos --observar dos Processos 2/3/4 e a validacao_pasta_auto_v1 inteira usam perfilar_se_ativado;
+# 3. Grava perfil_<job>_<data>.prof (abre no snakeviz/pstats) e perfil_<job>_<data>.txt com os
+#    N pontos mais caros (PERFILAR_TOP, padrão 30) ao lado dos logs (PASTA_LOGS);
+# 4. Desligado, custa só a checagem da variável: cProfile e pstats nem são importados.
+
+import os
+import sys
+import threading
+from datetime import datetime
+from contextlib import contextmanager, nullcontext
+
+
+FLAG_CLI = "--perfilar"
+TOP_PADRAO = 30
+
+
+def adicionar_argumento(parser):
+    """Declara --perfilar no argparse do job (todo parser de processo precisa aceitar a flag)"""
+    parser.add_argument(FLAG_CLI, action="store_true", help="Grava perfil cProfile da execução (ver perfilamento.py)")
+
+
+def perfilamento_ativado(job: str) -> bool:
+    """PERFILAR=1/todos liga para todos os jobs; PERFILAR=a,b liga só para os listados"""
+    if FLAG_CLI in sys.argv:
+        return True
+    valor = os.getenv("PERFILAR", "").strip().lower()
+    if not valor or valor in ("0", "false", "nao", "não"):
+        return False
+    if valor in ("1", "true", "sim", "todos"):
+        return True
+    return job.lower() in {j.strip() for j in valor.split(",")}
+
+
+def _pasta_saida() -> str:
+    from configuracao import obter_configuracao, PASTA_PROJETO
+
+    return obter_configuracao().pasta_logs or PASTA_PROJETO
+
+
+@contextmanager
+def perfilar(job: str, pasta: str = None, top: int = None):
+    """Perfila o bloco (thread atual + threads iniciadas nele) e grava .prof e resumo .txt"""
+    import cProfile
+    import pstats
+
+    perfis = []
+    trava = threading.Lock()
+
+    def _ativar_na_thread(*_):
+        # Chamado uma vez no início de cada thread nova; troca o gancho pelo profiler da thread
+        sys.setprofile(None)
+        perfil = cProfile.Profile()
+        with trava:
+            perfis.append(perfil)
+        perfil.enable()
+
+    principal = cProfile.Profile()
+    threading.setprofile(_ativar_na_thread)
+    principal.enable()
+    try:
+        yield
+    finally:
+        principal.disable()
+        threading.setprofile(None)
+
+        pasta = pasta or _pasta_saida()
+        top = top or int(os.getenv("PERFILAR_TOP", TOP_PADRAO))
+        base = os.path.join(pasta, f"perfil_{job}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        try:
+            os.makedirs(pasta, exist_ok=True)
+            estatisticas = pstats.Stats(principal)
+            with trava:
+                for perfil in perfis:
+                    estatisticas.add(perfil)
+            estatisticas.dump_stats(f"{base}.prof")
+
+            with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+                f.write(f"PERFIL {job} - {datetime.now().strftime('%d/%m/%Y %H:%M:%S')} "
+                        f"({len(perfis)} thread(s) além da principal)\n\n")
+                estatisticas.stream = f
+                f.write(f"TOP {top} POR TEMPO ACUMULADO\n")
+                estatisticas.sort_stats("cumulative").print_stats(top)
+                f.write(f"\nTOP {top} POR TEMPO PRÓPRIO\n")
+                estatisticas.sort_stats("tottime").print_stats(top)
+
+            print(f"🔬 Perfil gravado em {base}.prof (resumo: {base}.txt)")
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar o perfil: {e}")
+
+
+def perfilar_se_ativado(job: str):
+    """perfilar(job) quando ligado para o job; senão um contexto vazio"""
+    return perfilar(job) if perfilamento_ativado(job) else nullcontext()
@@ -0,0 +1,98 @@
+# - Logging compartilhado dos processos (Processos 3 e 4)
+# 1. configurar_logger() liga o logger nomeado a um QueueHandler: a chamada de log só enfileira
+#    o registro, e um QueueListener em thread de fundo grava no arquivo rotativo e no stdout
+#    (PASTA_LOGS pode estar num share de rede; a varredura não espera a escrita);
+# 2. Idempotente: várias instâncias do mesmo processo no mesmo host reaproveitam o mesmo
+#    listener em vez de empilhar handlers (cada linha saía duplicada);
+# 3. Ao fim do processo (atexit) os listeners são parados, gravando o que ainda está na fila.
+
+import sys
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+FORMATO = "%(asctime)s %(levelname)s %(message)s"
+FORMATO_DATA = "%Y-%m-%d %H:%M:%S"
+
+_ouvintes = {}
+_trava = threading.Lock()
+
+
+class _HandlerFila(QueueHandler):
+    """QueueHandler que só resolve a mensagem na thread que loga (sem copiar e formatar o registro inteiro)"""
+
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = _FORMATADOR.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_FORMATADOR = logging.Formatter(FORMATO, FORMATO_DATA)
+
+
+def _criar_handlers(caminho_log: str, max_bytes: int, backup_count: int) -> list:
+    fmt = _FORMATADOR
+
+    fh = RotatingFileHandler(caminho_log, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    fh.setFormatter(fmt)
+
+    ch = logging.StreamHandler(sys.stdout)
+    ch.setFormatter(fmt)
+
+    return [fh, ch]
+
+
+def _parar(nome: str):
+    ouvinte, handler_fila, _ = _ouvintes.pop(nome)
+    logging.getLogger(nome).removeHandler(handler_fila)
+    ouvinte.stop()
+    for handler in ouvinte.handlers:
+        handler.close()
+
+
+def parar_logger(nome: str):
+    """Para o listener do logger (esvazia a fila) e fecha os handlers"""
+    with _trava:
+        if nome in _ouvintes:
+            _parar(nome)
+
+
+def configurar_logger(nome: str, caminho_log: str, max_bytes: int = 3 * 1024 * 1024,
+                      backup_count: int = 3, nivel: int = logging.INFO) -> logging.Logger:
+    """
+    Logger `nome` com escrita em segundo plano (arquivo rotativo + stdout)
+    - Chamado de novo com o mesmo caminho, devolve o logger já configurado
+    - Com outro caminho, troca o destino (o listener anterior é parado)
+    """
+    logger = logging.getLogger(nome)
+    with _trava:
+        registro = _ouvintes.get(nome)
+        if registro is not None:
+            if registro[2] == caminho_log:
+                return logger
+            _parar(nome)
+
+        fila = queue.SimpleQueue()
+        ouvinte = QueueListener(fila, *_criar_handlers(caminho_log, max_bytes, backup_count),
+                                respect_handler_level=True)
+        handler_fila = _HandlerFila(fila)
+
+        logger.setLevel(nivel)
+        logger.propagate = False
+        logger.addHandler(handler_fila)
+        _ouvintes[nome] = (ouvinte, handler_fila, caminho_log)
+        ouvinte.start()
+    return logger
+
+
+@atexit.register
+def _parar_todos():
+    for nome in list(_ouvintes):
+        parar_logger(nome)
@@ -0,0 +1,89 @@
+# - Regras de filtro dos relatórios do GA (Processos 5 e 6)
+# 1. Cada regra declara coluna, operação (eq/contains/endswith/startswith/regex), valor e case;
+# 2. As regras são compiladas uma única vez (literal em minúsculas ou regex pré-compilada);
+# 3. A avaliação é memorizada por valor distinto da célula: como o export repete
+#    poucos status e nomes de arquivo (strings compartilhadas do xlsx), cada
+#    valor distinto é testado uma vez só, como num filtro sobre categorias.
+
+import re
+import hashlib
+
+from leitor_excel_ga import indice_coluna
+
+
+OPERACOES = ("eq", "contains", "endswith", "startswith", "regex")
+
+# Limite de valores distintos memorizados por regra (nomes de arquivo únicos não estouram a memória)
+LIMITE_CACHE = 100_000
+
+
+class Regra:
+    """Uma condição sobre uma coluna do export (índice 0-based ou letra do Excel)"""
+
+    def __init__(self, coluna, op: str, valor: str, case: bool = False, negar: bool = False):
+        if op not in OPERACOES:
+            raise ValueError(f"❌ Operação de filtro inválida: {op} (use {', '.join(OPERACOES)})")
+
+        self.coluna = indice_coluna(coluna) if isinstance(coluna, str) else coluna
+        self.op = op
+        self.valor = valor
+        self.case = case
+        self.negar = negar
+
+    def __repr__(self):
+        negacao = "not " if self.negar else ""
+        return f"Regra({self.coluna}, {negacao}{self.op} {self.valor!r}, case={self.case})"
+
+    def compilar(self):
+        """Devolve a função texto -> bool desta regra"""
+        if self.op == "regex":
+            padrao = re.compile(self.valor, 0 if self.case else re.IGNORECASE)
+            return lambda texto: padrao.search(texto) is not None
+
+        literal = self.valor if self.case else self.valor.lower()
+        if self.op == "eq":
+            teste = literal.__eq__
+        elif self.op == "contains":
+            teste = lambda texto: literal in texto
+        elif self.op == "endswith":
+            teste = lambda texto: texto.endswith(literal)
+        else:
+            teste = lambda texto: texto.startswith(literal)
+
+        return teste if self.case else (lambda texto: teste(texto.lower()))
+
+
+class ConjuntoRegras:
+    """Conjunto de regras combinadas com E; usado como filtro do LeitorPlanilhaGA"""
+
+    def __init__(self, regras: list):
+        self.regras = list(regras)
+        self.colunas = tuple(sorted({r.coluna for r in self.regras}))
+
+        posicoes = {col: i for i, col in enumerate(self.colunas)}
+        self._avaliadores = [
+            (posicoes[r.coluna], r.compilar(), r.negar, {}) for r in self.regras
+        ]
+
+    def __repr__(self):
+        return f"ConjuntoRegras({self.regras})"
+
+    @property
+    def digest(self) -> str:
+        """Identificador curto das regras (entra na chave do cache de relatórios)"""
+        definicao = repr([(r.coluna, r.op, r.valor, r.case, r.negar) for r in self.regras])
+        return hashlib.sha256(definicao.encode("utf-8")).hexdigest()[:16]
+
+    def __call__(self, *valores) -> bool:
+        """Avalia as regras sobre os valores das colunas (na ordem de self.colunas)"""
+        for pos, teste, negar, cache in self._avaliadores:
+            valor = valores[pos]
+            resultado = cache.get(valor)
+            if resultado is None:
+                texto = "" if valor is None else str(valor)
+                resultado = teste(texto) != negar
+                if len(cache) < LIMITE_CACHE:
+                    cache[valor] = resultado
+            if not resultado:
+                return False
+        return True
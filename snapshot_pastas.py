@@ -0,0 +1,179 @@
+# - Snapshot colunar de pasta (validacao_pasta_auto_v1 e Processo 2)
+# 1. A listagem vira colunas NumPy: mtime e tamanho (int64, segundos e bytes) e a tabela de
+#    nomes como um único bloco de bytes + offsets (nada de objeto Python por arquivo);
+# 2. Idade acima de um limite (o MINUTOS da validação), histograma por faixa de idade, total de
+#    bytes e os N mais antigos saem de operações vetorizadas: milissegundos com milhões de arquivos;
+# 3. salvar()/carregar() gravam as colunas em .npy; com mmap=True o snapshot é aberto direto do
+#    disco (só as páginas lidas entram na memória).
+# numpy só é importado por quem usa o snapshot (os processos importam este módulo no caminho que analisa).
+#
+# Uso: python snapshot_pastas.py <pasta_do_snapshot> [--minutos 15] [--top 10]
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+
+# Faixas de idade do histograma (limites em segundos)
+FAIXAS_PADRAO = (15 * 60, 3600, 6 * 3600, 86400, 7 * 86400)
+
+_ARQUIVO_META = "meta.json"
+_COLUNAS = ("mtimes", "tamanhos", "offsets", "nomes")
+
+
+def formatar_idade(segundos: float) -> str:
+    """Idade curta para log/card: 45s, 12min, 3h, 2d"""
+    segundos = max(0, int(segundos))
+    if segundos < 60:
+        return f"{segundos}s"
+    if segundos < 3600:
+        return f"{segundos // 60}min"
+    if segundos < 86400:
+        return f"{segundos // 3600}h"
+    return f"{segundos // 86400}d"
+
+
+class SnapshotPasta:
+    """Listagem de uma pasta em colunas (mtime, tamanho, nome) para análises vetorizadas"""
+
+    def __init__(self, pasta: str, mtimes, tamanhos, offsets, nomes, tirado_em: float = None):
+        self.pasta = pasta
+        self.mtimes = mtimes
+        self.tamanhos = tamanhos
+        self.offsets = offsets
+        self.nomes = nomes
+        self.tirado_em = tirado_em or time.time()
+
+    @classmethod
+    def de_atributos(cls, pasta: str, atributos, tirado_em: float = None) -> "SnapshotPasta":
+        """Monta o snapshot de (nome, tamanho, mtime) vindos de stat, listdir_attr, feed ou EntradaArquivo"""
+        nomes, tamanhos, mtimes = [], [], []
+        for nome, tamanho, mtime in atributos:
+            nomes.append(nome.encode("utf-8", errors="surrogateescape"))
+            tamanhos.append(tamanho or 0)
+            mtimes.append(mtime)
+        return cls._montar(pasta, nomes, np.array(mtimes, dtype=np.float64).astype(np.int64),
+                           np.array(tamanhos, dtype=np.int64), tirado_em)
+
+    @classmethod
+    def de_find(cls, pasta: str, saida: bytes, tirado_em: float = None) -> "SnapshotPasta":
+        """
+        Monta o snapshot da saída de `find <pasta> -maxdepth 1 -type f -printf '%T@\\t%s\\t%f\\0'`
+        - Um split só na saída inteira (sem lista por linha); mtime e tamanho convertidos em bloco
+        - Nome com tab (raro) cai no split por registro
+        """
+        registros = saida.count(b"\0")
+        campos = saida.replace(b"\0", b"\t").split(b"\t")[:-1] if registros else []
+        if len(campos) != 3 * registros:
+            campos = [c for r in saida.split(b"\0")[:-1] for c in r.split(b"\t", 2)]
+        if not campos:
+            return cls._montar(pasta, [], np.empty(0, np.int64), np.empty(0, np.int64), tirado_em)
+        return cls._montar(pasta, campos[2::3],
+                           np.array(campos[0::3]).astype(np.float64).astype(np.int64),
+                           np.array(campos[1::3]).astype(np.int64), tirado_em)
+
+    @classmethod
+    def _montar(cls, pasta, nomes_bytes: list, mtimes, tamanhos, tirado_em) -> "SnapshotPasta":
+        offsets = np.zeros(len(nomes_bytes) + 1, dtype=np.int64)
+        if nomes_bytes:
+            np.cumsum(np.fromiter(map(len, nomes_bytes), dtype=np.int64, count=len(nomes_bytes)), out=offsets[1:])
+        nomes = np.frombuffer(b"".join(nomes_bytes), dtype=np.uint8)
+        return cls(pasta, mtimes, tamanhos, offsets, nomes, tirado_em)
+
+    def __len__(self):
+        return len(self.mtimes)
+
+    def nome(self, i: int) -> str:
+        return self.nomes[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8", errors="surrogateescape")
+
+    def _corte(self, idade_s: float, agora: float = None):
+        """mtime abaixo do qual a idade passa de idade_s (compara a coluna direto, sem array de idades)"""
+        return int(agora or self.tirado_em) - idade_s
+
+    def contar_parados(self, idade_s: float, agora: float = None) -> int:
+        """Quantos arquivos têm mtime há mais de idade_s segundos (o `find -mmin +N` da validação)"""
+        return int(np.count_nonzero(self.mtimes < self._corte(idade_s, agora)))
+
+    def mais_antigos(self, n: int, idade_s: float = 0, agora: float = None) -> list:
+        """Os N mais antigos (acima de idade_s) como (nome, mtime, tamanho), do mais antigo ao mais novo"""
+        # Os parados são exatamente os de menor mtime: os N mais antigos da pasta, filtrados pelo corte
+        indices = np.arange(len(self.mtimes))
+        if len(indices) > n:
+            indices = np.argpartition(self.mtimes, n - 1)[:n]
+        indices = indices[self.mtimes[indices] < self._corte(idade_s, agora)]
+        indices = indices[np.argsort(self.mtimes[indices], kind="stable")]
+        return [(self.nome(i), int(self.mtimes[i]), int(self.tamanhos[i])) for i in indices]
+
+    def histograma(self, faixas_s=FAIXAS_PADRAO, agora: float = None) -> list:
+        """(rótulo, quantidade, bytes) por faixa de idade: <15min, 15min–1h, ..., >7d (limite fica na faixa de baixo)"""
+        limites = np.asarray(faixas_s, dtype=np.int64)
+        # Faixa de cada arquivo = quantos limites a idade passa (uma comparação da coluna por limite)
+        grupos = np.zeros(len(self.mtimes), dtype=np.int8)
+        for limite in limites:
+            grupos += self.mtimes < self._corte(int(limite), agora)
+        quantidades = np.bincount(grupos, minlength=len(limites) + 1)
+        volumes = np.bincount(grupos, weights=self.tamanhos, minlength=len(limites) + 1)
+
+        rotulos = [f"<{formatar_idade(limites[0])}"]
+        rotulos += [f"{formatar_idade(a)}–{formatar_idade(b)}" for a, b in zip(limites[:-1], limites[1:])]
+        rotulos.append(f">{formatar_idade(limites[-1])}")
+        return [(r, int(q), int(v)) for r, q, v in zip(rotulos, quantidades, volumes)]
+
+    def total_bytes(self) -> int:
+        return int(self.tamanhos.sum())
+
+    def salvar(self, destino: str):
+        """Grava as colunas em <destino>/*.npy + meta.json (sobrescreve o snapshot anterior)"""
+        os.makedirs(destino, exist_ok=True)
+        for coluna in _COLUNAS:
+            np.save(os.path.join(destino, f"{coluna}.npy"), getattr(self, coluna))
+        with open(os.path.join(destino, _ARQUIVO_META), "w", encoding="utf-8") as f:
+            json.dump({"pasta": self.pasta, "tirado_em": self.tirado_em, "arquivos": len(self)}, f)
+
+    @classmethod
+    def carregar(cls, origem: str, mmap: bool = True) -> "SnapshotPasta":
+        """Abre um snapshot salvo; com mmap=True as colunas são mapeadas do disco em vez de lidas"""
+        with open(os.path.join(origem, _ARQUIVO_META), encoding="utf-8") as f:
+            meta = json.load(f)
+        modo = "r" if mmap else None
+        colunas = {c: np.load(os.path.join(origem, f"{c}.npy"), mmap_mode=modo) for c in _COLUNAS}
+        return cls(meta["pasta"], tirado_em=meta["tirado_em"], **colunas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analisa um snapshot de pasta salvo")
+    parser.add_argument("snapshot")
+    parser.add_argument("--minutos", type=float, default=15, help="Idade mínima para considerar parado")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--agora", action="store_true", help="Idades em relação a agora (padrão: momento do snapshot)")
+    args = parser.parse_args()
+
+    snapshot = SnapshotPasta.carregar(args.snapshot)
+    agora = time.time() if args.agora else None
+    inicio = time.perf_counter()
+    parados = snapshot.contar_parados(args.minutos * 60, agora)
+    faixas = snapshot.histograma(agora=agora)
+    antigos = snapshot.mais_antigos(args.top, args.minutos * 60, agora)
+    segundos = time.perf_counter() - inicio
+
+    referencia = agora or snapshot.tirado_em
+    print("=" * 80)
+    print(f"Pasta: {snapshot.pasta} | {len(snapshot)} arquivos | {snapshot.total_bytes() / 1e6:.1f} MB "
+          f"| snapshot de {time.strftime('%d/%m/%Y %H:%M:%S', time.localtime(snapshot.tirado_em))}")
+    print(f"Parados há mais de {args.minutos:g} min: {parados}")
+    for rotulo, quantidade, volume in faixas:
+        print(f"  {rotulo:<12} {quantidade:>10} arquivo(s) {volume / 1e6:>10.1f} MB")
+    print(f"Mais antigos:")
+    for nome, mtime, tamanho in antigos:
+        print(f"  • {nome:<40} há {formatar_idade(referencia - mtime):<6} {tamanho} bytes")
+    print(f"Análise em {segundos * 1000:.1f} ms")
+    print("=" * 80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+# - Transferência de arquivos via FTP (Processo 1)
+# 1. Baixa em modo binário com bloco ajustado e retomada por REST após quedas;
+# 2. Mantém um manifesto local (nome -> tamanho/MDTM/sha256) na pasta de destino;
+# 3. Pula o download quando o arquivo remoto não mudou desde a última vez;
+# 4. Mede a vazão (MB/s) de cada download;
+# 5. Localiza o arquivo mais recente via MLSD (fallback NLST) sem montar a listagem inteira;
+# 6. Baixa vários arquivos em paralelo, com um pool limitado de conexões de controle.
+
+import os
+import re
+import json
+import time
+import queue
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ftplib import error_perm, all_errors
+
+
+TAMANHO_BLOCO_PADRAO = 256 * 1024
+NOME_MANIFESTO = ".manifesto_ftp.json"
+SUFIXO_PARCIAL = ".parcial"
+
+PADRAO_TRACKING = re.compile(r'(\d{4}-\d{2}-\d{2})_TrackingRecord\.xlsx$')
+
+
+def percorrer_listagem(ftp, callback) -> str:
+    """
+    Chama callback(nome) para cada arquivo da pasta atual, em streaming
+    - Usa MLSD (formato de máquina, ignora diretórios); se o servidor não suportar, NLST
+    Retorna o comando usado
+    """
+    def linha_mlsd(linha):
+        fatos, _, nome = linha.partition(" ")
+        if "type=file;" in fatos.lower():
+            callback(nome)
+
+    try:
+        ftp.retrlines("MLSD", linha_mlsd)
+        return "MLSD"
+    except error_perm:
+        ftp.retrlines("NLST", lambda linha: callback(linha.rsplit("/", 1)[-1]))
+        return "NLST"
+
+
+def buscar_mais_recente(ftp, padrao=PADRAO_TRACKING):
+    """
+    Nome do arquivo cuja chave (grupo 1 do padrão, ex.: a data YYYY-MM-DD) é a maior
+    - Cada linha é avaliada no callback: só o melhor candidato fica em memória
+    Retorna (nome, comando_usado); nome é None se nada casar
+    """
+    melhor_chave = None
+    melhor_nome = None
+
+    def considerar(nome):
+        nonlocal melhor_chave, melhor_nome
+        m = padrao.match(nome)
+        if m and (melhor_chave is None or m.group(1) > melhor_chave):
+            melhor_chave = m.group(1)
+            melhor_nome = nome
+
+    comando = percorrer_listagem(ftp, considerar)
+    return melhor_nome, comando
+
+
+def buscar_no_intervalo(ftp, chave_inicio: str, chave_fim: str, padrao=PADRAO_TRACKING) -> dict:
+    """Arquivos cuja chave (ex.: data YYYY-MM-DD) está entre chave_inicio e chave_fim, inclusive"""
+    encontrados = {}
+
+    def considerar(nome):
+        m = padrao.match(nome)
+        if m and chave_inicio <= m.group(1) <= chave_fim:
+            encontrados[m.group(1)] = nome
+
+    percorrer_listagem(ftp, considerar)
+    return dict(sorted(encontrados.items()))
+
+
+def tamanho_remoto(ftp, nome_arquivo: str):
+    """Tamanho do arquivo no servidor via SIZE (None se o servidor não suportar)"""
+    try:
+        ftp.voidcmd("TYPE I")
+        return ftp.size(nome_arquivo)
+    except error_perm:
+        return None
+
+
+def mdtm_remoto(ftp, nome_arquivo: str):
+    """Data de modificação no servidor via MDTM, ex.: '20251107063012' (None se não suportar)"""
+    try:
+        resposta = ftp.sendcmd(f"MDTM {nome_arquivo}")
+        return resposta.split()[-1] if resposta.startswith("213") else None
+    except error_perm:
+        return None
+
+
+# Downloads paralelos gravam no mesmo manifesto
+_TRAVA_MANIFESTO = threading.Lock()
+
+
+class ManifestoFTP:
+    """Manifesto JSON dos arquivos já baixados para uma pasta local"""
+
+    def __init__(self, pasta_destino: str):
+        self.caminho = os.path.join(pasta_destino, NOME_MANIFESTO)
+        self.entradas = self._ler()
+
+    def _ler(self) -> dict:
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def obter(self, nome_arquivo: str):
+        return self.entradas.get(nome_arquivo)
+
+    def _atualizar(self, nome_arquivo: str, dados):
+        """Relê o manifesto, aplica a alteração e grava de forma atômica (sob trava)"""
+        with _TRAVA_MANIFESTO:
+            self.entradas = self._ler()
+            if dados is None:
+                self.entradas.pop(nome_arquivo, None)
+            else:
+                self.entradas[nome_arquivo] = dados
+
+            temporario = f"{self.caminho}.{threading.get_ident()}.tmp"
+            try:
+                with open(temporario, 'w', encoding='utf-8') as f:
+                    json.dump(self.entradas, f, indent=2)
+                os.replace(temporario, self.caminho)
+            except OSError as e:
+                print(f"⚠️ Não foi possível gravar o manifesto FTP: {e}")
+
+    def registrar(self, nome_arquivo: str, **dados):
+        self._atualizar(nome_arquivo, dados)
+
+    def remover(self, nome_arquivo: str):
+        self._atualizar(nome_arquivo, None)
+
+
+def _sha256_arquivo(caminho: str, tamanho_bloco: int = 1024 * 1024):
+    """Objeto sha256 já alimentado com o conteúdo do arquivo (para continuar após REST)"""
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b""):
+            h.update(bloco)
+    return h
+
+
+def baixar_com_retomada(ftp, nome_arquivo: str, pasta_destino: str,
+                        tamanho_bloco: int = TAMANHO_BLOCO_PADRAO,
+                        tentativas: int = 3, reconectar=None) -> dict:
+    """
+    Baixa nome_arquivo para pasta_destino
+    - Se o manifesto indica o mesmo tamanho/MDTM e o arquivo local confere (tamanho + sha256), não baixa de novo
+    - Grava em <nome>.parcial e retoma com REST <offset> se a transferência cair
+    - reconectar: função sem argumentos que devolve uma nova conexão FTP (ou None)
+    - Confere o tamanho final com o SIZE remoto e registra o sha256 no manifesto
+    - Em erro depois de reconectar, a conexão nova é fechada antes de propagar (a original fica com o chamador)
+    Retorna dict com caminho, bytes, segundos, mbps, retomado_de e cache (True se pulou o download)
+    """
+    caminho_local = os.path.join(pasta_destino, nome_arquivo)
+    caminho_parcial = caminho_local + SUFIXO_PARCIAL
+    manifesto = ManifestoFTP(pasta_destino)
+
+    tamanho = tamanho_remoto(ftp, nome_arquivo)
+    mdtm = mdtm_remoto(ftp, nome_arquivo)
+    anterior = manifesto.obter(nome_arquivo)
+
+    if (anterior and tamanho is not None and os.path.exists(caminho_local)
+            and anterior.get('tamanho') == tamanho and anterior.get('mdtm') == mdtm
+            and os.path.getsize(caminho_local) == tamanho
+            and _sha256_arquivo(caminho_local).hexdigest() == anterior.get('sha256')):
+        print(f"♻️ Arquivo inalterado no FTP (tamanho {tamanho}, MDTM {mdtm}), download ignorado")
+        return {
+            'caminho': caminho_local, 'bytes': 0, 'segundos': 0.0, 'mbps': 0.0,
+            'retomado_de': 0, 'cache': True, 'conexao': ftp
+        }
+
+    # Parcial de outra versão do arquivo não pode ser retomado
+    parcial = manifesto.obter(nome_arquivo + SUFIXO_PARCIAL)
+    if os.path.exists(caminho_parcial) and (not parcial or parcial.get('tamanho') != tamanho or parcial.get('mdtm') != mdtm):
+        os.remove(caminho_parcial)
+    manifesto.registrar(nome_arquivo + SUFIXO_PARCIAL, tamanho=tamanho, mdtm=mdtm)
+
+    retomado_de = os.path.getsize(caminho_parcial) if os.path.exists(caminho_parcial) else 0
+    h = _sha256_arquivo(caminho_parcial) if retomado_de else hashlib.sha256()
+    inicio = time.perf_counter()
+    baixados = 0
+
+    # Uma conexão reaberta aqui só chega ao chamador em 'conexao' no sucesso: em erro, é fechada aqui
+    original = ftp
+    try:
+        for tentativa in range(1, tentativas + 1):
+            offset = os.path.getsize(caminho_parcial) if os.path.exists(caminho_parcial) else 0
+            if tamanho is not None and offset >= tamanho:
+                break
+
+            try:
+                with open(caminho_parcial, 'ab') as arquivo_local:
+                    def escrever(bloco):
+                        nonlocal baixados
+                        arquivo_local.write(bloco)
+                        h.update(bloco)
+                        baixados += len(bloco)
+
+                    if offset:
+                        print(f"↪️ Retomando download em {offset} bytes (REST)")
+                    ftp.retrbinary(f"RETR {nome_arquivo}", escrever, blocksize=tamanho_bloco, rest=offset or None)
+                break
+
+            except all_errors as e:
+                print(f"⚠️ Falha no download (tentativa {tentativa}/{tentativas}): {e}")
+                if tentativa == tentativas or reconectar is None:
+                    raise
+                try:
+                    ftp.close()
+                except Exception:
+                    pass
+                ftp = reconectar()
+                if ftp is None:
+                    raise
+
+        tamanho_final = os.path.getsize(caminho_parcial)
+        if tamanho is not None and tamanho_final != tamanho:
+            raise IOError(f"Tamanho divergente após download: local {tamanho_final} / remoto {tamanho}")
+    except BaseException:
+        if ftp is not None and ftp is not original:
+            try:
+                ftp.close()
+            except Exception:
+                pass
+        raise
+
+    os.replace(caminho_parcial, caminho_local)
+    segundos = time.perf_counter() - inicio
+    mbps = (baixados / (1024 * 1024)) / segundos if segundos > 0 else 0.0
+
+    manifesto.remover(nome_arquivo + SUFIXO_PARCIAL)
+    manifesto.registrar(nome_arquivo, tamanho=tamanho_final, mdtm=mdtm, sha256=h.hexdigest())
+
+    print(f"📥 {baixados} bytes em {segundos:.2f}s ({mbps:.2f} MB/s)")
+    return {
+        'caminho': caminho_local, 'bytes': baixados, 'segundos': segundos, 'mbps': mbps,
+        'retomado_de': retomado_de, 'cache': False, 'conexao': ftp
+    }
+
+
+def baixar_em_paralelo(conectar, nomes: list, pasta_destino: str, conexoes: int = 4,
+                       tentativas: int = 3, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO) -> dict:
+    """
+    Baixa vários arquivos em paralelo
+    - conectar: função sem argumentos que devolve uma conexão FTP logada (ou None)
+    - No máximo `conexoes` conexões de controle abertas; cada uma é reaproveitada entre arquivos
+    - Cada arquivo tem até `tentativas` tentativas (com retomada via REST entre elas)
+    Retorna dict com 'arquivos' (nome -> resultado ou erro), 'bytes', 'segundos', 'mbps' e 'falhas'
+    """
+    livres = queue.Queue()
+    abertas = []
+    trava = threading.Lock()
+
+    def obter_conexao():
+        try:
+            return livres.get_nowait()
+        except queue.Empty:
+            ftp = conectar()
+            if ftp is None:
+                raise ConnectionError("Não foi possível abrir conexão FTP")
+            with trava:
+                abertas.append(ftp)
+            return ftp
+
+    def baixar(nome):
+        ultimo_erro = None
+        for tentativa in range(1, tentativas + 1):
+            ftp = None
+            try:
+                ftp = obter_conexao()
+                resultado = baixar_com_retomada(ftp, nome, pasta_destino, tamanho_bloco=tamanho_bloco,
+                                                tentativas=1)
+                livres.put(ftp)
+                return resultado
+            except Exception as e:
+                ultimo_erro = e
+                print(f"⚠️ {nome}: falha na tentativa {tentativa}/{tentativas}: {e}")
+                if ftp is not None:
+                    try:
+                        ftp.close()
+                    except Exception:
+                        pass
+        raise ultimo_erro
+
+    inicio = time.perf_counter()
+    arquivos = {}
+    with ThreadPoolExecutor(max_workers=max(1, conexoes)) as executor:
+        futuros = {executor.submit(baixar, nome): nome for nome in nomes}
+        for futuro in as_completed(futuros):
+            nome = futuros[futuro]
+            try:
+                arquivos[nome] = futuro.result()
+            except Exception as e:
+                arquivos[nome] = {'erro': str(e)}
+
+    for ftp in abertas:
+        try:
+            ftp.quit()
+        except Exception:
+            pass
+
+    segundos = time.perf_counter() - inicio
+    total_bytes = sum(r.get('bytes', 0) for r in arquivos.values())
+    for r in arquivos.values():
+        r.pop('conexao', None)
+
+    return {
+        'arquivos': arquivos,
+        'bytes': total_bytes,
+        'segundos': segundos,
+        'mbps': (total_bytes / (1024 * 1024)) / segundos if segundos > 0 else 0.0,
+        'falhas': [nome for nome, r in arquivos.items() if 'erro' in r]
+    }
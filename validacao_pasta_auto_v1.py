@@ -1,238 +1,344 @@
-import paramiko
-import requests
-import os
+import sys
 import time
-from pathlib import Path
+import atexit
+import argparse
+from contextlib import ExitStack
 from datetime import datetime
-from dotenv import load_dotenv
+from configuracao import obter_configuracao
+from metricas import MetricasExecucao
+from estado_alertas import estado_alertas
+from perfilamento import adicionar_argumento, perfilar_se_ativado
 
-load_dotenv()
+# Mesmo .env dos processos (pasta do script), lido e validado por configuracao.py
+config = obter_configuracao()
 
 # ===== CONFIG SFTP =====
-SSH_HOST = os.getenv("SFTP_HOST_2")
-SSH_PORT = int(os.getenv("SFTP_PORT_2"))
-SSH_USER = os.getenv("SFTP_USER_2")
-SSH_KEY  = os.getenv("SFTP_PASS_2")
-TEAMS_URL = os.getenv("TEAMS_WEBHOOK_URL")
+SSH_HOST = config.sftp2_host
+SSH_PORT = config.sftp2_port
+SSH_USER = config.sftp2_user
+SSH_KEY  = config.sftp2_pass
+TEAMS_URL = config.teams_webhook_url
 
 if not all([SSH_HOST, SSH_PORT, SSH_USER, SSH_KEY, TEAMS_URL]):
     raise RuntimeError("❌ Variáveis de ambiente SFTP não carregadas corretamente")
 
+# ===== ARGUMENTOS =====
+parser = argparse.ArgumentParser(description="Validação da pasta auto (arquivos parados no SFTP)")
+parser.add_argument("--observar", action="store_true",
+                    help="Fica conectado e reavalia pelo feed de alterações, sem rodar o find a cada vez")
+parser.add_argument("--intervalo", type=float, default=60.0, help="Segundos entre avaliações no modo observação")
+parser.add_argument("--duracao", type=float, default=None, help="Encerra a observação após N segundos")
+adicionar_argumento(parser)
+args = parser.parse_args()
+
 # ===== CONFIG PROCESSO =========
 PASTA = "/flash2005/arquivos/auto"
 MINUTOS = 15
 LIMITE = 10
 
 # ===== CONTROLE DE ALERTA =====
-BASE_DIR = Path(__file__).resolve().parent
-LOCK_FILE = BASE_DIR / "alerta_arquivos_parados.lock"
+# Último envio guardado em estado_alertas.sqlite3 (PASTA_LOGS): seguro com execuções sobrepostas,
+# e uma mudança de gravidade (ex.: ATENÇÃO -> CRÍTICO) não espera o intervalo
+CHAVE_ALERTA = "validacao_pasta_auto"
 INTERVALO_ALERTA = 15 * 60  # 15 minutos
 
-def pode_enviar_alerta():
-    if not LOCK_FILE.exists():
-        return True
-    return (time.time() - LOCK_FILE.stat().st_mtime) >= INTERVALO_ALERTA
+def pode_enviar_alerta(gravidade):
+    return estado_alertas().reservar(CHAVE_ALERTA, gravidade, cooldown_s=INTERVALO_ALERTA).enviar
+
+def cancelar_envio():
+    estado_alertas().cancelar(CHAVE_ALERTA)
+
+def limpar_alerta():
+    estado_alertas().limpar(CHAVE_ALERTA)
 
-def registrar_envio():
-    LOCK_FILE.write_text(str(time.time()))
+# ===== MÉTRICAS =====
+metricas = MetricasExecucao("validacao_pasta_auto")
+inicio_execucao = time.perf_counter()
+execucao_ok = False
 
-def limpar_lock():
-    if LOCK_FILE.exists():
-        LOCK_FILE.unlink()
+def exportar_metricas():
+    metricas.somar("total", time.perf_counter() - inicio_execucao)
+    metricas.finalizar(execucao_ok)
+    metricas.exportar()
+
+atexit.register(exportar_metricas)
+
+# ===== PERFILAMENTO =====
+# --perfilar ou PERFILAR=validacao_pasta_auto: perfila do SSH até a saída do script (execução única ou observação)
+perfil = ExitStack()
+perfil.enter_context(perfilar_se_ativado("validacao_pasta_auto"))
+atexit.register(perfil.close)
 
 # ===== CONECTA NO SSH =====
+# paramiko/requests só são importados depois da validação do .env
+import paramiko
+
 print("Conectando no SSH...")
 ssh = paramiko.SSHClient()
 ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
 try:
-    ssh.connect(
-        hostname=SSH_HOST,
-        port=SSH_PORT,
-        username=SSH_USER,
-        password=SSH_KEY,
-        timeout=10,
-        banner_timeout=10,
-        auth_timeout=10
-    )
+    with metricas.fase("connect"):
+        ssh.connect(
+            hostname=SSH_HOST,
+            port=SSH_PORT,
+            username=SSH_USER,
+            password=SSH_KEY,
+            timeout=10,
+            banner_timeout=10,
+            auth_timeout=10
+        )
     print("SSH conectado com sucesso")
 except Exception as e:
     print("ERRO SSH:", e)
     exit(1)
 
-# ===== COMANDO CMD =====
-cmd = (
-    f"find {PASTA} -maxdepth 1 -type f -mmin +{MINUTOS} "
-    f"-printf '%f\\n' 2>/dev/null | head -n {LIMITE * 2}"
-)
+# ===== AVALIA E ALERTA =====
+# `snapshot`: a PASTA inteira em colunas (snapshot_pastas.py), do find ou da visão do feed no modo
+# observação; total parado, mais antigos e faixas de idade são operações vetorizadas
+from snapshot_pastas import SnapshotPasta, formatar_idade
 
-stdin, stdout, stderr = ssh.exec_command(cmd)
-saida = stdout.read().decode().strip().splitlines()
-ssh.close()
+def avaliar_e_alertar(snapshot):
+    # ===== PROCESSA RESULTADO =====
+    total = snapshot.contar_parados(MINUTOS * 60)
+    arquivos_listados = snapshot.mais_antigos(LIMITE, MINUTOS * 60)
 
-# ===== PROCESSA RESULTADO =====
-arquivos = [linha.strip() for linha in saida if linha.strip()]
-total = len(arquivos)
-arquivos_listados = arquivos[:LIMITE]
-
-# ===== SEM PROBLEMA =====
-if total == 0:
-    print("Nenhum arquivo parado. Ambiente normal.")
-    limpar_lock()
-    exit(0)
-
-# ===== TEM PROBLEMA, MAS JÁ AVISOU RECENTEMENTE =====
-if not pode_enviar_alerta():
-    print("Arquivos parados detectados, mas alerta já enviado recentemente.")
-    exit(0)
-
-# ===== DEFINE GRAVIDADE =====
-if total >= 1000:
-    cor = "Attention"
-    emoji = "🔴"
-    status = "CRÍTICO"
-elif total >= 300:
-    cor = "Warning"
-    emoji = "⚠️"
-    status = "ALERTA"
-else:
-    cor = "Good"
-    emoji = "⚡"
-    status = "ATENÇÃO"
-
-# ===== FORMATA DADOS =====
-agora = datetime.now().strftime("%d/%m/%Y às %H:%M:%S")
-
-# ===== PAYLOAD TEAMS =====
-payload = {
-    "type": "message",
-    "attachments": [{
-        "contentType": "application/vnd.microsoft.card.adaptive",
-        "content": {
-            "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-            "type": "AdaptiveCard",
-            "version": "1.4",
-            "body": [
-                # Cabeçalho colorido
-                {
-                    "type": "Container",
-                    "style": cor,
-                    "items": [
-                        {
-                            "type": "ColumnSet",
-                            "columns": [
-                                {
-                                    "type": "Column",
-                                    "width": "auto",
-                                    "items": [{
-                                        "type": "TextBlock",
-                                        "text": emoji,
-                                        "size": "ExtraLarge"
-                                    }]
-                                },
-                                {
-                                    "type": "Column",
-                                    "width": "stretch",
-                                    "items": [
-                                        {
-                                            "type": "TextBlock",
-                                            "text": f"{status}: Arquivos Parados",
-                                            "weight": "Bolder",
-                                            "size": "Large",
-                                            "wrap": True
-                                        },
-                                        {
+    # ===== SEM PROBLEMA =====
+    if total == 0:
+        print(f"Nenhum arquivo parado. Ambiente normal. ({len(snapshot)} arquivo(s) na pasta)")
+        limpar_alerta()
+        return True
+
+    # ===== DEFINE GRAVIDADE =====
+    if total >= 1000:
+        cor = "Attention"
+        emoji = "🔴"
+        status = "CRÍTICO"
+    elif total >= 300:
+        cor = "Warning"
+        emoji = "⚠️"
+        status = "ALERTA"
+    else:
+        cor = "Good"
+        emoji = "⚡"
+        status = "ATENÇÃO"
+
+    print(f"{total} arquivo(s) parado(s) de {len(snapshot)} | " + " | ".join(
+        f"{rotulo}: {qtd}" for rotulo, qtd, _ in snapshot.histograma() if qtd
+    ))
+
+    # ===== TEM PROBLEMA, MAS JÁ AVISOU RECENTEMENTE =====
+    if not pode_enviar_alerta(status):
+        print("Arquivos parados detectados, mas alerta já enviado recentemente.")
+        return True
+
+    # ===== FORMATA DADOS =====
+    agora = datetime.now().strftime("%d/%m/%Y às %H:%M:%S")
+
+    # ===== PAYLOAD TEAMS =====
+    payload = {
+        "type": "message",
+        "attachments": [{
+            "contentType": "application/vnd.microsoft.card.adaptive",
+            "content": {
+                "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                "type": "AdaptiveCard",
+                "version": "1.4",
+                "body": [
+                    # Cabeçalho colorido
+                    {
+                        "type": "Container",
+                        "style": cor,
+                        "items": [
+                            {
+                                "type": "ColumnSet",
+                                "columns": [
+                                    {
+                                        "type": "Column",
+                                        "width": "auto",
+                                        "items": [{
                                             "type": "TextBlock",
-                                            "text": f"Detectado em {agora}",
-                                            "isSubtle": True,
-                                            "spacing": "None",
-                                            "size": "Small"
-                                        }
-                                    ]
-                                }
-                            ]
-                        }
-                    ],
-                    "bleed": True
-                },
-                
-                # Informações do servidor
-                {
-                    "type": "Container",
-                    "spacing": "Medium",
-                    "items": [
-                        {
-                            "type": "FactSet",
-                            "facts": [
-                                {
-                                    "title": "Servidor:",
-                                    "value": SSH_HOST
-                                },
-                                {
-                                    "title": "Pasta:",
-                                    "value": PASTA
-                                },
-                                {
-                                    "title": "Total:",
-                                    "value": f"{total} arquivo{'s' if total != 1 else ''}"
-                                },
-                                {
-                                    "title": "Parado há:",
-                                    "value": f"Mais de {MINUTOS} minuto{'s' if MINUTOS != 1 else ''}"
-                                }
-                            ]
-                        }
-                    ]
-                },
-                
-                # Lista de arquivos
-                {
-                    "type": "Container",
-                    "spacing": "Medium",
-                    "separator": True,
-                    "items": [
-                        {
-                            "type": "TextBlock",
-                            "text": f"Primeiros {min(LIMITE, total)} arquivos:",
-                            "weight": "Bolder",
-                            "size": "Medium"
-                        },
-                        {
-                            "type": "TextBlock",
-                            "text": "\n".join([f"• {arq}" for arq in arquivos_listados]),
-                            "wrap": True,
-                            "spacing": "Small",
-                            "size": "Small"
-                        }
-                    ]
-                }
-            ]
-        }
-    }]
-}
-
-# Adiciona aviso se tiver mais arquivos
-if total > LIMITE:
-    payload["attachments"][0]["content"]["body"].append({
-        "type": "Container",
-        "spacing": "Small",
-        "items": [{
-            "type": "TextBlock",
-            "text": f"E mais {total - LIMITE} arquivo{'s' if (total - LIMITE) != 1 else ''}...",
-            "isSubtle": True,
-            "weight": "Bolder",
-            "size": "Small"
+                                            "text": emoji,
+                                            "size": "ExtraLarge"
+                                        }]
+                                    },
+                                    {
+                                        "type": "Column",
+                                        "width": "stretch",
+                                        "items": [
+                                            {
+                                                "type": "TextBlock",
+                                                "text": f"{status}: Arquivos Parados",
+                                                "weight": "Bolder",
+                                                "size": "Large",
+                                                "wrap": True
+                                            },
+                                            {
+                                                "type": "TextBlock",
+                                                "text": f"Detectado em {agora}",
+                                                "isSubtle": True,
+                                                "spacing": "None",
+                                                "size": "Small"
+                                            }
+                                        ]
+                                    }
+                                ]
+                            }
+                        ],
+                        "bleed": True
+                    },
+
+                    # Informações do servidor
+                    {
+                        "type": "Container",
+                        "spacing": "Medium",
+                        "items": [
+                            {
+                                "type": "FactSet",
+                                "facts": [
+                                    {
+                                        "title": "Servidor:",
+                                        "value": SSH_HOST
+                                    },
+                                    {
+                                        "title": "Pasta:",
+                                        "value": PASTA
+                                    },
+                                    {
+                                        "title": "Total:",
+                                        "value": f"{total} arquivo{'s' if total != 1 else ''}"
+                                    },
+                                    {
+                                        "title": "Parado há:",
+                                        "value": f"Mais de {MINUTOS} minuto{'s' if MINUTOS != 1 else ''}"
+                                    },
+                                    {
+                                        "title": "Mais antigo:",
+                                        "value": f"Há {formatar_idade(snapshot.tirado_em - arquivos_listados[0][1])}"
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+
+                    # Lista de arquivos
+                    {
+                        "type": "Container",
+                        "spacing": "Medium",
+                        "separator": True,
+                        "items": [
+                            {
+                                "type": "TextBlock",
+                                "text": f"{min(LIMITE, total)} mais antigos:",
+                                "weight": "Bolder",
+                                "size": "Medium"
+                            },
+                            {
+                                "type": "TextBlock",
+                                "text": "\n".join([
+                                    f"• {nome} (há {formatar_idade(snapshot.tirado_em - mtime)})"
+                                    for nome, mtime, _ in arquivos_listados
+                                ]),
+                                "wrap": True,
+                                "spacing": "Small",
+                                "size": "Small"
+                            }
+                        ]
+                    }
+                ]
+            }
         }]
-    })
+    }
 
-# ===== ENVIA PARA O TEAMS =====
-try:
-    response = requests.post(TEAMS_URL, json=payload)
-    if response.status_code == 202:
-        print("✅ Mensagem enviada para Teams com sucesso!")
-        registrar_envio()
-    else:
-        print(f"❌ Falha ao enviar: {response.status_code}")
-        print(response.text)
-except Exception as e:
-    print(f"❌ Erro ao enviar: {e}")
\ No newline at end of file
+    # Adiciona aviso se tiver mais arquivos
+    if total > LIMITE:
+        payload["attachments"][0]["content"]["body"].append({
+            "type": "Container",
+            "spacing": "Small",
+            "items": [{
+                "type": "TextBlock",
+                "text": f"E mais {total - LIMITE} arquivo{'s' if (total - LIMITE) != 1 else ''}...",
+                "isSubtle": True,
+                "weight": "Bolder",
+                "size": "Small"
+            }]
+        })
+
+    # ===== ENVIA PARA O TEAMS =====
+    # Com TEAMS_DIGEST=1, alertas não críticos vão para o digest (notificacao_teams.py)
+    from notificacao_teams import publicar_card
+
+    try:
+        with metricas.fase("notify"):
+            envio = publicar_card(TEAMS_URL, payload, "validacao_pasta_auto", cor)
+        if envio.enfileirado:
+            print("📬 Alerta enfileirado para o digest do Teams")
+            return True
+        metricas.contar("round_trips")
+        if envio.status == 202:
+            print("✅ Mensagem enviada para Teams com sucesso!")
+            return True
+        else:
+            print(f"❌ Falha ao enviar: {envio.status}")
+            print(envio.texto)
+            cancelar_envio()
+    except Exception as e:
+        print(f"❌ Erro ao enviar: {e}")
+        cancelar_envio()
+    return False
+
+# ===== MODO OBSERVAÇÃO =====
+# Com --observar a conexão fica aberta e um canal exec mantém a visão da PASTA atualizada
+# (feed_remoto.py: inotifywait -m, ou find quando o servidor não tem inotify-tools); a cada
+# intervalo os arquivos parados saem da memória, sem rodar o find de novo
+def observar(intervalo_s, duracao_s=None):
+    from feed_remoto import FeedPastasRemotas
+
+    with metricas.fase("list"):
+        feed = FeedPastasRemotas(ssh, [PASTA], intervalo_s=min(intervalo_s, 5.0))
+        pronto = feed.aguardar(60)
+    metricas.contar("round_trips")
+    if not pronto:
+        print(f"❌ Feed de alterações não iniciou: {feed.erro or 'sem resposta do servidor'}")
+        feed.fechar()
+        return False
+    print(f"👀 Observando {PASTA} (feed {feed.modo})")
+
+    ok = True
+    fim = None if duracao_s is None else time.monotonic() + duracao_s
+    try:
+        while fim is None or time.monotonic() < fim:
+            if not feed.vivo:
+                print(f"❌ Feed de alterações encerrado: {feed.erro or 'canal fechado'}")
+                return False
+            # A idade dos arquivos muda com o relógio, não só com eventos: reavalia a cada intervalo
+            snapshot = SnapshotPasta.de_atributos(
+                PASTA, ((nome, tamanho, mtime) for nome, (mtime, tamanho) in feed.arquivos(PASTA).items())
+            )
+            ok = avaliar_e_alertar(snapshot)
+            time.sleep(intervalo_s if fim is None else max(0.0, min(intervalo_s, fim - time.monotonic())))
+    finally:
+        feed.fechar()
+    return ok
+
+# ===== EXECUÇÃO =====
+if args.observar:
+    try:
+        execucao_ok = observar(args.intervalo, args.duracao)
+    except KeyboardInterrupt:
+        execucao_ok = True
+    ssh.close()
+    sys.exit(0 if execucao_ok else 1)
+
+# ===== COMANDO CMD =====
+# Lista a pasta inteira com mtime e tamanho; o corte de MINUTOS, o total (antes limitado pelo head)
+# e os mais antigos são calculados localmente sobre o snapshot
+cmd = f"find {PASTA} -maxdepth 1 -type f -printf '%T@\\t%s\\t%f\\0' 2>/dev/null"
+
+with metricas.fase("list"):
+    stdin, stdout, stderr = ssh.exec_command(cmd)
+    snapshot = SnapshotPasta.de_find(PASTA, stdout.read(), tirado_em=time.time())
+metricas.contar("round_trips")
+ssh.close()
+
+execucao_ok = avaliar_e_alertar(snapshot)